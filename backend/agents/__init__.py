@@ -8,6 +8,7 @@ from agents.react_state import ReActState, ToolCall, create_initial_state
 from agents.react_nodes import (
     reasoning_node,
     tool_execution_node,
+    atool_execution_node,
     observation_node,
     should_continue
 )
@@ -27,6 +28,7 @@ __all__ = [
     "create_initial_state",
     "reasoning_node",
     "tool_execution_node",
+    "atool_execution_node",
     "observation_node",
     "should_continue",
     "get_react_system_prompt",
@@ -3,6 +3,7 @@ System prompts for the ReAct agent.
 """
 
 from tools.tool_definitions import get_tool_definitions_text
+from tools.tool_registry import tool_registry
 
 
 REACT_SYSTEM_PROMPT = """You are a helpful AI assistant for King's College London (KCL) students. You help with questions about schedules, campus information, university policies, and general student life.
@@ -60,14 +61,25 @@ Example:
 4. **Handle missing data gracefully** - If the user asks about their timetable but hasn't set up their iCal URL, explain how to do so.
 5. **Stay on topic** - You're here to help KCL students. Politely redirect off-topic questions.
 6. **Be concise** - Provide helpful, focused answers without unnecessary verbosity.
+7. **Mind the cost** - Each tool lists its usual latency and whether it is paid. When a free or faster tool can answer, prefer it over a slow or paid one.
 
-## Timetable Tool Notes
+## Search Tool Notes
+
+When a question compares things or has several parts (e.g. "MSc vs MRes fees"), pass them together as `queries` in a single search step instead of searching one at a time. The merged results note which queries found each page.
+
+## Research Tool Notes
+
+`research` runs a search and reads the top pages in one step, returning query-focused excerpts with their URLs. Use it when you need page content to answer; use `search` when links and snippets are enough, and `scraper` for a specific URL you already have.
+
+{kcl_index_notes}## Timetable Tool Notes
 
 The timetable tool requires the user to have set up their iCal subscription URL. If they ask about their schedule but haven't provided this:
 - Explain that they need to set up their iCal URL
 - Direct them to KCL's timetable page to get their subscription link
 - The URL can be set in the app settings
 
+For "what's next", "when am I free" or "how busy am I" questions, use the timetable `action` values `next_event`, `free_slots` or `daily_load` rather than listing events and working out times yourself. Relative days such as "tomorrow" or "thursday" can be passed as `date` directly.
+
 ## Current Context
 
 {context}
@@ -102,10 +114,33 @@ You MUST respond with valid JSON in exactly this format:
 Remember: Always respond with valid JSON. No markdown code fences in the actual response - just the raw JSON object."""
 
 
+SUMMARY_PROMPT = """You maintain a running summary of a conversation between a King's College London student and an AI assistant.
+
+## Current Summary
+{summary}
+
+## New Messages
+{messages}
+
+## Instructions
+Update the summary so it also covers the new messages. Keep facts the assistant may need later (the student's course, preferences, questions asked, key answers, links given). Drop greetings and filler. Write at most {max_words} words of plain text.
+
+Updated summary:"""
+
+
+# Only included while the local index has pages; on an empty index it would cost a wasted step
+KCL_INDEX_NOTES = """## KCL Index Notes
+
+The `kcl_index` tool searches KCL pages that have already been indexed locally and answers in milliseconds. For general questions about KCL services, policies or study, try it before `search`; use `search` and `scraper` when the passages are missing, off-topic or possibly out of date.
+
+"""
+
+
 def get_react_system_prompt(
     tool_history: str = "",
     has_ical_url: bool = False,
-    plan: str = ""
+    plan: str = "",
+    conversation_summary: str = ""
 ) -> str:
     """
     Generate the ReAct system prompt with current context.
@@ -114,14 +149,19 @@ def get_react_system_prompt(
         tool_history: Formatted history of previous tool calls in this session
         has_ical_url: Whether the user has set up their iCal URL
         plan: Optional high-level strategy from planning step
+        conversation_summary: Optional running summary of earlier turns
 
     Returns:
         Complete system prompt string
     """
-    tool_definitions = get_tool_definitions_text()
+    tool_names = tool_registry.get_advertised_tool_names()
+    tool_definitions = get_tool_definitions_text(tool_registry.cost_hints(), tool_names)
 
     context_parts = []
 
+    if conversation_summary:
+        context_parts.append(f"Summary of the earlier conversation:\n{conversation_summary}")
+
     if plan:
         context_parts.append(f"Strategy: {plan}")
 
@@ -137,6 +177,7 @@ def get_react_system_prompt(
 
     return REACT_SYSTEM_PROMPT.format(
         tool_definitions=tool_definitions,
+        kcl_index_notes=KCL_INDEX_NOTES if "kcl_index" in tool_names else "",
         context=context
     )
 
@@ -158,6 +199,30 @@ def get_planning_prompt(query: str, tool_list: str) -> str:
     )
 
 
+def get_summary_prompt(summary: str, messages: list, max_words: int = 150) -> str:
+    """
+    Generate the prompt that folds new messages into the running summary.
+
+    Args:
+        summary: Current running summary (may be empty)
+        messages: Messages to fold in, as role/content dictionaries
+        max_words: Target maximum length of the updated summary
+
+    Returns:
+        Complete summary prompt string
+    """
+    lines = []
+    for msg in messages:
+        role = "Assistant" if msg.get("role") in ("ai", "assistant") else "Student"
+        lines.append(f"{role}: {msg.get('content', '')}")
+
+    return SUMMARY_PROMPT.format(
+        summary=summary or "(empty)",
+        messages="\n".join(lines),
+        max_words=max_words
+    )
+
+
 def format_tool_history(tool_calls: list) -> str:
     """
     Format tool call history for inclusion in the prompt.
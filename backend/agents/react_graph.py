@@ -3,21 +3,25 @@ ReAct Agent LangGraph workflow definition.
 Implements a Reasoning-Action-Observation loop with conditional edges.
 """
 
+from typing import Any, Optional
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import StateGraph, END
 from agents.react_state import ReActState
 from agents.react_nodes import (
     planning_node,
     reasoning_node,
     tool_execution_node,
+    atool_execution_node,
     observation_node,
     should_continue
 )
+from services.checkpoint_service import get_checkpoint_service
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
 
-def create_react_agent_graph():
+def create_react_agent_graph(checkpointer: Optional[Any] = None):
     """
     Create and compile the ReAct agent workflow graph.
 
@@ -26,6 +30,10 @@ def create_react_agent_graph():
                                ^                   |
                                └── observation_node
 
+    Args:
+        checkpointer: Optional LangGraph checkpointer (defaults to the SQLite
+            checkpointer when ENABLE_CHECKPOINTING is set; pass False to disable)
+
     Returns:
         Compiled LangGraph graph
     """
@@ -37,7 +45,11 @@ def create_react_agent_graph():
     # Add nodes
     workflow.add_node("planning", planning_node)
     workflow.add_node("reasoning", reasoning_node)
-    workflow.add_node("tool_execution", tool_execution_node)
+    # Tool execution has a native async path used under ainvoke/astream
+    workflow.add_node(
+        "tool_execution",
+        RunnableLambda(tool_execution_node, afunc=atool_execution_node, name="tool_execution")
+    )
     workflow.add_node("observation", observation_node)
 
     # Entry point is now planning (which may skip if disabled)
@@ -64,8 +76,12 @@ def create_react_agent_graph():
     # Observation -> Back to reasoning (loop)
     workflow.add_edge("observation", "reasoning")
 
-    # Compile the graph
-    graph = workflow.compile()
+    # Compile the graph (with durable checkpointing if enabled)
+    if checkpointer is None:
+        checkpoint_service = get_checkpoint_service()
+        if checkpoint_service:
+            checkpointer = checkpoint_service.saver
+    graph = workflow.compile(checkpointer=checkpointer)
 
     logger.info("ReAct agent graph compiled successfully")
     return graph
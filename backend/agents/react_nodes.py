@@ -4,11 +4,16 @@ Implements the Reasoning-Action-Observation loop pattern.
 """
 
 import json
-from typing import Dict, Any, Literal
+import time
+from typing import Dict, Any, Literal, Optional, Tuple
 from datetime import datetime
 
+from langgraph.config import get_stream_writer
+
 from agents.react_state import ReActState
 from agents.prompts import get_react_system_prompt, format_tool_history, get_planning_prompt
+from tools.circuit_breaker import ToolUnavailableError
+from tools.progress import ProgressSink, progress_sink
 from tools.tool_registry import tool_registry
 from tools.tool_definitions import get_tool_definitions_text
 from services.llm_service import llm_service
@@ -17,6 +22,10 @@ from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Bounds on conversation context sent with every reasoning call
+MAX_HISTORY_MESSAGES = 10
+MAX_HISTORY_MESSAGE_CHARS = 1500
+
 
 def planning_node(state: ReActState) -> Dict[str, Any]:
     """
@@ -37,7 +46,7 @@ def planning_node(state: ReActState) -> Dict[str, Any]:
     logger.info("Planning step - analyzing query and creating strategy")
 
     query = state.get("query", "")
-    tool_list = get_tool_definitions_text()
+    tool_list = get_tool_definitions_text(tool_registry.cost_hints(), tool_registry.get_advertised_tool_names())
 
     # Build planning prompt
     planning_prompt = get_planning_prompt(query=query, tool_list=tool_list)
@@ -135,7 +144,8 @@ def reasoning_node(state: ReActState) -> Dict[str, Any]:
     system_prompt = get_react_system_prompt(
         tool_history=tool_history,
         has_ical_url=has_ical_url,
-        plan=plan
+        plan=plan,
+        conversation_summary=state.get("conversation_summary") or ""
     )
 
     # Build user message
@@ -148,12 +158,15 @@ def reasoning_node(state: ReActState) -> Dict[str, Any]:
     # Build messages array with conversation history
     messages = [{"role": "system", "content": system_prompt}]
 
-    # Add conversation history (sliding window: last 10 messages)
+    # Add recent conversation history (older turns are covered by the summary)
     conversation_history = state.get("conversation_history") or []
     if conversation_history:
-        for msg in conversation_history[-10:]:
+        for msg in conversation_history[-MAX_HISTORY_MESSAGES:]:
             role = "assistant" if msg.get("role") == "ai" else msg.get("role", "user")
-            messages.append({"role": role, "content": msg.get("content", "")})
+            content = msg.get("content", "")
+            if len(content) > MAX_HISTORY_MESSAGE_CHARS:
+                content = content[:MAX_HISTORY_MESSAGE_CHARS] + "... (truncated)"
+            messages.append({"role": role, "content": content})
 
     messages.append({"role": "user", "content": user_message})
 
@@ -272,77 +285,192 @@ def tool_execution_node(state: ReActState) -> Dict[str, Any]:
 
     logger.info(f"Executing tool: {action} with input: {action_input}")
 
-    # Create tool call record
-    tool_call = {
-        "tool_name": action,
-        "tool_input": action_input,
-        "result": None,
-        "error": None,
-        "timestamp": datetime.now().isoformat()
-    }
+    tool_call = _new_tool_call(action, action_input)
+    started = time.perf_counter()
 
     try:
-        # Get tool from registry
-        tool = tool_registry.get_tool(action)
-
-        # Special handling for timetable tool (needs ical_url from state)
-        if action == "timetable":
-            ical_url = state.get("ical_url")
-            if not ical_url:
-                tool_call["error"] = "No iCal URL configured. User needs to set up their timetable subscription."
-                tool_call["result"] = None
-            else:
-                days_ahead = action_input.get("days_ahead", 7)
-                result = tool.execute(ical_url=ical_url, days_ahead=days_ahead)
-                tool_call["result"] = _format_tool_result(action, result)
-
-        # Search tool
-        elif action == "search":
-            query = action_input.get("query", state["query"])
-            num_results = action_input.get("num_results", 5)
-            result = tool.execute(query=query, num_results=num_results)
-            tool_call["result"] = _format_tool_result(action, result)
+        # Fail fast on unknown tools
+        tool_registry.get_tool(action)
 
-        # Scraper tool
-        elif action == "scraper":
-            url = action_input.get("url", "")
-            if not url:
-                tool_call["error"] = "No URL provided for scraping"
-            else:
-                result = tool.execute(url=url)
-                tool_call["result"] = _format_tool_result(action, result)
-
-        # TikTok tool
-        elif action == "tiktok":
-            result = tool.execute(
-                hashtags=action_input.get("hashtags"),
-                profiles=action_input.get("profiles"),
-                search_queries=action_input.get("search_queries"),
-                results_per_page=action_input.get("results_per_page", 10)
-            )
+        kwargs, error = _build_tool_kwargs(action, action_input, state)
+        if error:
+            tool_call["error"] = error
+        else:
+            with progress_sink(_tool_progress_writer()):
+                result = tool_registry.execute(action, **kwargs)
             tool_call["result"] = _format_tool_result(action, result)
 
-        # Instagram tool
-        elif action == "instagram":
-            result = tool.execute(
-                profiles=action_input.get("profiles"),
-                hashtags=action_input.get("hashtags"),
-                search_query=action_input.get("search_query"),
-                search_type=action_input.get("search_type", "hashtag"),
-                results_limit=action_input.get("results_limit", 10)
-            )
-            tool_call["result"] = _format_tool_result(action, result)
+    except KeyError as e:
+        logger.error(f"Tool not found: {action}")
+        tool_call["error"] = f"Tool '{action}' not found in registry"
+    except ToolUnavailableError as e:
+        logger.warning(f"Tool {action} skipped: circuit open")
+        tool_call["error"] = str(e)
+        tool_call["unavailable"] = True
+    except Exception as e:
+        logger.error(f"Error executing tool {action}: {str(e)}")
+        tool_call["error"] = str(e)
+
+    return _record_tool_call(state, tool_call, started)
+
+
+async def atool_execution_node(state: ReActState) -> Dict[str, Any]:
+    """
+    Execute the selected tool asynchronously.
+    Async counterpart of tool_execution_node, used when the graph runs via
+    ainvoke/astream so tool I/O does not hold a thread.
+
+    Args:
+        state: Current ReAct state
+
+    Returns:
+        Updated state with tool call record
+    """
+    action = state.get("current_action", "")
+    action_input = state.get("current_action_input", {})
+
+    logger.info(f"Executing tool (async): {action} with input: {action_input}")
+
+    tool_call = _new_tool_call(action, action_input)
+    started = time.perf_counter()
+
+    try:
+        # Fail fast on unknown tools
+        tool_registry.get_tool(action)
 
+        kwargs, error = _build_tool_kwargs(action, action_input, state)
+        if error:
+            tool_call["error"] = error
         else:
-            tool_call["error"] = f"Unknown tool: {action}"
+            with progress_sink(_tool_progress_writer()):
+                result = await tool_registry.aexecute(action, **kwargs)
+            tool_call["result"] = _format_tool_result(action, result)
 
     except KeyError as e:
         logger.error(f"Tool not found: {action}")
         tool_call["error"] = f"Tool '{action}' not found in registry"
+    except ToolUnavailableError as e:
+        logger.warning(f"Tool {action} skipped: circuit open")
+        tool_call["error"] = str(e)
+        tool_call["unavailable"] = True
     except Exception as e:
         logger.error(f"Error executing tool {action}: {str(e)}")
         tool_call["error"] = str(e)
 
+    return _record_tool_call(state, tool_call, started)
+
+
+def _tool_progress_writer() -> Optional[ProgressSink]:
+    """Forward tool progress to the graph's custom stream (None outside a graph run)."""
+    try:
+        writer = get_stream_writer()
+    except RuntimeError:
+        return None
+    return lambda progress: writer({"type": "tool_progress", "data": progress})
+
+
+def _new_tool_call(action: str, action_input: Any) -> Dict[str, Any]:
+    """Create an empty tool call record."""
+    return {
+        "tool_name": action,
+        "tool_input": action_input,
+        "result": None,
+        "error": None,
+        "timestamp": datetime.now().isoformat(),
+        "duration_ms": None
+    }
+
+
+def _build_tool_kwargs(
+    action: str,
+    action_input: Dict[str, Any],
+    state: ReActState
+) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """
+    Map the model's action_input onto the tool's execute() arguments.
+
+    Args:
+        action: Tool name
+        action_input: Parameters chosen by the model
+        state: Current ReAct state
+
+    Returns:
+        Tuple of (keyword arguments, error message); exactly one is set
+    """
+    # Special handling for timetable tool (needs ical_url from state)
+    if action == "timetable":
+        ical_url = state.get("ical_url")
+        if not ical_url:
+            return None, "No iCal URL configured. User needs to set up their timetable subscription."
+        kwargs = {
+            "ical_url": ical_url,
+            "days_ahead": action_input.get("days_ahead", 7),
+            "action": action_input.get("action", "events")
+        }
+        for key in ("date", "day_start", "day_end", "min_minutes"):
+            if action_input.get(key) is not None:
+                kwargs[key] = action_input[key]
+        return kwargs, None
+
+    # Search tool
+    elif action == "search":
+        queries = action_input.get("queries")
+        if isinstance(queries, str):
+            queries = [queries]
+        if queries:
+            return {"queries": queries, "num_results": action_input.get("num_results", 5)}, None
+        return {
+            "query": action_input.get("query", state["query"]),
+            "num_results": action_input.get("num_results", 5)
+        }, None
+
+    # Local KCL index
+    elif action == "kcl_index":
+        return {
+            "query": action_input.get("query", state["query"]),
+            "num_results": action_input.get("num_results", 5)
+        }, None
+
+    # Search-then-read tool
+    elif action == "research":
+        return {
+            "query": action_input.get("query", state["query"]),
+            "top_k": min(max(int(action_input.get("top_k", 3)), 1), 5)
+        }, None
+
+    # Scraper tool
+    elif action == "scraper":
+        url = action_input.get("url", "")
+        if not url:
+            return None, "No URL provided for scraping"
+        return {"url": url}, None
+
+    # TikTok tool
+    elif action == "tiktok":
+        return {
+            "hashtags": action_input.get("hashtags"),
+            "profiles": action_input.get("profiles"),
+            "search_queries": action_input.get("search_queries"),
+            "results_per_page": action_input.get("results_per_page", 10)
+        }, None
+
+    # Instagram tool
+    elif action == "instagram":
+        return {
+            "profiles": action_input.get("profiles"),
+            "hashtags": action_input.get("hashtags"),
+            "search_query": action_input.get("search_query"),
+            "search_type": action_input.get("search_type", "hashtag"),
+            "results_limit": action_input.get("results_limit", 10)
+        }, None
+
+    return None, f"Unknown tool: {action}"
+
+
+def _record_tool_call(state: ReActState, tool_call: Dict[str, Any], started: float) -> Dict[str, Any]:
+    """Stamp the duration and append the tool call to the history."""
+    tool_call["duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+
     # Add to tool calls history
     tool_calls = state.get("tool_calls", []).copy()
     tool_calls.append(tool_call)
@@ -376,7 +504,9 @@ def observation_node(state: ReActState) -> Dict[str, Any]:
     result = latest_call.get("result")
     error = latest_call.get("error")
 
-    if error:
+    if latest_call.get("unavailable"):
+        observation = f"Tool '{tool_name}' is unavailable. {error}"
+    elif error:
         observation = f"Tool '{tool_name}' encountered an error: {error}"
     elif result is None:
         observation = f"Tool '{tool_name}' returned no results."
@@ -492,6 +622,35 @@ def _format_tool_result(tool_name: str, result: Any) -> str:
             lines.append(f"{i}. {item.get('title', 'Untitled')}")
             lines.append(f"   URL: {item.get('link', 'N/A')}")
             lines.append(f"   {item.get('snippet', '')}")
+            if item.get("queries"):
+                # Merged multi-query results say which queries found them
+                lines.append(f"   Found by: {'; '.join(item['queries'])}")
+            lines.append("")
+        return "\n".join(lines)
+
+    elif tool_name == "kcl_index":
+        if not result:
+            return "No matching KCL pages in the local index. Try the search tool instead."
+        lines = []
+        for i, item in enumerate(result, 1):
+            passage = item.get("passage", "")
+            if len(passage) > 800:
+                passage = passage[:800] + "..."
+            lines.append(f"{i}. {item.get('title', 'Untitled')}")
+            lines.append(f"   URL: {item.get('url', 'N/A')}")
+            lines.append(f"   {passage}")
+            lines.append("")
+        return "\n".join(lines)
+
+    elif tool_name == "research":
+        sources = result.get("sources", []) if isinstance(result, dict) else []
+        if not sources:
+            return "No search results found."
+        lines = []
+        for i, source in enumerate(sources, 1):
+            lines.append(f"[{i}] {source.get('title') or 'Untitled'}")
+            lines.append(f"URL: {source.get('url', 'N/A')}")
+            lines.append(source.get("excerpt") or f"(page could not be read) {source.get('snippet', '')}")
             lines.append("")
         return "\n".join(lines)
 
@@ -504,52 +663,23 @@ def _format_tool_result(tool_name: str, result: Any) -> str:
         return result
 
     elif tool_name == "timetable":
+        if isinstance(result, dict):
+            return _format_timetable_analytics(result)
         if not result:
             return "No upcoming events found in your timetable."
-        lines = ["Upcoming events:"]
-        for event in result:
-            start = event.get("start", "")
-            if hasattr(start, "strftime"):
-                start = start.strftime("%a %d %b, %H:%M")
-            lines.append(f"- {event.get('summary', 'Untitled')}")
-            lines.append(f"  When: {start}")
-            if event.get("location"):
-                lines.append(f"  Where: {event.get('location')}")
-            lines.append("")
-        return "\n".join(lines)
+        return "Upcoming events:\n" + "\n\n".join(event.to_observation() for event in result)
 
     elif tool_name == "tiktok":
         if not result:
             return "No TikTok videos found."
-        lines = ["TikTok videos found:"]
-        for video in result[:5]:  # Limit to 5 videos
-            lines.append(f"- {video.get('description', 'No description')[:100]}")
-            author = video.get("author", {})
-            lines.append(f"  By: @{author.get('username', 'unknown')}")
-            stats = video.get("stats", {})
-            lines.append(f"  Views: {stats.get('views', 0):,} | Likes: {stats.get('likes', 0):,}")
-            lines.append(f"  URL: {video.get('url', 'N/A')}")
-            lines.append("")
-        return "\n".join(lines)
+        # Limit to 5 videos
+        return "TikTok videos found:\n" + "\n\n".join(video.to_observation() for video in result[:5])
 
     elif tool_name == "instagram":
         if not result:
             return "No Instagram posts found."
-        lines = ["Instagram posts found:"]
-        for post in result[:5]:  # Limit to 5 posts
-            caption = post.get("caption", "No caption")
-            if len(caption) > 100:
-                caption = caption[:100] + "..."
-            lines.append(f"- {caption}")
-            author = post.get("author", {})
-            lines.append(f"  By: @{author.get('username', 'unknown')}")
-            stats = post.get("stats", {})
-            lines.append(f"  Likes: {stats.get('likes', 0):,} | Comments: {stats.get('comments', 0):,}")
-            if post.get("location"):
-                lines.append(f"  Location: {post.get('location')}")
-            lines.append(f"  URL: {post.get('url', 'N/A')}")
-            lines.append("")
-        return "\n".join(lines)
+        # Limit to 5 posts
+        return "Instagram posts found:\n" + "\n\n".join(post.to_observation() for post in result[:5])
 
     else:
         # Generic formatting
@@ -558,6 +688,45 @@ def _format_tool_result(tool_name: str, result: Any) -> str:
         return str(result)
 
 
+def _format_timetable_analytics(result: Dict[str, Any]) -> str:
+    """Format a computed timetable query (next_event, free_slots, daily_load) compactly."""
+    def describe(event: Dict[str, Any]) -> str:
+        where = f" @ {event['location']}" if event.get("location") else ""
+        return f"{event['summary']} ({event['start'][11:16]}-{event['end'][11:16]} on {event['start'][:10]}){where}"
+
+    if "next" in result:
+        lines = [f"Now: {result['now']}"]
+        if result.get("current"):
+            lines.append(f"In progress: {describe(result['current'])}")
+        if result.get("next"):
+            lines.append(f"Next: {describe(result['next'])}, starts in {result['starts_in_minutes']} minutes")
+        else:
+            lines.append("No upcoming events in the timetable.")
+        if result.get("all_day"):
+            lines.append(f"All-day today: {', '.join(result['all_day'])}")
+        return "\n".join(lines)
+
+    if "free" in result:
+        busy = ", ".join(f"{slot['start']}-{slot['end']}" for slot in result["busy"]) or "none"
+        free = ", ".join(f"{slot['start']}-{slot['end']} ({slot['minutes']} min)" for slot in result["free"]) or "none"
+        lines = [
+            f"Timetable for {result['date']} ({result['window']}):",
+            f"Busy: {busy}",
+            f"Free: {free}",
+            f"Total free: {result['free_minutes']} minutes"
+        ]
+        if result.get("all_day"):
+            lines.append(f"All-day: {', '.join(result['all_day'])}")
+        return "\n".join(lines)
+
+    lines = [f"Timetable load: {result['total_events']} events, {result['total_hours']} hours"]
+    for day in result.get("days", []):
+        span = f", {day['first_start']}-{day['last_end']}" if day["first_start"] else ""
+        all_day = f" (all day: {', '.join(day['all_day'])})" if day.get("all_day") else ""
+        lines.append(f"- {day['weekday']} {day['date']}: {day['events']} events, {day['hours']} h{span}{all_day}")
+    return "\n".join(lines)
+
+
 def _generate_fallback_response(state: ReActState, iteration: int) -> Dict[str, Any]:
     """
     Generate a fallback response when max iterations are reached.
@@ -63,6 +63,7 @@ class ReActState(TypedDict):
 
     # Conversation history (for memory)
     conversation_history: Optional[List[Dict[str, str]]]
+    conversation_summary: Optional[str]  # Running summary of older turns
 
     # Planning (optional)
     plan: Optional[str]           # High-level strategy
@@ -74,7 +75,8 @@ def create_initial_state(
     user_id: str = "",
     ical_url: Optional[str] = None,
     max_iterations: Optional[int] = None,
-    conversation_history: Optional[List[Dict[str, str]]] = None
+    conversation_history: Optional[List[Dict[str, str]]] = None,
+    conversation_summary: Optional[str] = None
 ) -> ReActState:
     """Create initial state for ReAct agent.
 
@@ -83,7 +85,8 @@ def create_initial_state(
         user_id: User/session identifier
         ical_url: Optional iCal URL for timetable queries
         max_iterations: Maximum reasoning loops (defaults to settings.max_agent_iterations)
-        conversation_history: Optional list of previous messages
+        conversation_history: Optional list of recent previous messages
+        conversation_summary: Optional running summary of older turns
 
     Returns:
         Initialized ReActState
@@ -105,6 +108,7 @@ def create_initial_state(
         final_response=None,
         ical_url=ical_url,
         conversation_history=conversation_history,
+        conversation_summary=conversation_summary,
         plan=None,
         plan_reasoning=None
     )
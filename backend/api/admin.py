@@ -0,0 +1,278 @@
+"""Admin API endpoints."""
+
+from typing import Optional
+from fastapi import APIRouter, Header, HTTPException
+from config.settings import settings
+from core.answer_cache import answer_cache
+from services.http_client import http_client
+from tools.tool_cache import tool_result_cache
+from tools.ical_feed_cache import ical_feed_cache
+from tools.scraper_store import scraper_store
+from tools.social_cache import social_result_cache
+from tools.tool_registry import tool_registry
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+router = APIRouter()
+
+
+def _check_admin_key(x_admin_key: Optional[str]) -> None:
+    """
+    Verify the admin key header.
+
+    Without a configured ADMIN_API_KEY, admin endpoints are only available in development.
+
+    Raises:
+        HTTPException: If access is not allowed
+    """
+    if settings.admin_api_key:
+        if x_admin_key != settings.admin_api_key:
+            raise HTTPException(status_code=401, detail="Invalid admin key")
+    elif settings.app_env != "development":
+        raise HTTPException(status_code=403, detail="Admin API is not configured")
+
+
+@router.get("/answer-cache")
+async def get_answer_cache(x_admin_key: Optional[str] = Header(None)):
+    """
+    Inspect the answer cache.
+
+    Returns:
+        Cache statistics and non-expired entries
+    """
+    _check_admin_key(x_admin_key)
+
+    return {
+        "stats": answer_cache.stats(),
+        "entries": answer_cache.list_entries()
+    }
+
+
+@router.delete("/answer-cache")
+async def purge_answer_cache(x_admin_key: Optional[str] = Header(None)):
+    """
+    Remove all entries from the answer cache.
+
+    Returns:
+        Number of entries removed
+    """
+    _check_admin_key(x_admin_key)
+
+    removed = answer_cache.purge()
+    logger.info(f"Answer cache purged via admin API ({removed} entries)")
+
+    return {
+        "success": True,
+        "removed": removed
+    }
+
+
+@router.delete("/answer-cache/{fingerprint}")
+async def invalidate_answer_cache_entry(fingerprint: str, x_admin_key: Optional[str] = Header(None)):
+    """
+    Remove a single answer cache entry.
+
+    Args:
+        fingerprint: Entry fingerprint (from GET /answer-cache)
+
+    Returns:
+        Success response
+    """
+    _check_admin_key(x_admin_key)
+
+    if not answer_cache.invalidate(fingerprint):
+        raise HTTPException(
+            status_code=404,
+            detail=f"Cache entry {fingerprint} not found"
+        )
+
+    return {
+        "success": True,
+        "message": f"Cache entry {fingerprint} removed"
+    }
+
+
+@router.get("/tool-cache")
+async def get_tool_cache(x_admin_key: Optional[str] = Header(None)):
+    """
+    Inspect the tool result cache.
+
+    Returns:
+        Tier sizes, per-tool policies and per-tool hit rates
+    """
+    _check_admin_key(x_admin_key)
+
+    return tool_result_cache.stats()
+
+
+@router.delete("/tool-cache")
+async def purge_tool_cache(tool: Optional[str] = None, x_admin_key: Optional[str] = Header(None)):
+    """
+    Remove cached tool results.
+
+    Args:
+        tool: Only purge results of this tool (all tools if omitted)
+
+    Returns:
+        Number of memory-tier entries removed
+    """
+    _check_admin_key(x_admin_key)
+
+    removed = tool_result_cache.purge(tool)
+    logger.info(f"Tool cache purged via admin API ({removed} entries)")
+
+    return {
+        "success": True,
+        "removed": removed
+    }
+
+
+@router.get("/scraper-store")
+async def get_scraper_store(x_admin_key: Optional[str] = Header(None)):
+    """
+    Inspect the scraped page store.
+
+    Returns:
+        Stored URLs, unique pages, bytes and hit/dedup counters
+    """
+    _check_admin_key(x_admin_key)
+
+    return scraper_store.stats()
+
+
+@router.delete("/scraper-store")
+async def purge_scraper_store(x_admin_key: Optional[str] = Header(None)):
+    """
+    Remove all stored pages so they are scraped again.
+
+    Returns:
+        Number of URLs removed
+    """
+    _check_admin_key(x_admin_key)
+
+    removed = scraper_store.purge()
+    logger.info(f"Scraper store purged via admin API ({removed} URLs)")
+
+    return {
+        "success": True,
+        "removed": removed
+    }
+
+
+@router.get("/kcl-index")
+async def get_kcl_index(x_admin_key: Optional[str] = Header(None)):
+    """
+    Inspect the local KCL knowledge index.
+
+    Returns:
+        Indexed pages, passages and query/refresh counters
+    """
+    _check_admin_key(x_admin_key)
+
+    # Imported here: opening the index creates its SQLite file
+    from tools.kcl_index import kcl_index
+    return kcl_index.stats()
+
+
+@router.get("/social-cache")
+async def get_social_cache(x_admin_key: Optional[str] = Header(None)):
+    """
+    Inspect the social media result cache.
+
+    Returns:
+        Entries, refreshes in flight and fresh/stale hit counters
+    """
+    _check_admin_key(x_admin_key)
+
+    return social_result_cache.stats()
+
+
+@router.delete("/social-cache")
+async def purge_social_cache(x_admin_key: Optional[str] = Header(None)):
+    """
+    Remove all cached social lookups.
+
+    Returns:
+        Number of entries removed
+    """
+    _check_admin_key(x_admin_key)
+
+    removed = social_result_cache.purge()
+    logger.info(f"Social cache purged via admin API ({removed} entries)")
+
+    return {
+        "success": True,
+        "removed": removed
+    }
+
+
+@router.get("/apify-runs")
+async def get_apify_runs(x_admin_key: Optional[str] = Header(None)):
+    """
+    Inspect Apify actor runs of the social media tools.
+
+    Tools that have not been used yet are reported as "not loaded" rather
+    than built just to read their (empty) counters.
+
+    Returns:
+        Per-tool runs, items, dataset bytes/pages, decode and parse time
+    """
+    _check_admin_key(x_admin_key)
+
+    return {
+        name: tool_registry.get_tool(name).runner.metrics() if tool_registry.is_loaded(name) else "not loaded"
+        for name in ("tiktok", "instagram")
+    }
+
+
+@router.get("/tool-breakers")
+async def get_tool_breakers(x_admin_key: Optional[str] = Header(None)):
+    """
+    Inspect the per-tool circuit breakers.
+
+    Returns:
+        Per-tool state, window failure/slow-call rates, budgets and counters
+    """
+    _check_admin_key(x_admin_key)
+
+    return tool_registry.breaker_stats()
+
+
+@router.get("/tool-stats")
+async def get_tool_stats(x_admin_key: Optional[str] = Header(None)):
+    """
+    Inspect declared and observed tool latency and cost.
+
+    Returns:
+        Per-tool expected latency, declared latency and cost, availability and moving averages
+    """
+    _check_admin_key(x_admin_key)
+
+    return tool_registry.tool_profiles()
+
+
+@router.get("/timetable-feeds")
+async def get_timetable_feed_cache(x_admin_key: Optional[str] = Header(None)):
+    """
+    Inspect the iCal feed cache.
+
+    Returns:
+        Cached feed count, size and revalidation counters
+    """
+    _check_admin_key(x_admin_key)
+
+    return ical_feed_cache.stats()
+
+
+@router.get("/http-client")
+async def get_http_client_metrics(x_admin_key: Optional[str] = Header(None)):
+    """
+    Inspect connection reuse of the shared outbound HTTP client.
+
+    Returns:
+        Request, connection and TLS handshake counts per host
+    """
+    _check_admin_key(x_admin_key)
+
+    return http_client.metrics()
@@ -3,6 +3,9 @@
 from fastapi import APIRouter, HTTPException
 from models.session import SessionResponse, SessionStatus
 from core.session import session_manager
+from core.conversation_memory import conversation_memory
+from core.timetable_warmer import timetable_warmer
+from services.checkpoint_service import get_checkpoint_service
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -88,6 +91,14 @@ async def delete_session(session_id: str):
             )
 
         session_manager.delete_session(session_id)
+        conversation_memory.delete(session_id)
+        timetable_warmer.forget(session_id)
+
+        # Drop any durable agent state for this session
+        checkpoint_service = get_checkpoint_service()
+        if checkpoint_service:
+            await checkpoint_service.adelete_thread(session_id)
+
         logger.info(f"Deleted session: {session_id}")
 
         return {
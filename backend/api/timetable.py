@@ -1,8 +1,12 @@
 """Timetable API endpoints."""
 
+from typing import Any, Optional
+import httpx
 from fastapi import APIRouter, HTTPException
-from models.session import TimetableUrlRequest, TimetableUrlResponse
+from models.session import TimetableUrlRequest, TimetableUrlResponse, TimetableStatusResponse
 from core.session import session_manager
+from core.timetable_warmer import timetable_warmer
+from tools.tool_registry import tool_registry
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -31,11 +35,15 @@ async def set_timetable_url(request: TimetableUrlRequest):
         # Set the iCal URL
         session_manager.set_ical_url(request.session_id, request.ical_url)
 
+        # Fetch, parse and index the feed in the background
+        timetable_warmer.start(request.session_id, request.ical_url)
+
         logger.info(f"Successfully set timetable URL for session {request.session_id}")
 
         return {
             "success": True,
-            "message": "Timetable URL set successfully"
+            "message": "Timetable URL set successfully",
+            "status_url": f"/api/timetable/status/{request.session_id}"
         }
 
     except Exception as e:
@@ -71,3 +79,120 @@ async def get_timetable_url(session_id: str):
             status_code=500,
             detail=f"Failed to get timetable URL: {str(e)}"
         )
+
+
+@router.get("/status/{session_id}", response_model=TimetableStatusResponse)
+async def get_timetable_status(session_id: str):
+    """
+    Get the validation status of a session's timetable feed.
+
+    Args:
+        session_id: Session identifier
+
+    Returns:
+        TimetableStatusResponse with reachability, event count and parse errors
+    """
+    ical_url = session_manager.get_ical_url(session_id)
+    if ical_url is None:
+        return TimetableStatusResponse(has_timetable=False)
+
+    status = timetable_warmer.get_status(session_id)
+    if status is None:
+        # URL set before this process started; validate it now
+        timetable_warmer.start(session_id, ical_url)
+        status = timetable_warmer.get_status(session_id)
+
+    return TimetableStatusResponse(
+        has_timetable=True,
+        state=status["state"],
+        reachable=status["reachable"],
+        http_status=status["http_status"],
+        source=status["source"],
+        event_count=status["event_count"],
+        parse_errors=status["parse_errors"],
+        error=status["error"]
+    )
+
+
+async def _run_timetable_query(session_id: str, action: str, days: int = 7, **kwargs: Any) -> Any:
+    """
+    Answer a computed timetable query for a session.
+
+    Raises:
+        HTTPException: 404 without a timetable, 400 for bad arguments, 502 if the feed fails
+    """
+    ical_url = session_manager.get_ical_url(session_id)
+    if not ical_url:
+        raise HTTPException(status_code=404, detail=f"No timetable configured for session {session_id}")
+
+    tool = tool_registry.get_tool("timetable")
+    # Imported here: the timetable tool (and icalendar) load on first use
+    from tools.timetable_tool import TimetableFetchError
+
+    try:
+        index = await tool.aload_index(ical_url, days)
+        return tool.run_action(index, action, days_ahead=days, **kwargs)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except (TimetableFetchError, httpx.HTTPError) as e:
+        logger.error(f"Timetable query failed for session {session_id}: {str(e)}")
+        raise HTTPException(status_code=502, detail=f"Could not load timetable: {str(e)}")
+
+
+@router.get("/next-event/{session_id}")
+async def get_next_event(session_id: str):
+    """
+    Get the class in progress and the next one.
+
+    Args:
+        session_id: Session identifier
+
+    Returns:
+        Current and next event with minutes until it starts
+    """
+    return await _run_timetable_query(session_id, "next_event")
+
+
+@router.get("/free-slots/{session_id}")
+async def get_free_slots(
+    session_id: str,
+    date: Optional[str] = None,
+    day_start: Optional[str] = None,
+    day_end: Optional[str] = None,
+    min_minutes: int = 30
+):
+    """
+    Get free and busy periods on one day.
+
+    Args:
+        session_id: Session identifier
+        date: YYYY-MM-DD, "today", "tomorrow" or a weekday name (default: today)
+        day_start: Window start, HH:MM (default: 09:00)
+        day_end: Window end, HH:MM (default: 18:00)
+        min_minutes: Shortest gap reported as free
+
+    Returns:
+        Busy periods, free periods and total free minutes
+    """
+    return await _run_timetable_query(
+        session_id, "free_slots",
+        date=date, day_start=day_start, day_end=day_end, min_minutes=min_minutes
+    )
+
+
+@router.get("/daily-load/{session_id}")
+async def get_daily_load(session_id: str, date: Optional[str] = None, days: int = 7):
+    """
+    Get the number of events and scheduled hours per day.
+
+    Args:
+        session_id: Session identifier
+        date: First day (default: today)
+        days: Number of days to report (1-31)
+
+    Returns:
+        Per-day load and totals
+    """
+    if not 1 <= days <= 31:
+        raise HTTPException(status_code=400, detail="days must be between 1 and 31")
+    return await _run_timetable_query(session_id, "daily_load", days=days, date=date)
@@ -0,0 +1,317 @@
+"""
+KCL Student Bot - Offline batch runner
+
+Runs queries from a JSONL file through the ReAct agent graph with configurable
+concurrency and writes per-query results and timing breakdowns to JSONL.
+Use it to measure throughput and latency before changing
+MAX_AGENT_ITERATIONS, models or prompts.
+
+Input lines are JSON objects with a "query" and optionally "id", "ical_url"
+and "conversation_history". Plain strings are accepted as queries too.
+
+Usage:
+    python batch_runner.py queries.jsonl results.jsonl --concurrency 4
+    python batch_runner.py queries.jsonl results.jsonl --stub-llm --stub-tools
+"""
+
+import argparse
+import contextvars
+import json
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+# Per-query timing accumulator (propagated into LangGraph worker threads)
+_query_timings: contextvars.ContextVar = contextvars.ContextVar("query_timings", default=None)
+
+# Placeholder credentials so settings load in fully stubbed runs
+_STUB_ENV = {
+    "OPENROUTER_API_KEY": "stub",
+    "SUPABASE_URL": "http://localhost",
+    "SUPABASE_KEY": "stub",
+    "SERPAPI_API_KEY": "stub",
+    "FIRECRAWL_API_KEY": "stub",
+}
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Run queries through the ReAct agent in batch.")
+    parser.add_argument("input", help="Input JSONL file with one query per line")
+    parser.add_argument("output", help="Output JSONL file for per-query results")
+    parser.add_argument("--concurrency", type=int, default=4, help="Queries run in parallel (default: 4)")
+    parser.add_argument("--max-iterations", type=int, default=None, help="Override MAX_AGENT_ITERATIONS")
+    parser.add_argument("--model", default=None, help="Override DEFAULT_MODEL")
+    parser.add_argument("--limit", type=int, default=None, help="Only run the first N queries")
+    parser.add_argument("--stub-llm", action="store_true", help="Replace the LLM with a deterministic stub")
+    parser.add_argument("--stub-tools", action="store_true", help="Replace all tools with canned results")
+    parser.add_argument("--stub-llm-ms", type=int, default=300, help="Simulated stub LLM latency (default: 300)")
+    parser.add_argument("--stub-tool-ms", type=int, default=200, help="Simulated stub tool latency (default: 200)")
+    return parser.parse_args(argv)
+
+
+def load_queries(path: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Load queries from a JSONL file.
+
+    Args:
+        path: Input file path
+        limit: Optional maximum number of queries
+
+    Returns:
+        List of query dictionaries with at least "id" and "query"
+    """
+    queries = []
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            item = json.loads(line)
+            if isinstance(item, str):
+                item = {"query": item}
+            if not item.get("query"):
+                raise ValueError(f"Line {line_no} has no 'query'")
+            item.setdefault("id", str(line_no))
+            queries.append(item)
+            if limit and len(queries) >= limit:
+                break
+    return queries
+
+
+def install_stub_llm(llm_service, latency_ms: int) -> None:
+    """
+    Replace llm_service.generate with a deterministic stub.
+
+    The stub searches for the question on the first iteration and answers
+    on the next, which exercises one full reasoning/tool/observation loop.
+    """
+
+    def generate(messages, model=None, temperature=0.7, max_tokens=2000):
+        time.sleep(latency_ms / 1000)
+        last = messages[-1].get("content", "")
+
+        if '"strategy"' in last:
+            return json.dumps({"strategy": "Search, then answer.", "reasoning": "Stub planner."})
+
+        question = last.split("\n", 1)[0].replace("User question:", "").strip()
+        if "Observation from previous action" in last:
+            return json.dumps({
+                "thought": "I have enough information to answer.",
+                "action": "final_answer",
+                "action_input": {"response": f"Stub answer for: {question}"}
+            })
+        return json.dumps({
+            "thought": "I should search for this.",
+            "action": "search",
+            "action_input": {"query": question, "num_results": 3}
+        })
+
+    llm_service.generate = generate
+
+
+def install_stub_tools(tool_registry, latency_ms: int) -> None:
+    """Replace every registered tool with one returning canned results."""
+    from tools.base import BaseTool
+    from tools.records import TimetableEvent
+
+    canned = {
+        "search": [
+            {"title": f"Stub result {i}", "link": f"https://www.kcl.ac.uk/stub/{i}", "snippet": "Stub snippet."}
+            for i in range(1, 4)
+        ],
+        "scraper": "# Stub page\n\nStub page content. " * 50,
+        "timetable": [
+            TimetableEvent(
+                summary="Stub Lecture",
+                start=datetime.now() + timedelta(days=1),
+                end=datetime.now() + timedelta(days=1, hours=1),
+                location="Strand Building"
+            )
+        ],
+        "research": {
+            "query": "stub",
+            "sources": [{"title": "Stub page", "url": "https://www.kcl.ac.uk/stub", "snippet": "Stub snippet.", "excerpt": "Stub excerpt. " * 50}],
+            "unread": []
+        },
+        "kcl_index": [
+            {"title": "Stub page", "url": "https://www.kcl.ac.uk/stub", "passage": "Stub passage. " * 20, "score": 1.0}
+        ],
+        "tiktok": [],
+        "instagram": [],
+    }
+
+    class StubTool(BaseTool):
+        def execute(self, **kwargs) -> Any:
+            time.sleep(latency_ms / 1000)
+            return canned.get(self.name)
+
+    for name in tool_registry.get_tool_names():
+        spec = tool_registry.get_spec(name)
+        tool_registry._tools[name] = StubTool(name=name, description=spec.description)
+
+
+def wrap_llm_timing(llm_service) -> None:
+    """Record time spent in llm_service.generate per query."""
+    generate = llm_service.generate
+
+    def timed_generate(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return generate(*args, **kwargs)
+        finally:
+            timings = _query_timings.get()
+            if timings is not None:
+                timings["llm_calls"] += 1
+                timings["llm_ms"] += (time.perf_counter() - started) * 1000
+
+    llm_service.generate = timed_generate
+
+
+def run_query(graph, item: Dict[str, Any], max_iterations: Optional[int]) -> Dict[str, Any]:
+    """
+    Run one query through the graph, timing each node.
+
+    Args:
+        graph: Compiled ReAct graph (without checkpointer)
+        item: Query dictionary
+        max_iterations: Optional max_iterations override
+
+    Returns:
+        Result record for the output file
+    """
+    from agents.react_state import create_initial_state
+
+    timings = {"llm_calls": 0, "llm_ms": 0.0}
+    _query_timings.set(timings)
+
+    initial_state = create_initial_state(
+        query=item["query"],
+        user_id=f"batch-{item['id']}",
+        ical_url=item.get("ical_url"),
+        max_iterations=max_iterations,
+        conversation_history=item.get("conversation_history")
+    )
+
+    node_ms: Dict[str, float] = {}
+    final_state: Dict[str, Any] = {}
+    error = None
+    started = time.perf_counter()
+    last = started
+
+    try:
+        for update in graph.stream(initial_state):
+            now = time.perf_counter()
+            for node_name, node_state in update.items():
+                node_ms[node_name] = node_ms.get(node_name, 0.0) + (now - last) * 1000
+                final_state.update(node_state or {})
+            last = now
+    except Exception as e:
+        error = str(e)
+
+    total_ms = (time.perf_counter() - started) * 1000
+    tool_calls = final_state.get("tool_calls", [])
+
+    tool_ms: Dict[str, float] = {}
+    for tc in tool_calls:
+        name = tc.get("tool_name", "")
+        tool_ms[name] = round(tool_ms.get(name, 0.0) + (tc.get("duration_ms") or 0.0), 1)
+
+    return {
+        "id": item["id"],
+        "query": item["query"],
+        "response": final_state.get("final_response"),
+        "error": error,
+        "iterations": final_state.get("current_iteration", 0),
+        "tools_used": [tc.get("tool_name") for tc in tool_calls],
+        "tool_errors": [tc.get("error") for tc in tool_calls if tc.get("error")],
+        "timings": {
+            "total_ms": round(total_ms, 1),
+            "llm_ms": round(timings["llm_ms"], 1),
+            "llm_calls": timings["llm_calls"],
+            "nodes_ms": {name: round(ms, 1) for name, ms in node_ms.items()},
+            "tools_ms": tool_ms,
+        },
+    }
+
+
+def summarise(results: List[Dict[str, Any]], wall_seconds: float) -> Dict[str, Any]:
+    """Aggregate throughput and latency statistics."""
+    latencies = sorted(r["timings"]["total_ms"] for r in results)
+    if not latencies:
+        return {"queries": 0}
+
+    def percentile(p: float) -> float:
+        return latencies[min(len(latencies) - 1, int(p * len(latencies)))]
+
+    return {
+        "queries": len(results),
+        "errors": sum(1 for r in results if r["error"]),
+        "wall_seconds": round(wall_seconds, 2),
+        "throughput_qps": round(len(results) / wall_seconds, 3) if wall_seconds else 0.0,
+        "latency_ms": {
+            "mean": round(statistics.mean(latencies), 1),
+            "p50": percentile(0.50),
+            "p95": percentile(0.95),
+            "max": latencies[-1],
+        },
+        "mean_iterations": round(statistics.mean(r["iterations"] for r in results), 2),
+        "mean_llm_ms": round(statistics.mean(r["timings"]["llm_ms"] for r in results), 1),
+        "tool_calls": sum(len(r["tools_used"]) for r in results),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """CLI entry point."""
+    args = parse_args(argv)
+
+    if args.stub_llm and args.stub_tools:
+        for key, value in _STUB_ENV.items():
+            os.environ.setdefault(key, value)
+    if args.model:
+        os.environ["DEFAULT_MODEL"] = args.model
+
+    # Imported after the environment is prepared so settings pick it up
+    from agents.react_graph import create_react_agent_graph
+    from services.llm_service import llm_service
+    from tools.tool_registry import tool_registry
+
+    if args.model:
+        llm_service.default_model = args.model
+    if args.stub_llm:
+        install_stub_llm(llm_service, args.stub_llm_ms)
+    if args.stub_tools:
+        install_stub_tools(tool_registry, args.stub_tool_ms)
+    wrap_llm_timing(llm_service)
+
+    queries = load_queries(args.input, args.limit)
+    graph = create_react_agent_graph(checkpointer=False)
+
+    print(f"Running {len(queries)} queries with concurrency {args.concurrency}...", file=sys.stderr)
+
+    results = []
+    started = time.perf_counter()
+    with open(args.output, "w", encoding="utf-8") as out, \
+            ThreadPoolExecutor(max_workers=max(1, args.concurrency)) as executor:
+        futures = [
+            executor.submit(contextvars.copy_context().run, run_query, graph, item, args.max_iterations)
+            for item in queries
+        ]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            out.write(json.dumps(result, default=str) + "\n")
+            out.flush()
+
+    summary = summarise(results, time.perf_counter() - started)
+    summary["tool_cache"] = tool_registry.cache.stats()["tools"]
+    print(json.dumps(summary, indent=2))
+    return 0 if not summary.get("errors") else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
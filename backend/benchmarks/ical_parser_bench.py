@@ -0,0 +1,113 @@
+"""
+Benchmark the streaming VEVENT parser against icalendar's full parser.
+
+Synthetic feeds are generated chunk by chunk, as they would arrive from the
+network. The full parser needs the whole body joined in memory before
+Calendar.from_ical builds its component tree. The streaming parser consumes
+chunks as they come. Peak memory is measured with tracemalloc and covers the
+body buffer plus the parser's own allocations.
+
+Usage (from backend/):
+    python benchmarks/ical_parser_bench.py
+    python benchmarks/ical_parser_bench.py --events 2000 20000 --chunk-kb 64
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterator, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from icalendar import Calendar  # noqa: E402
+
+from tools.ical_stream import VEventStreamParser  # noqa: E402
+
+
+def feed_chunks(n_events: int, chunk_size: int) -> Iterator[bytes]:
+    """Yield a synthetic feed in network-sized chunks without building it whole."""
+    start = datetime(2026, 9, 21, 9, 0)
+    pending = b"BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//bench//EN\r\n"
+    for i in range(n_events):
+        begin = start + timedelta(days=(i * 270) // n_events, hours=i % 8)
+        rrule = "RRULE:FREQ=WEEKLY;COUNT=11\r\n" if i % 10 == 0 else ""
+        pending += (
+            "BEGIN:VEVENT\r\n"
+            f"UID:bench-{i}@kcl.ac.uk\r\n"
+            f"DTSTAMP:20260901T000000Z\r\n"
+            f"SUMMARY:6CCS3AIN Artificial Intelligence - Lecture {i}\r\n"
+            f"DTSTART;TZID=Europe/London:{begin:%Y%m%dT%H%M%S}\r\n"
+            f"DTEND;TZID=Europe/London:{begin + timedelta(hours=1):%Y%m%dT%H%M%S}\r\n"
+            f"{rrule}"
+            "LOCATION:Bush House (N) 1.01\r\n"
+            "DESCRIPTION:Weekly lecture for the module. Please bring your laptop and\r\n"
+            "  check KEATS for the reading list before attending.\r\n"
+            "BEGIN:VALARM\r\nACTION:DISPLAY\r\nTRIGGER:-PT15M\r\nDESCRIPTION:Reminder\r\nEND:VALARM\r\n"
+            "END:VEVENT\r\n"
+        ).encode("utf-8")
+        while len(pending) >= chunk_size:
+            yield pending[:chunk_size]
+            pending = pending[chunk_size:]
+    yield pending + b"END:VCALENDAR\r\n"
+
+
+def full_parse(n_events: int, chunk_size: int) -> int:
+    content = b"".join(feed_chunks(n_events, chunk_size))
+    return len(Calendar.from_ical(content).walk("VEVENT"))
+
+
+def streaming_parse(n_events: int, chunk_size: int) -> int:
+    # Events are kept, as the timetable tool caches them
+    parser = VEventStreamParser()
+    events = []
+    for chunk in feed_chunks(n_events, chunk_size):
+        events.extend(parser.feed(chunk))
+    events.extend(parser.close())
+    return len(events)
+
+
+def measure(parse: Callable[[int, int], int], n_events: int, chunk_size: int) -> Tuple[int, float, float]:
+    """Return (events, seconds, peak MiB). Timing runs without tracemalloc overhead."""
+    started = time.perf_counter()
+    events = parse(n_events, chunk_size)
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    parse(n_events, chunk_size)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return events, elapsed, peak / (1024 * 1024)
+
+
+def run(n_events: int, chunk_size: int) -> Dict[str, Any]:
+    feed_bytes = sum(len(chunk) for chunk in feed_chunks(n_events, chunk_size))
+    full_events, full_s, full_mb = measure(full_parse, n_events, chunk_size)
+    stream_events, stream_s, stream_mb = measure(streaming_parse, n_events, chunk_size)
+    assert full_events == stream_events == n_events
+
+    return {
+        "events": n_events,
+        "feed_mb": round(feed_bytes / (1024 * 1024), 2),
+        "icalendar_s": round(full_s, 3),
+        "icalendar_peak_mb": round(full_mb, 1),
+        "streaming_s": round(stream_s, 3),
+        "streaming_peak_mb": round(stream_mb, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, nargs="+", default=[1000, 10000], help="Feed sizes to test")
+    parser.add_argument("--chunk-kb", type=int, default=64, help="Network chunk size in KiB")
+    args = parser.parse_args()
+
+    for n_events in args.events:
+        print(json.dumps(run(n_events, args.chunk_kb * 1024)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Profile cold-start import time and memory of the backend.
+
+Each run imports a module in a fresh interpreter under `python -X importtime`,
+so nothing is shared between runs. The report covers the wall time of the
+import, peak RSS of the process, the number of modules loaded, which heavy
+SDKs were pulled in, and the slowest packages by cumulative import time.
+Tool SDKs and API clients should only load on first use, so importing `main`
+should not load any of the SDKs listed in LAZY_SDKS.
+
+Usage (from backend/):
+    python benchmarks/import_time_bench.py
+    python benchmarks/import_time_bench.py --modules main tools.tool_registry --runs 7
+    python benchmarks/import_time_bench.py --budget-ms 1500   # exit 1 on a regression
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+from typing import Any, Dict, List, Tuple
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Loaded on first use of the tool or service that needs them
+LAZY_SDKS = ["apify_client", "icalendar", "dateutil.rrule", "openai", "supabase"]
+
+CHILD = """
+import json, resource, sys, time
+started = time.perf_counter()
+import {module}
+elapsed_ms = (time.perf_counter() - started) * 1000
+print(json.dumps({{
+    "import_ms": elapsed_ms,
+    "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    "modules": len(sys.modules),
+    "sdks": [name for name in {sdks!r} if name in sys.modules],
+}}))
+"""
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s*(\S+)")
+
+
+def parse_importtime(stderr: str, module: str) -> List[Tuple[str, int]]:
+    """Packages (top-level names) with their cumulative import time in microseconds."""
+    imports = []
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match and "." not in match.group(3) and match.group(3) != module:
+            imports.append((match.group(3), int(match.group(2))))
+    return imports
+
+
+def run_once(module: str) -> Tuple[Dict[str, Any], List[Tuple[str, int]]]:
+    """Import module in a fresh interpreter."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", CHILD.format(module=module, sdks=LAZY_SDKS)],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    return json.loads(proc.stdout.strip().splitlines()[-1]), parse_importtime(proc.stderr, module)
+
+
+def run(module: str, runs: int, top: int) -> Dict[str, Any]:
+    # One untimed run warms the bytecode cache, as a deployed worker would have it
+    run_once(module)
+    samples, cumulative = [], {}
+    for _ in range(runs):
+        sample, imports = run_once(module)
+        samples.append(sample)
+        for name, micros in imports:
+            cumulative.setdefault(name, []).append(micros)
+
+    slowest = sorted(((name, statistics.median(times)) for name, times in cumulative.items()),
+                     key=lambda item: item[1], reverse=True)[:top]
+    return {
+        "module": module,
+        "runs": runs,
+        "import_ms": round(statistics.median(s["import_ms"] for s in samples), 1),
+        "max_rss_mb": round(statistics.median(s["max_rss_kb"] for s in samples) / 1024, 1),
+        "modules_loaded": samples[-1]["modules"],
+        "sdks_loaded": samples[-1]["sdks"],
+        "slowest_packages_ms": {name: round(micros / 1000, 1) for name, micros in slowest},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modules", nargs="+", default=["main", "tools.tool_registry"], help="Modules to import")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per module (median reported)")
+    parser.add_argument("--top", type=int, default=10, help="Slowest packages to list")
+    parser.add_argument("--budget-ms", type=float, default=None, help="Exit 1 if any median import exceeds this")
+    args = parser.parse_args()
+
+    over_budget = False
+    for module in args.modules:
+        result = run(module, args.runs, args.top)
+        print(json.dumps(result))
+        if args.budget_ms is not None and result["import_ms"] > args.budget_ms:
+            over_budget = True
+    sys.exit(1 if over_budget else 0)
+
+
+if __name__ == "__main__":
+    main()
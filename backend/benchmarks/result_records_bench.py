@@ -0,0 +1,219 @@
+"""
+Benchmark tool result records against the nested dictionaries they replaced.
+
+Synthetic Apify dataset items and timetable events are parsed both ways:
+
+- dict:   the original per-item nested dictionaries (author/stats/music sub-dicts)
+- record: the frozen, slotted records in tools/records.py
+
+For each kind the script reports the retained memory per item (tracemalloc,
+raw input excluded) plus parse and observation-formatting time per item.
+
+Usage (from backend/):
+    python benchmarks/result_records_bench.py
+    python benchmarks/result_records_bench.py --items 1000 10000 --repeat 5
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.records import InstagramPost, TikTokVideo, TimetableEvent  # noqa: E402
+
+ACCOUNTS = ["kingscollegelondon", "kclsu", "kclbusiness", "kcl_law", "kingsmedicine"]
+ROOMS = ["Bush House (N) 1.01", "Strand Building S-2.18", "King's Building K0.31", "Waterloo FWB 1.70"]
+
+
+# Synthetic inputs (decoded JSON, as Apify returns it)
+
+def tiktok_item(i: int) -> Dict[str, Any]:
+    return {
+        "id": str(7300000000000000000 + i),
+        "text": f"Day in the life of a KCL student #{i}: lectures at Bush House, library, society social",
+        "authorMeta": {"name": ACCOUNTS[i % 5], "nickName": ACCOUNTS[i % 5].upper(), "verified": i % 5 == 0},
+        "playCount": 1000 + i * 37, "diggCount": 100 + i, "commentCount": i % 50, "shareCount": i % 20,
+        "hashtags": [{"name": "kcl"}, {"name": "london"}, {"name": "studentlife"}, {"name": f"week{i % 12}"}],
+        "musicMeta": {"musicName": "original sound", "musicAuthor": ACCOUNTS[i % 5]},
+        "webVideoUrl": f"https://www.tiktok.com/@{ACCOUNTS[i % 5]}/video/{7300000000000000000 + i}",
+        "createTimeISO": "2026-10-01T12:00:00.000Z",
+    }
+
+
+def instagram_item(i: int) -> Dict[str, Any]:
+    return {
+        "id": str(3100000000000000000 + i), "shortCode": f"C{i:09d}",
+        "caption": f"Welcome week at King's! Post {i} from the Strand campus #kcl #welcomeweek",
+        "ownerUsername": ACCOUNTS[i % 5], "ownerFullName": "King's College London", "isVerified": True,
+        "likesCount": 500 + i, "commentsCount": i % 40, "hashtags": ["kcl", "welcomeweek"], "mentions": ["kclsu"],
+        "type": "Image", "url": f"https://www.instagram.com/p/C{i:09d}/",
+        "displayUrl": f"https://scontent.cdninstagram.com/v/{i}.jpg", "videoUrl": None,
+        "timestamp": "2026-09-20T10:00:00.000Z", "locationName": "King's College London",
+    }
+
+
+def timetable_event(i: int) -> Dict[str, Any]:
+    start = datetime(2026, 9, 21, 9, tzinfo=timezone.utc) + timedelta(hours=i % 8, days=i // 8)
+    return {
+        "summary": f"6CCS3AIN Artificial Intelligence - Lecture {i % 10}", "start": start,
+        "end": start + timedelta(hours=1), "location": ROOMS[i % 4], "description": "",
+    }
+
+
+# The original dictionary implementations
+
+def tiktok_dict(item: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "id": item.get("id", ""),
+        "description": item.get("text", ""),
+        "author": {
+            "username": item.get("authorMeta", {}).get("name", ""),
+            "nickname": item.get("authorMeta", {}).get("nickName", ""),
+            "verified": item.get("authorMeta", {}).get("verified", False),
+        },
+        "stats": {
+            "views": item.get("playCount", 0),
+            "likes": item.get("diggCount", 0),
+            "comments": item.get("commentCount", 0),
+            "shares": item.get("shareCount", 0),
+        },
+        "hashtags": [tag.get("name", "") for tag in item.get("hashtags", [])],
+        "music": {
+            "title": item.get("musicMeta", {}).get("musicName", ""),
+            "author": item.get("musicMeta", {}).get("musicAuthor", ""),
+        },
+        "url": item.get("webVideoUrl", ""),
+        "created_at": item.get("createTimeISO", ""),
+    }
+
+
+def tiktok_dict_observation(video: Dict[str, Any]) -> str:
+    lines = [f"- {video.get('description', 'No description')[:100]}"]
+    author = video.get("author", {})
+    lines.append(f"  By: @{author.get('username', 'unknown')}")
+    stats = video.get("stats", {})
+    lines.append(f"  Views: {stats.get('views', 0):,} | Likes: {stats.get('likes', 0):,}")
+    lines.append(f"  URL: {video.get('url', 'N/A')}")
+    return "\n".join(lines)
+
+
+def instagram_dict(item: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "id": item.get("id", ""),
+        "shortcode": item.get("shortCode", ""),
+        "caption": item.get("caption", ""),
+        "author": {
+            "username": item.get("ownerUsername", ""),
+            "full_name": item.get("ownerFullName", ""),
+            "verified": item.get("isVerified", False),
+        },
+        "stats": {
+            "likes": item.get("likesCount", 0),
+            "comments": item.get("commentsCount", 0),
+        },
+        "hashtags": item.get("hashtags", []),
+        "mentions": item.get("mentions", []),
+        "media_type": item.get("type", ""),
+        "url": item.get("url", ""),
+        "display_url": item.get("displayUrl", ""),
+        "video_url": item.get("videoUrl", ""),
+        "created_at": item.get("timestamp", ""),
+        "location": item.get("locationName", ""),
+    }
+
+
+def instagram_dict_observation(post: Dict[str, Any]) -> str:
+    caption = post.get("caption", "No caption")
+    if len(caption) > 100:
+        caption = caption[:100] + "..."
+    lines = [f"- {caption}"]
+    author = post.get("author", {})
+    lines.append(f"  By: @{author.get('username', 'unknown')}")
+    stats = post.get("stats", {})
+    lines.append(f"  Likes: {stats.get('likes', 0):,} | Comments: {stats.get('comments', 0):,}")
+    if post.get("location"):
+        lines.append(f"  Location: {post.get('location')}")
+    lines.append(f"  URL: {post.get('url', 'N/A')}")
+    return "\n".join(lines)
+
+
+def event_dict(event: Dict[str, Any]) -> Dict[str, Any]:
+    return dict(event)
+
+
+def event_dict_observation(event: Dict[str, Any]) -> str:
+    lines = [f"- {event.get('summary', 'Untitled')}", f"  When: {event['start'].strftime('%a %d %b, %H:%M')}"]
+    if event.get("location"):
+        lines.append(f"  Where: {event.get('location')}")
+    return "\n".join(lines)
+
+
+# Measurement
+
+def retained_bytes(parse: Callable[[Any], Any], raw: List[Any]) -> int:
+    """Memory held by the parsed list, excluding the raw input."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    parsed = [parse(item) for item in raw]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del parsed
+    return after - before
+
+
+def per_item_us(fn: Callable[[Any], Any], items: List[Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for item in items:
+            fn(item)
+        best = min(best, time.perf_counter() - started)
+    return best / len(items) * 1e6
+
+
+def run(kind: str, n_items: int, repeat: int) -> Dict[str, Any]:
+    make, parse_dict, observe_dict, parse_record = {
+        "tiktok": (tiktok_item, tiktok_dict, tiktok_dict_observation, TikTokVideo.from_apify),
+        "instagram": (instagram_item, instagram_dict, instagram_dict_observation, InstagramPost.from_apify),
+        "timetable": (timetable_event, event_dict, event_dict_observation, lambda e: TimetableEvent(**e)),
+    }[kind]
+    raw = [make(i) for i in range(n_items)]
+    dicts = [parse_dict(item) for item in raw]
+    records = [parse_record(item) for item in raw]
+    assert [parse_record(item).to_observation() for item in raw[:3]] == [observe_dict(d) for d in dicts[:3]]
+
+    dict_bytes = retained_bytes(parse_dict, raw)
+    record_bytes = retained_bytes(parse_record, raw)
+    return {
+        "kind": kind,
+        "items": n_items,
+        "dict_bytes_per_item": round(dict_bytes / n_items),
+        "record_bytes_per_item": round(record_bytes / n_items),
+        "memory_saved_pct": round(100 * (1 - record_bytes / dict_bytes), 1),
+        "dict_parse_us": round(per_item_us(parse_dict, raw, repeat), 2),
+        "record_parse_us": round(per_item_us(parse_record, raw, repeat), 2),
+        "dict_format_us": round(per_item_us(observe_dict, dicts, repeat), 2),
+        "record_format_us": round(per_item_us(lambda r: r.to_observation(), records, repeat), 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, nargs="+", default=[100, 1000, 10000], help="Items per run")
+    parser.add_argument("--kinds", nargs="+", default=["tiktok", "instagram", "timetable"], help="Record kinds")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions (best reported)")
+    args = parser.parse_args()
+
+    for kind in args.kinds:
+        for n_items in args.items:
+            print(json.dumps(run(kind, n_items, args.repeat)))
+
+
+if __name__ == "__main__":
+    main()
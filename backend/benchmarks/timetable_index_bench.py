@@ -0,0 +1,125 @@
+"""
+Benchmark timetable range queries: linear calendar walk vs the sorted event index.
+
+Builds synthetic feeds, then times the queries the agent asks most often
+("next class", "today", "this week") with three strategies:
+
+- walk:   cal.walk() and filter every VEVENT per query (the original tool)
+- linear: filter a pre-parsed event list per query
+- index:  bisect the EventIndex
+
+Usage (from backend/):
+    python benchmarks/timetable_index_bench.py
+    python benchmarks/timetable_index_bench.py --events 5000 20000 --queries 200
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from icalendar import Calendar  # noqa: E402
+
+from tools.timetable_index import EventIndex  # noqa: E402
+
+MODULES = [f"{code} Lecture" for code in ("6CCS3AIN", "5CCS2FC2", "4CCS1PRP", "6CCS3PRJ", "5CCS2SEG")]
+ROOMS = ["Bush House (N) 1.01", "Strand Building S-2.18", "King's Building K0.31", "Waterloo FWB 1.70"]
+
+
+def synthetic_feed(n_events: int) -> bytes:
+    """An academic-year-style feed with n_events one-hour events around now."""
+    start = datetime.now().replace(minute=0, second=0, microsecond=0) - timedelta(days=180)
+    lines = ["BEGIN:VCALENDAR", "VERSION:2.0", "PRODID:-//bench//EN"]
+    for i in range(n_events):
+        begin = start + timedelta(hours=9 + (i * 7) % 9, days=(i * 365) // n_events)
+        lines += [
+            "BEGIN:VEVENT",
+            f"UID:bench-{i}@kcl",
+            f"SUMMARY:{MODULES[i % len(MODULES)]}",
+            f"DTSTART:{begin:%Y%m%dT%H%M%S}",
+            f"DTEND:{begin + timedelta(hours=1):%Y%m%dT%H%M%S}",
+            f"LOCATION:{ROOMS[i % len(ROOMS)]}",
+            "END:VEVENT",
+        ]
+    lines.append("END:VCALENDAR")
+    return "\r\n".join(lines).encode("utf-8")
+
+
+def walk_query(cal: Calendar, start: datetime, end: datetime) -> List[Dict[str, Any]]:
+    events = []
+    for component in cal.walk():
+        if component.name == "VEVENT":
+            dt = component.get("dtstart").dt
+            if start <= dt <= end:
+                events.append({"summary": str(component.get("summary")), "start": dt})
+    return events
+
+
+def linear_query(events: List[Dict[str, Any]], start: datetime, end: datetime) -> List[Dict[str, Any]]:
+    return [event for event in events if start <= event["start"] <= end]
+
+
+def time_queries(query: Callable[[datetime, datetime], Any], windows, repeat: int) -> float:
+    """Mean milliseconds per query over all windows."""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for start, end in windows:
+            query(start, end)
+    return (time.perf_counter() - started) * 1000 / (repeat * len(windows))
+
+
+def run(n_events: int, queries: int) -> Dict[str, Any]:
+    content = synthetic_feed(n_events)
+    cal = Calendar.from_ical(content)
+    events = [
+        {
+            "summary": str(c.get("summary")),
+            "start": c.get("dtstart").dt,
+            "end": c.get("dtend").dt,
+            "location": str(c.get("location")),
+        }
+        for c in cal.walk("VEVENT")
+    ]
+
+    started = time.perf_counter()
+    index = EventIndex(events)
+    build_ms = (time.perf_counter() - started) * 1000
+
+    now = datetime.now()
+    windows = [
+        (now, now + timedelta(hours=12)),  # next class
+        (now.replace(hour=0, minute=0), now.replace(hour=23, minute=59)),  # today
+        (now, now + timedelta(days=7)),  # this week
+    ]
+    for start, end in windows:
+        assert len(index.between(start, end)) == len(linear_query(events, start, end))
+
+    walk_repeat = max(1, queries // 20)
+    return {
+        "events": n_events,
+        "feed_bytes": len(content),
+        "index_build_ms": round(build_ms, 2),
+        "walk_ms_per_query": round(time_queries(lambda s, e: walk_query(cal, s, e), windows, walk_repeat), 4),
+        "linear_ms_per_query": round(time_queries(lambda s, e: linear_query(events, s, e), windows, queries), 4),
+        "index_ms_per_query": round(time_queries(index.between, windows, queries), 4),
+        "next_event_ms": round(time_queries(lambda s, e: index.next_event(s), windows, queries), 4),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, nargs="+", default=[500, 5000, 20000], help="Feed sizes to test")
+    parser.add_argument("--queries", type=int, default=200, help="Repetitions per query window")
+    args = parser.parse_args()
+
+    for n_events in args.events:
+        print(json.dumps(run(n_events, args.queries)))
+
+
+if __name__ == "__main__":
+    main()
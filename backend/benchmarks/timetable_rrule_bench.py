@@ -0,0 +1,121 @@
+"""
+Benchmark recurrence handling: naive per-query RRULE expansion vs the
+materialised occurrence index.
+
+Builds synthetic feeds of weekly recurring events (with EXDATEs, as term
+timetables have reading weeks) and times:
+
+- naive: per query, walk every VEVENT and expand its RRULE over the query window
+- materialised: expand all events once over the rolling window (build cost
+  reported separately), then bisect the EventIndex per query
+
+Usage (from backend/):
+    python benchmarks/timetable_rrule_bench.py
+    python benchmarks/timetable_rrule_bench.py --series 100 1000 --queries 200
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List
+from zoneinfo import ZoneInfo
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dateutil.rrule import rrulestr  # noqa: E402
+from icalendar import Calendar  # noqa: E402
+
+from tools.ical_recurrence import expand_events  # noqa: E402
+from tools.timetable_index import EventIndex  # noqa: E402
+
+TZ = ZoneInfo("Europe/London")
+
+
+def synthetic_feed(n_series: int) -> bytes:
+    """n_series weekly events over a 22-week year, each with a reading-week EXDATE."""
+    start = datetime.now(TZ).replace(minute=0, second=0, microsecond=0) - timedelta(weeks=8)
+    lines = ["BEGIN:VCALENDAR", "VERSION:2.0", "PRODID:-//bench//EN"]
+    for i in range(n_series):
+        begin = (start + timedelta(days=i % 5)).replace(hour=9 + i % 8)
+        reading_week = begin + timedelta(weeks=6)
+        lines += [
+            "BEGIN:VEVENT",
+            f"UID:series-{i}@kcl",
+            f"SUMMARY:Module {i % 40} Seminar",
+            f"DTSTART;TZID=Europe/London:{begin:%Y%m%dT%H%M%S}",
+            f"DTEND;TZID=Europe/London:{begin + timedelta(hours=1):%Y%m%dT%H%M%S}",
+            "RRULE:FREQ=WEEKLY;COUNT=22",
+            f"EXDATE;TZID=Europe/London:{reading_week:%Y%m%dT%H%M%S}",
+            f"LOCATION:Room {i % 30}",
+            "END:VEVENT",
+        ]
+    lines.append("END:VCALENDAR")
+    return "\r\n".join(lines).encode("utf-8")
+
+
+def naive_query(cal: Calendar, start: datetime, end: datetime) -> List[Dict[str, Any]]:
+    """Expand every series over the query window on each call."""
+    events = []
+    for component in cal.walk("VEVENT"):
+        dtstart = component.get("dtstart").dt
+        rule = rrulestr(component.get("rrule").to_ical().decode(), dtstart=dtstart)
+        excluded = {d.dt for exdate in [component.get("exdate")] if exdate for d in exdate.dts}
+        for occurrence in rule.between(start, end, inc=True):
+            if occurrence not in excluded:
+                events.append({"summary": str(component.get("summary")), "start": occurrence})
+    return events
+
+
+def time_queries(query: Callable[[datetime, datetime], Any], windows, repeat: int) -> float:
+    """Mean milliseconds per query over all windows."""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for start, end in windows:
+            query(start, end)
+    return (time.perf_counter() - started) * 1000 / (repeat * len(windows))
+
+
+def run(n_series: int, queries: int) -> Dict[str, Any]:
+    content = synthetic_feed(n_series)
+    cal = Calendar.from_ical(content)
+
+    now = datetime.now(TZ)
+    window_start, window_end = now - timedelta(days=7), now + timedelta(days=120)
+    started = time.perf_counter()
+    events, _ = expand_events(cal.walk("VEVENT"), window_start, window_end, TZ)
+    index = EventIndex(events, tz=TZ, window_start=window_start, window_end=window_end)
+    build_ms = (time.perf_counter() - started) * 1000
+
+    windows = [
+        (now, now + timedelta(hours=12)),  # next class
+        (now.replace(hour=0, minute=0), now.replace(hour=23, minute=59)),  # today
+        (now, now + timedelta(days=7)),  # this week
+    ]
+    for start, end in windows:
+        assert len(index.between(start, end)) == len(naive_query(cal, start, end))
+
+    naive_repeat = max(1, queries // 20)
+    return {
+        "series": n_series,
+        "occurrences": len(index),
+        "materialise_ms": round(build_ms, 2),
+        "naive_ms_per_query": round(time_queries(lambda s, e: naive_query(cal, s, e), windows, naive_repeat), 4),
+        "materialised_ms_per_query": round(time_queries(index.between, windows, queries), 4),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--series", type=int, nargs="+", default=[50, 500, 2000], help="Recurring series per feed")
+    parser.add_argument("--queries", type=int, default=200, help="Repetitions per query window")
+    args = parser.parse_args()
+
+    for n_series in args.series:
+        print(json.dumps(run(n_series, args.queries)))
+
+
+if __name__ == "__main__":
+    main()
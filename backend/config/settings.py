@@ -36,6 +36,84 @@ class Settings(BaseSettings):
     max_agent_iterations: int = 5
     enable_planning: bool = False
 
+    # Tool Execution Configuration
+    tool_thread_pool_size: int = 8  # Threads for tools without native async I/O
+    tool_timeout_seconds: int = 30  # Budget for tools without their own (see tools/circuit_breaker.py)
+
+    # Tool Circuit Breakers (fail fast while a tool's upstream is degraded)
+    circuit_breaker_enabled: bool = True
+    circuit_breaker_window: int = 20  # Recent calls considered per tool
+    circuit_breaker_min_calls: int = 5  # Calls in the window before the breaker can open
+    circuit_breaker_failure_rate: float = 0.5  # Errors, timeouts and empty results
+    circuit_breaker_slow_call_rate: float = 0.8
+    circuit_breaker_open_seconds: int = 60  # Then one probe call is let through
+    circuit_breaker_half_open_probes: int = 1
+
+    # Tool Cost/Latency Statistics (moving averages used for scheduling hints)
+    tool_stats_alpha: float = 0.2  # Weight of the newest call in the moving averages
+    tool_stats_min_samples: int = 3  # Calls before observed latency replaces the declared one
+    tool_prefetch_enabled: bool = True  # Warm free tools (timetable feed) while the agent reasons
+
+    # Outbound HTTP Configuration (shared pooled client used by all tools)
+    http_connect_timeout: float = 5.0
+    http_read_timeout: float = 30.0
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    http_max_connections_per_host: int = 10
+    http_enable_http2: bool = True
+
+    # Timetable Configuration
+    timetable_feed_freshness_seconds: int = 900  # Revalidate iCal feeds after this long
+    timetable_feed_cache_max_feeds: int = 500
+    timetable_timezone: str = "Europe/London"  # Used for floating and all-day iCal times
+    timetable_window_past_days: int = 7  # Recurring events are expanded over this window
+    timetable_window_future_days: int = 120
+
+    # Checkpointing Configuration (durable agent state per session)
+    enable_checkpointing: bool = False
+    checkpoint_db_path: str = "data/agent_checkpoints.sqlite"
+    checkpoint_retention_hours: int = 24
+
+    # Conversation Memory Configuration (running summary + recent messages)
+    memory_recent_messages: int = 4
+    summary_model: str = "anthropic/claude-3.5-haiku"
+    memory_summary_max_tokens: int = 300
+
+    # Answer Cache Configuration (general questions shared across sessions)
+    enable_answer_cache: bool = True
+    answer_cache_ttl_seconds: int = 21600
+    answer_cache_max_entries: int = 1000
+
+    # Tool Result Cache Configuration (identical tool calls shared across users)
+    enable_tool_cache: bool = True
+    tool_cache_ttl_search: int = 3600  # Seconds
+    tool_cache_ttl_research: int = 1800  # Seconds
+    tool_cache_max_memory_mb: int = 50
+    tool_cache_disk_path: str = ""  # e.g. data/tool_cache.sqlite (empty disables the disk tier)
+
+    # Scraped Content Store (pages shared across sessions, keyed by normalised URL)
+    scraper_store_max_age_seconds: int = 86400  # KCL pages change rarely
+    scraper_store_max_mb: int = 100
+
+    # Social Result Cache (TikTok / Instagram lookups, stale-while-revalidate)
+    social_cache_ttl_seconds: int = 900  # Served without refreshing
+    social_cache_stale_seconds: int = 3600  # Then served while one background refresh runs
+    social_cache_max_entries: int = 500
+
+    # KCL Knowledge Index (local SQLite FTS5 index of scraped KCL pages)
+    kcl_index_path: str = "data/kcl_index.sqlite"
+    kcl_index_domains: str = "kcl.ac.uk,kclsu.org"  # Comma-separated; subdomains included
+    kcl_index_passage_chars: int = 1200
+    kcl_index_refresh_from_scraper: bool = True  # Index pages the scraper tool fetches
+
+    # Apify Actor Runs (TikTok / Instagram)
+    apify_deadline_seconds: int = 90  # Return partial results after this long
+    apify_poll_interval_seconds: float = 2.0
+    apify_dataset_page_size: int = 25  # Items per dataset page; reads stop at the requested limit
+
+    # Admin API (leave empty to allow admin endpoints only in development)
+    admin_api_key: str = ""
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
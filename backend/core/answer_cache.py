@@ -0,0 +1,193 @@
+"""Cross-session answer cache for general (non-personal) questions.
+
+Answers are keyed on a normalised query fingerprint and only stored for runs
+that had no conversation context and used no personal tools, so the same
+general KCL question can be answered without a full agent loop.
+"""
+
+import hashlib
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+from config.settings import settings
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Tools whose results depend on the individual user
+PERSONAL_TOOLS = {"timetable"}
+
+_PUNCTUATION_RE = re.compile(r"[^\w\s]")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+@dataclass
+class CachedAnswer:
+    """A cached agent answer."""
+    fingerprint: str
+    query: str
+    response: str
+    tools_used: List[str] = field(default_factory=list)
+    created_at: float = field(default_factory=time.time)
+    hits: int = 0
+
+
+def normalise_query(query: str) -> str:
+    """Normalise a query for fingerprinting (case, punctuation, whitespace)."""
+    text = unicodedata.normalize("NFKC", query).lower()
+    text = _PUNCTUATION_RE.sub(" ", text)
+    return _WHITESPACE_RE.sub(" ", text).strip()
+
+
+def query_fingerprint(query: str, has_ical_url: bool = False) -> str:
+    """
+    Compute the cache key for a query.
+
+    The iCal flag is part of the key because the agent answers timetable-style
+    questions differently depending on whether a timetable is configured.
+
+    Args:
+        query: User's query message
+        has_ical_url: Whether the session has a timetable configured
+
+    Returns:
+        Hex fingerprint string
+    """
+    scope = "ical" if has_ical_url else "anon"
+    return hashlib.sha256(f"{scope}|{normalise_query(query)}".encode("utf-8")).hexdigest()[:32]
+
+
+class AnswerCache:
+    """In-memory TTL + LRU cache of agent answers."""
+
+    def __init__(self, ttl_seconds: int = 21600, max_entries: int = 1000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CachedAnswer]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, query: str, has_ical_url: bool = False) -> Optional[CachedAnswer]:
+        """Return a fresh cached answer for the query, if any."""
+        fingerprint = query_fingerprint(query, has_ical_url)
+        with self._lock:
+            entry = self._entries.get(fingerprint)
+            if entry and time.time() - entry.created_at > self.ttl_seconds:
+                del self._entries[fingerprint]
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(fingerprint)
+            entry.hits += 1
+            self.hits += 1
+            return entry
+
+    def put(
+        self,
+        query: str,
+        response: str,
+        tools_used: Iterable[str],
+        has_ical_url: bool = False
+    ) -> bool:
+        """
+        Store an answer unless the run used a personal tool.
+
+        Returns:
+            True if the answer was cached
+        """
+        tools_used = sorted(set(tools_used))
+        if PERSONAL_TOOLS.intersection(tools_used) or not response:
+            return False
+
+        fingerprint = query_fingerprint(query, has_ical_url)
+        with self._lock:
+            self._entries[fingerprint] = CachedAnswer(
+                fingerprint=fingerprint,
+                query=query,
+                response=response,
+                tools_used=tools_used
+            )
+            self._entries.move_to_end(fingerprint)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+        logger.info(f"Cached answer {fingerprint} for query: {query[:50]}")
+        return True
+
+    def invalidate(self, fingerprint: str) -> bool:
+        """Remove a single entry. Returns True if it existed."""
+        with self._lock:
+            return self._entries.pop(fingerprint, None) is not None
+
+    def purge(self) -> int:
+        """Remove all entries. Returns the number removed."""
+        with self._lock:
+            count = len(self._entries)
+            self._entries.clear()
+        logger.info(f"Purged {count} cached answers")
+        return count
+
+    def list_entries(self) -> List[Dict[str, Any]]:
+        """List non-expired entries, most recently used last."""
+        now = time.time()
+        with self._lock:
+            return [
+                {
+                    "fingerprint": entry.fingerprint,
+                    "query": entry.query,
+                    "tools_used": entry.tools_used,
+                    "hits": entry.hits,
+                    "age_seconds": int(now - entry.created_at),
+                    "response_preview": entry.response[:200]
+                }
+                for entry in self._entries.values()
+                if now - entry.created_at <= self.ttl_seconds
+            ]
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache size and hit/miss counters."""
+        total = self.hits + self.misses
+        return {
+            "enabled": settings.enable_answer_cache,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0
+        }
+
+
+def is_cacheable_turn(conversation_history: Optional[list], has_stored_context: bool = False) -> bool:
+    """
+    Check whether a turn may be served from / stored in the answer cache.
+
+    Args:
+        conversation_history: Client-supplied conversation history
+        has_stored_context: Whether the session has server-side conversation state
+
+    Returns:
+        True if the turn has no conversation context and caching is enabled
+    """
+    return settings.enable_answer_cache and not conversation_history and not has_stored_context
+
+
+def completed_normally(reasoning_trace: List[Dict[str, Any]]) -> bool:
+    """Check that a run ended with the model's own final_answer (not an error/fallback)."""
+    return bool(reasoning_trace) and reasoning_trace[-1].get("action") == "final_answer"
+
+
+# Global answer cache instance
+answer_cache = AnswerCache(
+    ttl_seconds=settings.answer_cache_ttl_seconds,
+    max_entries=settings.answer_cache_max_entries
+)
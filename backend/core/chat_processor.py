@@ -6,7 +6,11 @@ Handles chat message processing through the LangGraph ReAct workflow.
 from typing import Optional, Dict, Any, Tuple
 from agents.react_graph import react_agent_graph
 from agents.react_state import create_initial_state
+from core.answer_cache import answer_cache, is_cacheable_turn, completed_normally
+from core.conversation_memory import conversation_memory
+from services.checkpoint_service import get_checkpoint_service
 from services.supabase_service import supabase_service
+from tools.tool_registry import tool_registry
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -81,16 +85,58 @@ async def process_chat(
     try:
         logger.info(f"Processing query for session {session_id}: {query}")
 
+        # Bounded memory: running summary of older turns plus the last few messages
+        has_memory = conversation_memory.has_context(session_id)
+        summary, recent_history = conversation_memory.get_context(session_id, conversation_history)
+
         # Prepare initial state for ReAct agent (max_iterations defaults to settings)
         initial_state = create_initial_state(
             query=query,
             user_id=session_id,
             ical_url=ical_url,
-            conversation_history=conversation_history
+            conversation_history=recent_history,
+            conversation_summary=summary
+        )
+
+        checkpoint_service = get_checkpoint_service()
+        has_stored_context = has_memory or bool(
+            checkpoint_service and await checkpoint_service.ahas_history(react_agent_graph, session_id)
         )
 
+        # Serve general questions without conversation context from the answer cache
+        cacheable = is_cacheable_turn(conversation_history, has_stored_context)
+        if cacheable:
+            cached = answer_cache.get(query, has_ical_url=bool(ical_url))
+            if cached:
+                logger.info(f"Answer cache hit ({cached.fingerprint}) for session {session_id}")
+                if checkpoint_service:
+                    await checkpoint_service.arecord_turn(react_agent_graph, session_id, initial_state, cached.response)
+                conversation_memory.record_turn(session_id, query, cached.response)
+                try:
+                    save_messages_to_db(session_id, query, cached.response)
+                except Exception as db_error:
+                    logger.error(f"Error saving to database: {str(db_error)}")
+
+                debug_info = {
+                    "total_iterations": 0,
+                    "tool_calls_count": 0,
+                    "tools_used": [],
+                    "steps": []
+                } if include_steps else None
+                return cached.response, debug_info
+
+        # With checkpointing, resume an interrupted run or continue the stored thread
+        graph_input, config = initial_state, None
+        if checkpoint_service:
+            graph_input, config = await checkpoint_service.aprepare_run(
+                react_agent_graph, session_id, initial_state
+            )
+
+        # Warm free tools (the timetable feed) while the agent reasons about the query
+        tool_registry.start_prefetch(ical_url=ical_url)
+
         # Run through ReAct agent graph
-        result = react_agent_graph.invoke(initial_state)
+        result = await react_agent_graph.ainvoke(graph_input, config=config)
 
         # Extract response (with fallback for empty/None)
         response = result.get("final_response")
@@ -110,6 +156,13 @@ async def process_chat(
 
         logger.info(f"Successfully generated response for session {session_id}")
 
+        if cacheable and completed_normally(reasoning_trace):
+            tools_used = [tc.get("tool_name", "") for tc in tool_calls if tc.get("tool_name")]
+            answer_cache.put(query, response, tools_used, has_ical_url=bool(ical_url))
+
+        # Fold this turn into the session's memory (summary updates in the background)
+        conversation_memory.record_turn(session_id, query, response)
+
         # Extract debug info if requested
         debug_info = _extract_debug_info(result) if include_steps else None
 
@@ -141,23 +194,18 @@ def save_messages_to_db(
         assistant_message: Assistant's response
     """
     try:
-        # Save user message
-        supabase_service.save_chat_message(
+        # One insert per turn; sequence numbers keep the user message first
+        saved = supabase_service.save_chat_messages(
             user_id=session_id,
-            role="user",
-            content=user_message,
-            session_id=session_id
-        )
-
-        # Save assistant message
-        supabase_service.save_chat_message(
-            user_id=session_id,
-            role="assistant",
-            content=assistant_message,
-            session_id=session_id
+            session_id=session_id,
+            messages=[
+                {"role": "user", "content": user_message},
+                {"role": "assistant", "content": assistant_message}
+            ]
         )
 
-        logger.info(f"Messages saved to database for session {session_id}")
+        if saved:
+            logger.info(f"Messages saved to database for session {session_id}")
 
     except Exception as e:
         logger.error(f"Error saving messages to database: {str(e)}")
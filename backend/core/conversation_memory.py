@@ -0,0 +1,187 @@
+"""Rolling conversation memory for the KCL Student Bot.
+
+Keeps a compact running summary plus the last few messages per session, so the
+context sent with every reasoning iteration stays bounded however long the
+conversation gets. Older messages are folded into the summary in the background
+on a cheap model after each completed turn.
+"""
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from agents.prompts import get_summary_prompt
+from config.settings import settings
+from services.llm_service import llm_service
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Upper bound on summary length if the summariser fails and we fall back to truncation
+MAX_SUMMARY_CHARS = 2000
+
+
+@dataclass
+class SessionMemory:
+    """Memory for a single session."""
+    summary: str = ""
+    recent: List[Dict[str, str]] = field(default_factory=list)
+    pending: List[Dict[str, str]] = field(default_factory=list)
+    updating: bool = False
+    updated_at: datetime = field(default_factory=datetime.now)
+
+
+class ConversationMemory:
+    """Per-session summary + recent-turns memory, stored in memory."""
+
+    def __init__(self, recent_messages: int = 4, max_sessions: int = 5000):
+        self.recent_messages = recent_messages
+        self.max_sessions = max_sessions
+        self._sessions: "OrderedDict[str, SessionMemory]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="memory")
+
+    def has_context(self, session_id: str) -> bool:
+        """Check whether a session has any stored conversation."""
+        memory = self._sessions.get(session_id)
+        return bool(memory and (memory.summary or memory.recent or memory.pending))
+
+    def get_context(
+        self,
+        session_id: str,
+        conversation_history: Optional[List[Dict[str, str]]] = None
+    ) -> Tuple[str, List[Dict[str, str]]]:
+        """
+        Get the summary and recent messages to give the agent.
+
+        Stored memory is authoritative. For a session the server has not seen
+        (e.g. after a restart), the client-supplied history seeds the memory.
+
+        Args:
+            session_id: Session identifier
+            conversation_history: Client-supplied conversation history
+
+        Returns:
+            Tuple of (summary, recent messages)
+        """
+        if not self.has_context(session_id) and conversation_history:
+            self._seed(session_id, conversation_history)
+
+        with self._lock:
+            memory = self._sessions.get(session_id)
+            if memory is None:
+                return "", []
+            # Messages still waiting to be summarised are passed through verbatim
+            recent = (memory.pending + memory.recent)[-2 * self.recent_messages:]
+            return memory.summary, list(recent)
+
+    def record_turn(self, session_id: str, user_message: str, assistant_message: str) -> None:
+        """
+        Record a completed turn and schedule a background summary update.
+
+        Args:
+            session_id: Session identifier
+            user_message: User's message
+            assistant_message: Assistant's response
+        """
+        self._append(session_id, [
+            {"role": "user", "content": user_message},
+            {"role": "ai", "content": assistant_message}
+        ])
+
+    def delete(self, session_id: str) -> None:
+        """Forget a session's memory."""
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def _seed(self, session_id: str, conversation_history: List[Dict[str, str]]) -> None:
+        """Initialise a session's memory from client-supplied history."""
+        messages = [
+            {"role": msg.get("role", "user"), "content": msg.get("content", "")}
+            for msg in conversation_history
+        ]
+        logger.info(f"Seeding conversation memory for session {session_id} with {len(messages)} messages")
+        self._append(session_id, messages)
+
+    def _append(self, session_id: str, messages: List[Dict[str, str]]) -> None:
+        """Append messages, moving overflow to the pending summary queue."""
+        with self._lock:
+            memory = self._sessions.get(session_id)
+            if memory is None:
+                memory = SessionMemory()
+                self._sessions[session_id] = memory
+                while len(self._sessions) > self.max_sessions:
+                    self._sessions.popitem(last=False)
+            self._sessions.move_to_end(session_id)
+
+            memory.recent.extend(messages)
+            overflow = len(memory.recent) - self.recent_messages
+            if overflow > 0:
+                memory.pending.extend(memory.recent[:overflow])
+                memory.recent = memory.recent[overflow:]
+            memory.updated_at = datetime.now()
+
+            schedule = bool(memory.pending) and not memory.updating
+            if schedule:
+                memory.updating = True
+
+        if schedule:
+            self._executor.submit(self._summarise, session_id)
+
+    def _summarise(self, session_id: str) -> None:
+        """
+        Fold pending messages into the summary until none are left.
+
+        Pending messages stay visible to get_context() until the summary that
+        covers them is stored, and stay queued if summarising fails.
+        """
+        while True:
+            with self._lock:
+                memory = self._sessions.get(session_id)
+                if memory is None:
+                    return
+                if not memory.pending:
+                    memory.updating = False
+                    return
+                pending = list(memory.pending)
+                summary = memory.summary
+
+            try:
+                new_summary = self._generate_summary(summary, pending)
+            except Exception as e:
+                logger.error(f"Error summarising session {session_id}: {str(e)}")
+                with self._lock:
+                    memory.updating = False
+                return
+
+            with self._lock:
+                if self._sessions.get(session_id) is not memory:
+                    return
+                memory.summary = new_summary
+                # Messages queued while the summary was generated stay pending
+                memory.pending = memory.pending[len(pending):]
+
+    def _generate_summary(self, summary: str, messages: List[Dict[str, str]]) -> str:
+        """Call the summary model, falling back to plain truncation on error."""
+        try:
+            response = llm_service.generate(
+                messages=[{"role": "user", "content": get_summary_prompt(summary, messages)}],
+                model=settings.summary_model,
+                temperature=0.2,
+                max_tokens=settings.memory_summary_max_tokens
+            )
+            if response and response.strip():
+                return response.strip()[:MAX_SUMMARY_CHARS]
+            logger.warning("Summary model returned an empty response")
+        except Exception as e:
+            logger.error(f"Error updating conversation summary: {str(e)}")
+
+        appended = "\n".join(f"{msg['role']}: {msg['content'][:200]}" for msg in messages)
+        return f"{summary}\n{appended}".strip()[-MAX_SUMMARY_CHARS:]
+
+
+# Global conversation memory instance
+conversation_memory = ConversationMemory(recent_messages=settings.memory_recent_messages)
@@ -4,13 +4,16 @@ Streams agent execution logs to the frontend in real-time.
 """
 
 import json
-import asyncio
 from typing import Optional, AsyncGenerator
 from datetime import datetime
 from agents.react_graph import create_react_agent_graph
 from agents.react_state import create_initial_state
+from core.answer_cache import answer_cache, is_cacheable_turn, completed_normally
+from core.conversation_memory import conversation_memory
 from config.settings import settings
+from services.checkpoint_service import get_checkpoint_service
 from services.supabase_service import supabase_service
+from tools.tool_registry import tool_registry
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -51,13 +54,18 @@ async def stream_chat(
             yield _sse_event("done", {"message": "Stream complete with error"})
             return
 
+        # Bounded memory: running summary of older turns plus the last few messages
+        has_memory = conversation_memory.has_context(session_id)
+        summary, recent_history = conversation_memory.get_context(session_id, conversation_history)
+
         # Prepare initial state (max_iterations defaults to settings.max_agent_iterations)
         try:
             initial_state = create_initial_state(
                 query=query,
                 user_id=session_id,
                 ical_url=ical_url,
-                conversation_history=conversation_history
+                conversation_history=recent_history,
+                conversation_summary=summary
             )
             logger.info(f"Initial state created with max_iterations={settings.max_agent_iterations}")
         except Exception as state_err:
@@ -69,15 +77,49 @@ async def stream_chat(
             yield _sse_event("done", {"message": "Stream complete with error"})
             return
 
+        checkpoint_service = get_checkpoint_service()
+        has_stored_context = has_memory or bool(
+            checkpoint_service and await checkpoint_service.ahas_history(graph, session_id)
+        )
+
+        # Serve general questions without conversation context from the answer cache
+        cacheable = is_cacheable_turn(conversation_history, has_stored_context)
+        if cacheable:
+            cached = answer_cache.get(query, has_ical_url=bool(ical_url))
+            if cached:
+                logger.info(f"Answer cache hit ({cached.fingerprint}) for session {session_id}")
+                yield _sse_event("log", {"content": "Answered from cache", "iteration": 0})
+                yield _sse_event("response", {"content": cached.response})
+                if checkpoint_service:
+                    await checkpoint_service.arecord_turn(graph, session_id, initial_state, cached.response)
+                conversation_memory.record_turn(session_id, query, cached.response)
+                try:
+                    _save_messages(session_id, query, cached.response)
+                except Exception as db_error:
+                    logger.error(f"Error saving to database: {db_error}")
+                yield _sse_event("done", {"message": "Stream complete"})
+                return
+
+        # With checkpointing, resume an interrupted run or continue the stored thread
+        graph_input, config = initial_state, None
+        if checkpoint_service:
+            graph_input, config = await checkpoint_service.aprepare_run(graph, session_id, initial_state)
+            if graph_input is None:
+                yield _sse_event("log", {"content": "Resuming interrupted run from last checkpoint"})
+
         yield _sse_event("log", {"content": f"Processing query: {query}"})
 
+        # Warm free tools (the timetable feed) while the agent reasons about the query
+        tool_registry.start_prefetch(ical_url=ical_url)
+
         # Run the graph with streaming
         current_iteration = 0
         final_response = None
         graph_error = None
+        completion = {}
 
         # Use stream mode to get intermediate states
-        async for event in _run_graph_with_events(graph, initial_state):
+        async for event in _run_graph_with_events(graph, graph_input, config):
             event_type = event.get("type")
             data = event.get("data", {})
 
@@ -132,6 +174,16 @@ async def stream_chat(
                     "iteration": current_iteration
                 })
 
+            elif event_type == "tool_progress":
+                tool_name = data.get("tool_name", "")
+                status = data.get("status")
+                yield _sse_event("log", {
+                    "content": f"Tool {tool_name}: {data.get('items', 0)}/{data.get('limit', '?')} items collected"
+                               + (f" ({status.lower()})" if status else ""),
+                    "iteration": current_iteration,
+                    "progress": data
+                })
+
             elif event_type == "tool_result":
                 tool_name = data.get("tool_name", "")
                 success = data.get("success", False)
@@ -168,6 +220,7 @@ async def stream_chat(
 
             elif event_type == "complete":
                 final_response = data.get("response", "")
+                completion = data
                 iterations = data.get("iterations", 0)
                 tool_calls = data.get("tool_calls", 0)
                 if data.get("error"):
@@ -180,6 +233,8 @@ async def stream_chat(
         # Send final response (always send something, even if empty)
         if final_response:
             yield _sse_event("response", {"content": final_response})
+            if cacheable and not graph_error and completion.get("completed"):
+                answer_cache.put(query, final_response, completion.get("tools_used", []), has_ical_url=bool(ical_url))
         else:
             # Fallback response if agent didn't produce one
             logger.warning(f"No final_response from agent. Graph error: {graph_error}")
@@ -190,6 +245,9 @@ async def stream_chat(
             yield _sse_event("response", {"content": fallback})
             final_response = fallback
 
+        # Fold this turn into the session's memory (summary updates in the background)
+        conversation_memory.record_turn(session_id, query, final_response)
+
         # Save to database
         try:
             _save_messages(session_id, query, final_response)
@@ -204,174 +262,143 @@ async def stream_chat(
         yield _sse_event("done", {"message": "Stream complete with error"})
 
 
-async def _run_graph_with_events(graph, initial_state) -> AsyncGenerator[dict, None]:
+async def _run_graph_with_events(graph, initial_state, config=None) -> AsyncGenerator[dict, None]:
     """
     Run the graph and yield events for each step in real-time.
 
-    Uses LangGraph's stream() to get intermediate states as nodes complete.
+    Uses LangGraph's astream() to get intermediate states as nodes complete,
+    plus progress events tools write while they run.
+    Tool execution runs on its native async path; sync nodes are run in the
+    executor by LangGraph. initial_state may be None to resume a checkpointed
+    run (config required).
     """
-    from queue import Queue, Empty
-    import threading
     import traceback
 
-    loop = asyncio.get_running_loop()
-    event_queue = Queue()
     final_result = {}
-    error_occurred = {"value": None}  # Use dict to allow mutation in nested function
+    error_occurred = None
+    last_iteration = 0
+    last_tool_count = 0
 
-    def run_graph_streaming():
-        """Run graph.stream() in a thread and push events to queue."""
-        nonlocal final_result
-        last_iteration = 0
-        last_tool_count = 0
-
-        try:
-            logger.info("Starting graph.stream() execution")
-            stream_count = 0
-
-            for state in graph.stream(initial_state):
-                stream_count += 1
-                # state is a dict with node name as key and updated state as value
-                for node_name, node_state in state.items():
-                    logger.debug(f"Graph node '{node_name}' returned state keys: {list(node_state.keys())}")
-                    current_iteration = node_state.get("current_iteration", 0)
-
-                    if node_name == "planning":
-                        # Emit planning events
-                        plan = node_state.get("plan", "")
-                        if plan:
-                            event_queue.put({
-                                "type": "planning_start",
-                                "data": {}
-                            })
-                            event_queue.put({
-                                "type": "planning_complete",
-                                "data": {"strategy": plan, "reasoning": node_state.get("plan_reasoning", "")}
-                            })
-
-                    elif node_name == "reasoning":
-                        # Emit reasoning events
-                        if current_iteration > last_iteration:
-                            event_queue.put({
-                                "type": "reasoning_start",
-                                "data": {"iteration": current_iteration}
-                            })
-                            last_iteration = current_iteration
-
-                        thought = node_state.get("current_thought", "")
-                        if thought:
-                            event_queue.put({
-                                "type": "thought",
-                                "data": {"thought": thought}
-                            })
-
-                        action = node_state.get("current_action", "")
-                        action_input = node_state.get("current_action_input", {})
-                        if action:
-                            event_queue.put({
-                                "type": "action",
-                                "data": {"action": action, "action_input": action_input}
-                            })
-
-                        # Check for final_response in reasoning node output
-                        if node_state.get("final_response"):
-                            logger.info(f"Got final_response from reasoning node: {node_state['final_response'][:100]}...")
-
-                    elif node_name == "tool_execution":
-                        # Emit tool events
-                        tool_calls = node_state.get("tool_calls", [])
-                        if len(tool_calls) > last_tool_count:
-                            tc = tool_calls[-1]
-                            tool_name = tc.get("tool_name", "")
-
-                            event_queue.put({
-                                "type": "tool_start",
-                                "data": {"tool_name": tool_name}
-                            })
-
-                            if tc.get("error"):
-                                event_queue.put({
-                                    "type": "tool_result",
-                                    "data": {
-                                        "tool_name": tool_name,
-                                        "success": False,
-                                        "error": tc.get("error")
-                                    }
-                                })
-                            else:
-                                event_queue.put({
-                                    "type": "tool_result",
-                                    "data": {"tool_name": tool_name, "success": True}
-                                })
-
-                            last_tool_count = len(tool_calls)
-
-                    elif node_name == "observation":
-                        # Emit observation
-                        obs = node_state.get("current_observation", "")
-                        if obs:
-                            event_queue.put({
-                                "type": "observation",
-                                "data": {"observation": str(obs)[:300]}
-                            })
-
-                    # Track final state - merge updates
-                    final_result.update(node_state)
-
-            logger.info(f"Graph stream completed after {stream_count} iterations. final_response present: {'final_response' in final_result and bool(final_result.get('final_response'))}")
-
-        except Exception as e:
-            error_msg = f"Error in graph streaming: {str(e)}"
-            logger.error(error_msg)
-            logger.error(traceback.format_exc())
-            error_occurred["value"] = str(e)
-            event_queue.put({"type": "graph_error", "data": {"error": str(e), "traceback": traceback.format_exc()}})
-        finally:
-            event_queue.put(None)  # Signal completion
-
-    # Start graph execution in thread
-    thread = threading.Thread(target=run_graph_streaming)
-    thread.start()
-
-    # Yield events as they arrive
-    while True:
-        try:
-            # Use asyncio-friendly polling
-            event = await loop.run_in_executor(None, lambda: event_queue.get(timeout=0.1))
-
-            if event is None:
-                # Stream complete
-                break
-
-            yield event
-
-        except Empty:
-            # No event yet, continue polling
-            if not thread.is_alive():
-                # Thread finished but queue might still have events
-                try:
-                    while True:
-                        event = event_queue.get_nowait()
-                        if event is None:
-                            break
-                        yield event
-                except Empty:
-                    pass
-                break
+    try:
+        logger.info("Starting graph.astream() execution")
+        stream_count = 0
+
+        # "custom" carries progress written by long-running tools mid-node
+        async for mode, state in graph.astream(initial_state, config=config, stream_mode=["updates", "custom"]):
+            if mode == "custom":
+                yield state
+                continue
+            stream_count += 1
+            # state is a dict with node name as key and updated state as value
+            for node_name, node_state in state.items():
+                if not node_state:
+                    continue
+                logger.debug(f"Graph node '{node_name}' returned state keys: {list(node_state.keys())}")
+                current_iteration = node_state.get("current_iteration", 0)
+
+                if node_name == "planning":
+                    # Emit planning events
+                    plan = node_state.get("plan", "")
+                    if plan:
+                        yield {
+                            "type": "planning_start",
+                            "data": {}
+                        }
+                        yield {
+                            "type": "planning_complete",
+                            "data": {"strategy": plan, "reasoning": node_state.get("plan_reasoning", "")}
+                        }
+
+                elif node_name == "reasoning":
+                    # Emit reasoning events
+                    if current_iteration > last_iteration:
+                        yield {
+                            "type": "reasoning_start",
+                            "data": {"iteration": current_iteration}
+                        }
+                        last_iteration = current_iteration
+
+                    thought = node_state.get("current_thought", "")
+                    if thought:
+                        yield {
+                            "type": "thought",
+                            "data": {"thought": thought}
+                        }
+
+                    action = node_state.get("current_action", "")
+                    action_input = node_state.get("current_action_input", {})
+                    if action:
+                        yield {
+                            "type": "action",
+                            "data": {"action": action, "action_input": action_input}
+                        }
+
+                    # Check for final_response in reasoning node output
+                    if node_state.get("final_response"):
+                        logger.info(f"Got final_response from reasoning node: {node_state['final_response'][:100]}...")
+
+                elif node_name == "tool_execution":
+                    # Emit tool events
+                    tool_calls = node_state.get("tool_calls", [])
+                    if len(tool_calls) > last_tool_count:
+                        tc = tool_calls[-1]
+                        tool_name = tc.get("tool_name", "")
+
+                        yield {
+                            "type": "tool_start",
+                            "data": {"tool_name": tool_name}
+                        }
+
+                        if tc.get("error"):
+                            yield {
+                                "type": "tool_result",
+                                "data": {
+                                    "tool_name": tool_name,
+                                    "success": False,
+                                    "error": tc.get("error")
+                                }
+                            }
+                        else:
+                            yield {
+                                "type": "tool_result",
+                                "data": {"tool_name": tool_name, "success": True}
+                            }
+
+                        last_tool_count = len(tool_calls)
+
+                elif node_name == "observation":
+                    # Emit observation
+                    obs = node_state.get("current_observation", "")
+                    if obs:
+                        yield {
+                            "type": "observation",
+                            "data": {"observation": str(obs)[:300]}
+                        }
+
+                # Track final state - merge updates
+                final_result.update(node_state)
+
+        logger.info(f"Graph stream completed after {stream_count} iterations. final_response present: {'final_response' in final_result and bool(final_result.get('final_response'))}")
 
-    thread.join()
+    except Exception as e:
+        logger.error(f"Error in graph streaming: {str(e)}")
+        logger.error(traceback.format_exc())
+        error_occurred = str(e)
+        yield {"type": "graph_error", "data": {"error": str(e), "traceback": traceback.format_exc()}}
 
     # Emit complete event with error info if any
     complete_data = {
         "response": final_result.get("final_response", ""),
         "iterations": final_result.get("current_iteration", 0),
-        "tool_calls": len(final_result.get("tool_calls", []))
+        "tool_calls": len(final_result.get("tool_calls", [])),
+        "tools_used": [tc.get("tool_name", "") for tc in final_result.get("tool_calls", []) if tc.get("tool_name")],
+        "completed": completed_normally(final_result.get("reasoning_trace", []))
     }
 
-    if error_occurred["value"]:
-        complete_data["error"] = error_occurred["value"]
+    if error_occurred:
+        complete_data["error"] = error_occurred
 
-    logger.info(f"Emitting complete event. Response length: {len(complete_data['response'])}, Error: {error_occurred['value']}")
+    logger.info(f"Emitting complete event. Response length: {len(complete_data['response'] or '')}, Error: {error_occurred}")
 
     yield {
         "type": "complete",
@@ -390,16 +417,12 @@ def _sse_event(event_type: str, data: dict) -> str:
 
 
 def _save_messages(session_id: str, user_message: str, assistant_message: str) -> None:
-    """Save messages to database."""
-    supabase_service.save_chat_message(
-        user_id=session_id,
-        role="user",
-        content=user_message,
-        session_id=session_id
-    )
-    supabase_service.save_chat_message(
+    """Save the turn's messages to the database in one insert."""
+    supabase_service.save_chat_messages(
         user_id=session_id,
-        role="assistant",
-        content=assistant_message,
-        session_id=session_id
+        session_id=session_id,
+        messages=[
+            {"role": "user", "content": user_message},
+            {"role": "assistant", "content": assistant_message}
+        ]
     )
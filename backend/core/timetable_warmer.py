@@ -0,0 +1,111 @@
+"""Background warming of timetable feeds.
+
+When a session sets its iCal URL, the feed is fetched, parsed and indexed in
+the background so the first timetable question is answered from a warm index
+instead of paying the download and parse inside the agent loop. The outcome
+is kept per session as a validation status.
+"""
+
+import asyncio
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Optional, Set
+
+import httpx
+
+from tools.tool_registry import tool_registry
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+@dataclass
+class WarmStatus:
+    """Validation status of a session's timetable feed."""
+    state: str = "pending"  # pending | ready | failed
+    reachable: Optional[bool] = None
+    # Status of the request made while warming; None if the feed cache answered without one
+    http_status: Optional[int] = None
+    source: Optional[str] = None  # downloaded | not_modified | unchanged | cached | stale
+    event_count: Optional[int] = None
+    parse_errors: Optional[int] = None
+    error: Optional[str] = None
+    started_at: float = 0.0
+    completed_at: Optional[float] = None
+
+
+class TimetableWarmer:
+    """Runs one background warm job per session and keeps its status."""
+
+    def __init__(self):
+        self._statuses: Dict[str, WarmStatus] = {}
+        self._tasks: Set[asyncio.Task] = set()
+
+    def start(self, session_id: str, ical_url: str) -> WarmStatus:
+        """
+        Start warming a session's feed on the running event loop.
+
+        Args:
+            session_id: Session identifier
+            ical_url: iCal subscription URL
+
+        Returns:
+            The initial (pending) status
+        """
+        status = WarmStatus(started_at=time.time())
+        self._statuses[session_id] = status
+
+        task = asyncio.get_running_loop().create_task(self._warm(session_id, ical_url, status))
+        # Keep a reference so the task is not garbage collected mid-run
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return status
+
+    def get_status(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Get the warm status for a session, if a job was started."""
+        status = self._statuses.get(session_id)
+        return asdict(status) if status else None
+
+    def forget(self, session_id: str) -> None:
+        """Drop the status of a deleted session."""
+        self._statuses.pop(session_id, None)
+
+    async def _warm(self, session_id: str, ical_url: str, status: WarmStatus) -> None:
+        tool = tool_registry.get_tool("timetable")
+        # Imported here: the timetable tool (and icalendar) load on first use
+        from tools.timetable_tool import TimetableFetchError
+
+        try:
+            load = await tool.aload_feed(ical_url)
+            index = load.index
+            # A cached copy is served when the feed cannot be reached
+            status.reachable = load.source != "stale"
+            status.http_status = load.http_status
+            status.source = load.source
+            status.event_count = len(index)
+            status.parse_errors = index.parse_errors
+            status.state = "ready"
+            logger.info(f"Warmed timetable for session {session_id} ({len(index)} events)")
+
+        except TimetableFetchError as fetch_error:
+            status.reachable = True
+            status.http_status = fetch_error.status_code
+            status.error = str(fetch_error)
+            status.state = "failed"
+        except httpx.HTTPError as req_error:
+            status.reachable = False
+            status.error = f"Network error: {str(req_error) or type(req_error).__name__}"
+            status.state = "failed"
+        except Exception as e:
+            # Unparseable feed (e.g. not iCal at all)
+            status.reachable = True
+            status.error = f"Could not parse timetable: {str(e)}"
+            status.state = "failed"
+
+        status.completed_at = time.time()
+        if status.state == "failed":
+            logger.warning(f"Timetable warm failed for session {session_id}: {status.error}")
+
+
+# Global warmer instance
+timetable_warmer = TimetableWarmer()
@@ -0,0 +1,121 @@
+"""
+KCL Student Bot - Offline KCL index ingestion
+
+Builds or refreshes the local full-text index used by the kcl_index tool.
+Pages are scraped through Firecrawl (or read from a JSONL dump of already
+scraped pages) and indexed passage by passage. Pages whose content hash is
+unchanged are skipped, so re-running the job over the same URL list only
+pays for pages that actually changed.
+
+URL files have one URL per line; blank lines and lines starting with # are
+ignored. JSONL dumps have one {"url": ..., "content": ...} object per line.
+
+Usage:
+    python ingest_kcl_index.py urls.txt --concurrency 4
+    python ingest_kcl_index.py --pages scraped_pages.jsonl
+    python ingest_kcl_index.py urls.txt --index data/kcl_index.sqlite
+"""
+
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Build the local KCL full-text index.")
+    parser.add_argument("urls", nargs="?", help="Text file with one URL per line to scrape and index")
+    parser.add_argument("--pages", help="JSONL file of already scraped pages ({\"url\", \"content\"})")
+    parser.add_argument("--index", default=None, help="Override KCL_INDEX_PATH")
+    parser.add_argument("--concurrency", type=int, default=4, help="Pages scraped in parallel (default: 4)")
+    args = parser.parse_args(argv)
+    if not args.urls and not args.pages:
+        parser.error("give a URL file, --pages, or both")
+    return args
+
+
+def load_urls(path: str) -> List[str]:
+    """
+    Load URLs to scrape.
+
+    Args:
+        path: Text file with one URL per line
+
+    Returns:
+        URLs in file order, without duplicates
+    """
+    urls = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                urls.append(line)
+    return list(dict.fromkeys(urls))
+
+
+def load_pages(path: str) -> Iterator[Tuple[str, str]]:
+    """
+    Stream already scraped pages from a JSONL dump.
+
+    Yields:
+        (url, content) pairs
+    """
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            item = json.loads(line)
+            if not item.get("url") or not item.get("content"):
+                raise ValueError(f"Line {line_no} needs 'url' and 'content'")
+            yield item["url"], item["content"]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """CLI entry point."""
+    args = parse_args(argv)
+
+    from config.settings import settings
+    from tools.kcl_index import KCLIndex, kcl_index
+    from tools.scraper_tool import ScraperTool
+
+    if args.index:
+        kcl_index = KCLIndex(args.index, passage_chars=settings.kcl_index_passage_chars, domains=kcl_index.domains)
+
+    counts: Dict[str, Any] = {"indexed": 0, "unchanged": 0, "skipped": 0, "failed": 0}
+    started = time.perf_counter()
+
+    def ingest(url: str, content: Optional[str]) -> None:
+        if not content:
+            counts["failed"] += 1
+        elif not kcl_index.accepts(url):
+            counts["skipped"] += 1
+        elif kcl_index.index_page(url, content):
+            counts["indexed"] += 1
+        else:
+            counts["unchanged"] += 1
+
+    if args.pages:
+        for url, content in load_pages(args.pages):
+            ingest(url, content)
+
+    if args.urls:
+        urls = [url for url in load_urls(args.urls) if kcl_index.accepts(url)]
+        scraper = ScraperTool()
+        print(f"Scraping {len(urls)} pages with concurrency {args.concurrency}...", file=sys.stderr)
+        with ThreadPoolExecutor(max_workers=max(1, args.concurrency)) as executor:
+            futures = {executor.submit(scraper.execute, url): url for url in urls}
+            for future in as_completed(futures):
+                ingest(futures[future], future.result())
+
+    counts["seconds"] = round(time.perf_counter() - started, 2)
+    counts["index"] = kcl_index.stats()
+    print(json.dumps(counts, indent=2))
+    return 0 if not counts["failed"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
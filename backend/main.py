@@ -7,7 +7,7 @@ Provides REST API for chat, timetable, and session management.
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from api import chat, timetable, session
+from api import chat, timetable, session, admin
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -53,6 +53,12 @@ app.include_router(
     tags=["session"]
 )
 
+app.include_router(
+    admin.router,
+    prefix="/api/admin",
+    tags=["admin"]
+)
+
 
 @app.get("/")
 async def root():
@@ -97,6 +103,20 @@ async def health_check():
     else:
         health_status["checks"]["supabase"] = "configured"
 
+    # Tools whose circuit is open are failing fast until a probe succeeds
+    from tools.tool_registry import tool_registry
+
+    breakers = tool_registry.breaker_stats()
+    health_status["checks"]["tools"] = {name: stats["state"] for name, stats in breakers.items()}
+    open_tools = sorted(name for name, stats in breakers.items() if stats["state"] != "closed")
+    if open_tools:
+        health_status["status"] = "degraded"
+        message = f"Tools unavailable: {', '.join(open_tools)}"
+        if "warning" in health_status:
+            health_status["warning"] += f", {message}"
+        else:
+            health_status["warning"] = message
+
     return health_status
 
 
@@ -132,6 +152,9 @@ async def shutdown_event():
     """Run on application shutdown."""
     logger.info("KCL Student Bot API shutting down...")
 
+    from services.http_client import http_client
+    await http_client.aclose()
+
 
 if __name__ == "__main__":
     import uvicorn
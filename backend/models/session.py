@@ -33,3 +33,19 @@ class TimetableUrlResponse(BaseModel):
     """Response model for timetable URL."""
     ical_url: Optional[str] = Field(None, description="iCal URL if set")
     has_timetable: bool = Field(..., description="Whether timetable is configured")
+
+
+class TimetableStatusResponse(BaseModel):
+    """Response model for timetable validation status."""
+    has_timetable: bool = Field(..., description="Whether timetable is configured")
+    state: Optional[str] = Field(None, description="Warm job state: pending, ready or failed")
+    reachable: Optional[bool] = Field(None, description="Whether the iCal URL could be reached")
+    http_status: Optional[int] = Field(
+        None, description="HTTP status returned by the iCal URL; empty if the feed was served from cache"
+    )
+    source: Optional[str] = Field(
+        None, description="How the feed was loaded: downloaded, not_modified, unchanged, cached or stale"
+    )
+    event_count: Optional[int] = Field(None, description="Number of indexed events")
+    parse_errors: Optional[int] = Field(None, description="Number of events that failed to parse")
+    error: Optional[str] = Field(None, description="Error message if validation failed")
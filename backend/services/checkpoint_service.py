@@ -0,0 +1,384 @@
+"""
+Durable LangGraph checkpointing backed by a local SQLite file.
+
+Checkpoints are keyed by thread id (the chat session_id), so an agent run that
+is interrupted by a worker restart can resume from the last completed node and
+follow-up turns can continue from the stored conversation instead of the
+client re-sending it.
+
+Request handlers use the async methods (aprepare_run, ahas_history, ...), which
+run the SQLite work - including any compaction pass it triggers - in a worker
+thread so a slow disk does not stall other requests' streams.
+"""
+
+import asyncio
+import os
+import sqlite3
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+from config.settings import settings
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Maximum number of raw messages carried over between checkpointed turns
+MAX_STORED_HISTORY = 20
+
+
+class LocalSqliteSaver(SqliteSaver):
+    """
+    SqliteSaver usable from async graph runs (ainvoke/astream).
+
+    The async methods run the sync ones in a worker thread, so a checkpoint
+    write waiting on the saver's lock (or on a compaction pass) never blocks
+    the event loop.
+    """
+
+    async def aget_tuple(self, config):
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config,
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before=None,
+        limit: Optional[int] = None
+    ) -> AsyncIterator[Any]:
+        # list() holds the saver's lock while iterating, so drain it in one go
+        items = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for item in items:
+            yield item
+
+    async def aput(self, config, checkpoint, metadata, new_versions):
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(self, config, writes: Sequence[Tuple[str, Any]], task_id: str, task_path: str = "") -> None:
+        return await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        return await asyncio.to_thread(self.delete_thread, thread_id)
+
+
+class CheckpointService:
+    """Service owning the SQLite checkpointer and its retention policy."""
+
+    def __init__(
+        self,
+        db_path: str,
+        retention_hours: int = 24,
+        max_checkpoints_per_thread: int = 50,
+        compaction_interval_seconds: int = 3600
+    ):
+        """
+        Open (or create) the checkpoint database.
+
+        Args:
+            db_path: Path to the SQLite file
+            retention_hours: Threads idle for longer than this are deleted
+            max_checkpoints_per_thread: Older checkpoints of a live thread are pruned
+            compaction_interval_seconds: Minimum time between compaction passes
+        """
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.db_path = db_path
+        self.retention_hours = retention_hours
+        self.max_checkpoints_per_thread = max_checkpoints_per_thread
+        self.compaction_interval_seconds = compaction_interval_seconds
+
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS thread_activity (
+                thread_id TEXT PRIMARY KEY,
+                last_active REAL NOT NULL
+            )
+            """
+        )
+        self.conn.commit()
+
+        # Maintenance goes through saver.cursor(), which holds the saver's own
+        # lock, so it never interleaves with a checkpoint write on this connection
+        self.saver = LocalSqliteSaver(self.conn)
+        self.saver.setup()
+
+        self._last_compaction = 0.0
+
+        logger.info(f"Checkpoint service initialized at {db_path}")
+        self.maybe_compact()
+
+    def get_config(self, thread_id: str) -> Dict[str, Any]:
+        """
+        Build the LangGraph run config for a thread.
+
+        Args:
+            thread_id: Thread identifier (session_id)
+
+        Returns:
+            Run config dictionary
+        """
+        return {"configurable": {"thread_id": thread_id}}
+
+    def prepare_run(
+        self,
+        graph: Any,
+        thread_id: str,
+        initial_state: Dict[str, Any]
+    ) -> Tuple[Optional[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Decide whether to resume an interrupted run or start a new turn.
+
+        If the thread's latest checkpoint has pending nodes for the same query,
+        the run is resumed (input is None). Otherwise a new turn is started and,
+        unless conversation memory already supplied it, its history and summary
+        are rebuilt from the stored state.
+
+        Args:
+            graph: Compiled graph using this service's checkpointer
+            thread_id: Thread identifier (session_id)
+            initial_state: Fresh state for the new turn
+
+        Returns:
+            Tuple of (graph input or None to resume, run config)
+        """
+        config = self.get_config(thread_id)
+        self.touch(thread_id)
+
+        try:
+            snapshot = graph.get_state(config)
+        except Exception as e:
+            logger.error(f"Error loading checkpoint for thread {thread_id}: {str(e)}")
+            return initial_state, config
+
+        stored = snapshot.values if snapshot else None
+        if not stored:
+            return initial_state, config
+
+        if snapshot.next and stored.get("query") == initial_state.get("query"):
+            logger.info(f"Resuming interrupted run for thread {thread_id} at {list(snapshot.next)}")
+            return None, config
+
+        if not initial_state.get("conversation_history"):
+            initial_state["conversation_history"] = _history_from_state(stored)
+        if not initial_state.get("conversation_summary"):
+            initial_state["conversation_summary"] = stored.get("conversation_summary")
+        logger.info(
+            f"Continuing thread {thread_id} with "
+            f"{len(initial_state['conversation_history'])} stored messages"
+        )
+        return initial_state, config
+
+    async def aprepare_run(
+        self,
+        graph: Any,
+        thread_id: str,
+        initial_state: Dict[str, Any]
+    ) -> Tuple[Optional[Dict[str, Any]], Dict[str, Any]]:
+        """Async counterpart of prepare_run; runs in a worker thread."""
+        return await asyncio.to_thread(self.prepare_run, graph, thread_id, initial_state)
+
+    def has_history(self, graph: Any, thread_id: str) -> bool:
+        """
+        Check whether a thread already has stored conversation state.
+
+        Args:
+            graph: Compiled graph using this service's checkpointer
+            thread_id: Thread identifier (session_id)
+
+        Returns:
+            True if the thread has a stored checkpoint
+        """
+        try:
+            snapshot = graph.get_state(self.get_config(thread_id))
+        except Exception:
+            return False
+        return bool(snapshot and snapshot.values)
+
+    async def ahas_history(self, graph: Any, thread_id: str) -> bool:
+        """Async counterpart of has_history; runs in a worker thread."""
+        return await asyncio.to_thread(self.has_history, graph, thread_id)
+
+    def record_turn(
+        self,
+        graph: Any,
+        thread_id: str,
+        initial_state: Dict[str, Any],
+        response: str
+    ) -> None:
+        """
+        Store a turn that was answered without running the graph.
+
+        Args:
+            graph: Compiled graph using this service's checkpointer
+            thread_id: Thread identifier (session_id)
+            initial_state: State the turn would have started from
+            response: Answer given to the user
+        """
+        values = dict(initial_state)
+        values.update({"final_response": response, "should_stop": True})
+        try:
+            graph.update_state(self.get_config(thread_id), values, as_node="reasoning")
+        except Exception as e:
+            logger.error(f"Error recording turn for thread {thread_id}: {str(e)}")
+
+    async def arecord_turn(
+        self,
+        graph: Any,
+        thread_id: str,
+        initial_state: Dict[str, Any],
+        response: str
+    ) -> None:
+        """Async counterpart of record_turn; runs in a worker thread."""
+        await asyncio.to_thread(self.record_turn, graph, thread_id, initial_state, response)
+
+    def touch(self, thread_id: str) -> None:
+        """
+        Record activity on a thread and compact if due.
+
+        Args:
+            thread_id: Thread identifier (session_id)
+        """
+        with self.saver.cursor() as cur:
+            cur.execute(
+                "INSERT INTO thread_activity (thread_id, last_active) VALUES (?, ?) "
+                "ON CONFLICT(thread_id) DO UPDATE SET last_active = excluded.last_active",
+                (thread_id, time.time())
+            )
+        self.maybe_compact()
+
+    def delete_thread(self, thread_id: str) -> None:
+        """
+        Delete all checkpoints for a thread.
+
+        Args:
+            thread_id: Thread identifier (session_id)
+        """
+        with self.saver.cursor() as cur:
+            _delete_thread_rows(cur, thread_id)
+            cur.execute("DELETE FROM thread_activity WHERE thread_id = ?", (thread_id,))
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        """Async counterpart of delete_thread; runs in a worker thread."""
+        await asyncio.to_thread(self.delete_thread, thread_id)
+
+    def maybe_compact(self) -> None:
+        """Run compaction if the compaction interval has elapsed."""
+        if time.time() - self._last_compaction >= self.compaction_interval_seconds:
+            self.compact()
+
+    def compact(self) -> Dict[str, int]:
+        """
+        Apply the retention policy.
+
+        Deletes threads idle for longer than the retention window, prunes old
+        checkpoints of live threads and truncates the WAL file.
+
+        Returns:
+            Dictionary with counts of deleted threads and checkpoints
+        """
+        self._last_compaction = time.time()
+        cutoff = self._last_compaction - self.retention_hours * 3600
+
+        try:
+            with self.saver.cursor() as cur:
+                stale = [
+                    row[0] for row in cur.execute(
+                        "SELECT thread_id FROM thread_activity WHERE last_active < ?",
+                        (cutoff,)
+                    ).fetchall()
+                ]
+                for thread_id in stale:
+                    _delete_thread_rows(cur, thread_id)
+                cur.execute("DELETE FROM thread_activity WHERE last_active < ?", (cutoff,))
+
+                pruned = self._prune_checkpoints(cur)
+
+            with self.saver.cursor(transaction=False) as cur:
+                cur.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+            if stale or pruned:
+                logger.info(f"Checkpoint compaction removed {len(stale)} threads and {pruned} checkpoints")
+            return {"threads_deleted": len(stale), "checkpoints_deleted": pruned}
+
+        except Exception as e:
+            logger.error(f"Error compacting checkpoints: {str(e)}")
+            return {"threads_deleted": 0, "checkpoints_deleted": 0}
+
+    def _prune_checkpoints(self, cur: sqlite3.Cursor) -> int:
+        """Delete all but the newest checkpoints of each thread (saver lock held)."""
+        old_rows: List[Tuple[str, str, str]] = cur.execute(
+            """
+            SELECT thread_id, checkpoint_ns, checkpoint_id FROM (
+                SELECT thread_id, checkpoint_ns, checkpoint_id,
+                       ROW_NUMBER() OVER (
+                           PARTITION BY thread_id, checkpoint_ns
+                           ORDER BY checkpoint_id DESC
+                       ) AS rank
+                FROM checkpoints
+            ) WHERE rank > ?
+            """,
+            (self.max_checkpoints_per_thread,)
+        ).fetchall()
+
+        if old_rows:
+            cur.executemany(
+                "DELETE FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                old_rows
+            )
+            cur.executemany(
+                "DELETE FROM writes WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                old_rows
+            )
+        return len(old_rows)
+
+
+def _delete_thread_rows(cur: sqlite3.Cursor, thread_id: str) -> None:
+    """Delete a thread's checkpoints and writes (saver lock held)."""
+    cur.execute("DELETE FROM checkpoints WHERE thread_id = ?", (thread_id,))
+    cur.execute("DELETE FROM writes WHERE thread_id = ?", (thread_id,))
+
+
+def _history_from_state(stored: Dict[str, Any]) -> List[Dict[str, str]]:
+    """
+    Rebuild conversation history from a completed checkpointed turn.
+
+    Args:
+        stored: State values from the thread's latest checkpoint
+
+    Returns:
+        Conversation history including the stored turn's question and answer
+    """
+    history = list(stored.get("conversation_history") or [])
+    if stored.get("query"):
+        history.append({"role": "user", "content": stored["query"]})
+    if stored.get("final_response"):
+        history.append({"role": "ai", "content": stored["final_response"]})
+    return history[-MAX_STORED_HISTORY:]
+
+
+# Lazy initialization for singleton
+_checkpoint_service_instance = None
+
+
+def get_checkpoint_service() -> Optional[CheckpointService]:
+    """
+    Get the checkpoint service, or None if checkpointing is disabled.
+    """
+    global _checkpoint_service_instance
+    if not settings.enable_checkpointing:
+        return None
+    if _checkpoint_service_instance is None:
+        _checkpoint_service_instance = CheckpointService(
+            db_path=settings.checkpoint_db_path,
+            retention_hours=settings.checkpoint_retention_hours
+        )
+    return _checkpoint_service_instance
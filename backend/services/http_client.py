@@ -0,0 +1,320 @@
+"""
+Shared pooled HTTP client for outbound tool traffic.
+
+One keep-alive connection pool (HTTP/2 where available) with connect/read
+timeouts and per-host concurrency limits, shared by all tools so repeated
+calls to the same host reuse connections instead of paying DNS, TCP and TLS
+setup every time. Tracks connection reuse per host.
+"""
+
+import asyncio
+import threading
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Dict, Iterator, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from config.settings import settings
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class _LoopState:
+    """Async client and per-host semaphores bound to one event loop."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, client: httpx.AsyncClient):
+        self.loop = loop
+        self.client = client
+        self.semaphores: Dict[str, asyncio.Semaphore] = {}
+
+
+class HttpClient:
+    """Pooled sync + async HTTP client with timeouts and reuse metrics."""
+
+    def __init__(
+        self,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 30.0,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        max_connections_per_host: int = 10,
+        http2: bool = True
+    ):
+        """
+        Configure the client. Underlying pools are created on first use.
+
+        Args:
+            connect_timeout: Seconds allowed to establish a connection
+            read_timeout: Seconds allowed between bytes of a response
+            max_connections: Total connection pool size
+            max_keepalive_connections: Idle connections kept open for reuse
+            max_connections_per_host: Concurrent requests allowed per host
+            http2: Use HTTP/2 when the h2 package is installed
+        """
+        self.timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections
+        )
+        self.max_connections_per_host = max_connections_per_host
+        self.http2 = http2 and HTTP2_AVAILABLE
+
+        self._lock = threading.Lock()
+        self._sync_client: Optional[httpx.Client] = None
+        self._sync_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._loop_states: Dict[int, _LoopState] = {}
+        self._metrics: Dict[str, Dict[str, int]] = {}
+
+    # Sync API
+
+    def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        Send a request on the shared sync pool.
+
+        Args:
+            method: HTTP method
+            url: Request URL
+            **kwargs: Passed to httpx (params, json, headers, timeout, ...)
+
+        Returns:
+            httpx Response
+        """
+        host = self._host(url)
+        semaphore = self._sync_semaphore(host)
+        extensions = {"trace": lambda event, info: self._on_trace(host, event)}
+
+        with semaphore:
+            try:
+                response = self._get_sync_client().request(method, url, extensions=extensions, **kwargs)
+            except httpx.HTTPError:
+                self._count(host, "errors")
+                raise
+        self._count(host, "requests")
+        return response
+
+    def get(self, url: str, **kwargs) -> httpx.Response:
+        """Send a GET request on the shared sync pool."""
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> httpx.Response:
+        """Send a POST request on the shared sync pool."""
+        return self.request("POST", url, **kwargs)
+
+    @contextmanager
+    def stream(self, method: str, url: str, **kwargs) -> Iterator[httpx.Response]:
+        """
+        Send a request on the shared sync pool without reading the body up front.
+
+        Args:
+            method: HTTP method
+            url: Request URL
+            **kwargs: Passed to httpx (params, headers, timeout, ...)
+
+        Yields:
+            httpx Response whose body can be consumed with iter_bytes()
+        """
+        host = self._host(url)
+        semaphore = self._sync_semaphore(host)
+        extensions = {"trace": lambda event, info: self._on_trace(host, event)}
+
+        with semaphore:
+            try:
+                with self._get_sync_client().stream(method, url, extensions=extensions, **kwargs) as response:
+                    self._count(host, "requests")
+                    yield response
+            except httpx.HTTPError:
+                self._count(host, "errors")
+                raise
+
+    # Async API
+
+    async def arequest(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        Send a request on the shared async pool of the running event loop.
+
+        Args:
+            method: HTTP method
+            url: Request URL
+            **kwargs: Passed to httpx (params, json, headers, timeout, ...)
+
+        Returns:
+            httpx Response
+        """
+        host = self._host(url)
+        state = self._get_loop_state()
+        semaphore = state.semaphores.get(host)
+        if semaphore is None:
+            semaphore = state.semaphores.setdefault(host, asyncio.Semaphore(self.max_connections_per_host))
+
+        async def trace(event: str, info: Dict[str, Any]) -> None:
+            self._on_trace(host, event)
+
+        async with semaphore:
+            try:
+                response = await state.client.request(method, url, extensions={"trace": trace}, **kwargs)
+            except httpx.HTTPError:
+                self._count(host, "errors")
+                raise
+        self._count(host, "requests")
+        return response
+
+    async def aget(self, url: str, **kwargs) -> httpx.Response:
+        """Send a GET request on the shared async pool."""
+        return await self.arequest("GET", url, **kwargs)
+
+    async def apost(self, url: str, **kwargs) -> httpx.Response:
+        """Send a POST request on the shared async pool."""
+        return await self.arequest("POST", url, **kwargs)
+
+    @asynccontextmanager
+    async def astream(self, method: str, url: str, **kwargs) -> AsyncIterator[httpx.Response]:
+        """
+        Send a request on the shared async pool without reading the body up front.
+
+        Args:
+            method: HTTP method
+            url: Request URL
+            **kwargs: Passed to httpx (params, headers, timeout, ...)
+
+        Yields:
+            httpx Response whose body can be consumed with aiter_bytes()
+        """
+        host = self._host(url)
+        state = self._get_loop_state()
+        semaphore = state.semaphores.get(host)
+        if semaphore is None:
+            semaphore = state.semaphores.setdefault(host, asyncio.Semaphore(self.max_connections_per_host))
+
+        async def trace(event: str, info: Dict[str, Any]) -> None:
+            self._on_trace(host, event)
+
+        async with semaphore:
+            try:
+                async with state.client.stream(method, url, extensions={"trace": trace}, **kwargs) as response:
+                    self._count(host, "requests")
+                    yield response
+            except httpx.HTTPError:
+                self._count(host, "errors")
+                raise
+
+    # Metrics and lifecycle
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Connection reuse metrics per host.
+
+        Returns:
+            Dictionary with totals and a per-host breakdown
+        """
+        with self._lock:
+            hosts = {host: dict(counts) for host, counts in self._metrics.items()}
+
+        for counts in hosts.values():
+            counts["reused"] = max(0, counts["requests"] - counts["connections_opened"])
+            counts["reuse_rate"] = round(counts["reused"] / counts["requests"], 3) if counts["requests"] else 0.0
+
+        totals = {
+            key: sum(counts[key] for counts in hosts.values())
+            for key in ("requests", "connections_opened", "tls_handshakes", "errors", "reused")
+        }
+        totals["reuse_rate"] = round(totals["reused"] / totals["requests"], 3) if totals["requests"] else 0.0
+
+        return {"http2": self.http2, "totals": totals, "hosts": hosts}
+
+    async def aclose(self) -> None:
+        """Close all pooled connections."""
+        with self._lock:
+            sync_client, self._sync_client = self._sync_client, None
+            states, self._loop_states = self._loop_states, {}
+
+        if sync_client is not None:
+            sync_client.close()
+        current_loop = asyncio.get_running_loop()
+        for state in states.values():
+            # Clients of other loops cannot be awaited here; they close with their loop
+            if state.loop is current_loop:
+                await state.client.aclose()
+
+    # Internals
+
+    def _get_sync_client(self) -> httpx.Client:
+        if self._sync_client is None:
+            with self._lock:
+                if self._sync_client is None:
+                    self._sync_client = httpx.Client(
+                        timeout=self.timeout,
+                        limits=self.limits,
+                        http2=self.http2,
+                        follow_redirects=True
+                    )
+                    logger.info(f"Created shared HTTP client (http2={self.http2})")
+        return self._sync_client
+
+    def _get_loop_state(self) -> _LoopState:
+        # Async connections are bound to the loop that opened them
+        loop = asyncio.get_running_loop()
+        state = self._loop_states.get(id(loop))
+        if state is None or state.loop is not loop or state.client.is_closed:
+            with self._lock:
+                # Forget clients whose loop has gone away
+                self._loop_states = {
+                    key: other for key, other in self._loop_states.items()
+                    if not other.loop.is_closed()
+                }
+                state = _LoopState(loop, httpx.AsyncClient(
+                    timeout=self.timeout,
+                    limits=self.limits,
+                    http2=self.http2,
+                    follow_redirects=True
+                ))
+                self._loop_states[id(loop)] = state
+            logger.info(f"Created shared async HTTP client (http2={self.http2})")
+        return state
+
+    def _sync_semaphore(self, host: str) -> threading.BoundedSemaphore:
+        semaphore = self._sync_semaphores.get(host)
+        if semaphore is None:
+            with self._lock:
+                semaphore = self._sync_semaphores.setdefault(
+                    host, threading.BoundedSemaphore(self.max_connections_per_host)
+                )
+        return semaphore
+
+    def _on_trace(self, host: str, event: str) -> None:
+        if event == "connection.connect_tcp.complete":
+            self._count(host, "connections_opened")
+        elif event == "connection.start_tls.complete":
+            self._count(host, "tls_handshakes")
+
+    def _count(self, host: str, key: str) -> None:
+        with self._lock:
+            counts = self._metrics.setdefault(host, {
+                "requests": 0,
+                "connections_opened": 0,
+                "tls_handshakes": 0,
+                "errors": 0
+            })
+            counts[key] += 1
+
+    @staticmethod
+    def _host(url: str) -> str:
+        return urlsplit(url).netloc.lower()
+
+
+# Singleton instance (pools are created lazily on first request)
+http_client = HttpClient(
+    connect_timeout=settings.http_connect_timeout,
+    read_timeout=settings.http_read_timeout,
+    max_connections=settings.http_max_connections,
+    max_keepalive_connections=settings.http_max_keepalive_connections,
+    max_connections_per_host=settings.http_max_connections_per_host,
+    http2=settings.http_enable_http2
+)
@@ -2,11 +2,14 @@
 OpenRouter LLM Service using OpenAI SDK.
 """
 
-from openai import OpenAI
-from typing import List, Dict, Any, Optional
+import threading
+from typing import List, Dict, Any, Optional, TYPE_CHECKING
 from config.settings import settings
 from utils.logger import setup_logger
 
+if TYPE_CHECKING:
+    from openai import OpenAI
+
 logger = setup_logger(__name__)
 
 
@@ -14,18 +17,30 @@ class LLMService:
     """Service for interacting with LLMs via OpenRouter."""
 
     def __init__(self):
-        """Initialize OpenRouter client."""
-        self.client = OpenAI(
-            base_url=settings.openrouter_base_url,
-            api_key=settings.openrouter_api_key,
-            default_headers={
-                "HTTP-Referer": "http://localhost:3000",
-                "X-Title": "KCL Student Bot"
-            }
-        )
+        """Initialize the service. The OpenRouter client is built on first use."""
+        self._client: Optional["OpenAI"] = None
+        self._client_lock = threading.Lock()
         self.default_model = settings.default_model
         logger.info(f"LLM Service initialized with model: {self.default_model}")
 
+    @property
+    def client(self) -> "OpenAI":
+        """OpenRouter client, importing the OpenAI SDK on first access."""
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    from openai import OpenAI
+
+                    self._client = OpenAI(
+                        base_url=settings.openrouter_base_url,
+                        api_key=settings.openrouter_api_key,
+                        default_headers={
+                            "HTTP-Referer": "http://localhost:3000",
+                            "X-Title": "KCL Student Bot"
+                        }
+                    )
+        return self._client
+
     def generate(
         self,
         messages: List[Dict[str, str]],
@@ -1,28 +1,83 @@
 """
 Supabase database service for chat history and user sessions.
+
+Chat messages carry a `sequence` number that orders them within a session.
+The column is added with:
+
+    alter table chat_messages add column if not exists sequence bigint;
+    create index if not exists chat_messages_session_sequence
+        on chat_messages (session_id, created_at, sequence);
+
+Until it exists, messages are saved and read without it.
 """
 
-from supabase import create_client, Client
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, TYPE_CHECKING
 from datetime import datetime
+import threading
+import time
 import uuid
 from config.settings import settings
 from utils.logger import setup_logger
 
+if TYPE_CHECKING:
+    from supabase import Client
+
 logger = setup_logger(__name__)
 
 
+class _SequenceClock:
+    """
+    Hands out strictly increasing message sequence numbers.
+
+    Numbers are microseconds since the epoch, bumped past the last number
+    issued, so a batch gets consecutive numbers and later turns always sort
+    after earlier ones, even within the same microsecond.
+    """
+
+    def __init__(self):
+        self._last = 0
+        self._lock = threading.Lock()
+
+    def reserve(self, count: int) -> int:
+        """Reserve count consecutive numbers and return the first."""
+        with self._lock:
+            first = max(self._last + 1, time.time_ns() // 1000)
+            self._last = first + count - 1
+            return first
+
+
+def _is_missing_sequence_column(error: Exception) -> bool:
+    """Check whether PostgREST rejected a request because chat_messages has no sequence column."""
+    message = str(error).lower()
+    return "sequence" in message and "column" in message
+
+
 class SupabaseService:
     """Service for interacting with Supabase database."""
 
     def __init__(self):
-        """Initialize Supabase client."""
-        self.client: Client = create_client(
-            settings.supabase_url,
-            settings.supabase_key
-        )
+        """Initialize the service. The Supabase client is built on first use."""
+        self._client: Optional["Client"] = None
+        self._client_lock = threading.Lock()
+        self._sequences = _SequenceClock()
+        # Cleared if the chat_messages table turns out not to have the column yet
+        self._has_sequence_column = True
         logger.info("Supabase service initialized")
 
+    @property
+    def client(self) -> "Client":
+        """Supabase client, importing the SDK on first access."""
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    from supabase import create_client
+
+                    self._client = create_client(
+                        settings.supabase_url,
+                        settings.supabase_key
+                    )
+        return self._client
+
     def save_chat_message(
         self,
         user_id: str,
@@ -42,23 +97,69 @@ class SupabaseService:
         Returns:
             Saved message data or None if error
         """
-        try:
-            data = {
+        saved = self.save_chat_messages(user_id, session_id, [{"role": role, "content": content}])
+        return saved[0] if saved else None
+
+    def save_chat_messages(
+        self,
+        user_id: str,
+        session_id: str,
+        messages: List[Dict[str, str]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Save several chat messages (a turn, or many turns) in one insert.
+
+        All rows share one created_at; their order is kept by consecutive
+        sequence numbers.
+
+        Args:
+            user_id: User identifier
+            session_id: Session identifier
+            messages: Messages in conversation order, each with "role" and "content"
+
+        Returns:
+            Saved message rows, or an empty list if error
+        """
+        if not messages:
+            return []
+
+        created_at = datetime.utcnow().isoformat()
+        first = self._sequences.reserve(len(messages))
+        rows = [
+            {
                 "id": str(uuid.uuid4()),
                 "user_id": user_id,
-                "role": role,
-                "content": content,
+                "role": message["role"],
+                "content": message["content"],
                 "session_id": session_id,
-                "created_at": datetime.utcnow().isoformat()
+                "created_at": created_at,
+                "sequence": first + offset
             }
+            for offset, message in enumerate(messages)
+        ]
 
-            result = self.client.table("chat_messages").insert(data).execute()
-            logger.info(f"Saved chat message for user: {user_id}")
-            return result.data[0] if result.data else None
+        try:
+            try:
+                result = self.client.table("chat_messages").insert(self._with_sequence(rows)).execute()
+            except Exception as e:
+                if not self._has_sequence_column or not _is_missing_sequence_column(e):
+                    raise
+                logger.warning("chat_messages has no sequence column; saving without it")
+                self._has_sequence_column = False
+                result = self.client.table("chat_messages").insert(self._with_sequence(rows)).execute()
+
+            logger.info(f"Saved {len(rows)} chat messages for user: {user_id}")
+            return result.data or []
 
         except Exception as e:
-            logger.error(f"Error saving chat message: {str(e)}")
-            return None
+            logger.error(f"Error saving chat messages: {str(e)}")
+            return []
+
+    def _with_sequence(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Drop the sequence field if the table does not have the column."""
+        if self._has_sequence_column:
+            return rows
+        return [{key: value for key, value in row.items() if key != "sequence"} for row in rows]
 
     def get_chat_history(
         self,
@@ -76,12 +177,13 @@ class SupabaseService:
             List of message dictionaries
         """
         try:
-            result = self.client.table("chat_messages") \
-                .select("*") \
-                .eq("session_id", session_id) \
-                .order("created_at", desc=False) \
-                .limit(limit) \
-                .execute()
+            try:
+                result = self._history_query(session_id, limit).execute()
+            except Exception as e:
+                if not self._has_sequence_column or not _is_missing_sequence_column(e):
+                    raise
+                self._has_sequence_column = False
+                result = self._history_query(session_id, limit).execute()
 
             logger.info(f"Retrieved {len(result.data)} messages for session: {session_id}")
             return result.data
@@ -90,6 +192,17 @@ class SupabaseService:
             logger.error(f"Error retrieving chat history: {str(e)}")
             return []
 
+    def _history_query(self, session_id: str, limit: int) -> Any:
+        """Select a session's messages oldest first; sequence orders messages saved together."""
+        query = self.client.table("chat_messages") \
+            .select("*") \
+            .eq("session_id", session_id) \
+            .order("created_at", desc=False)
+        if self._has_sequence_column:
+            # Rows saved before the column existed have no sequence; created_at orders those
+            query = query.order("sequence", desc=False, nullsfirst=True)
+        return query.limit(limit)
+
     def save_user_session(
         self,
         user_id: str,
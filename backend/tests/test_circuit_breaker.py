@@ -0,0 +1,102 @@
+"""
+Circuit breaker tests against a search tool whose upstream really fails.
+
+Run from the backend directory: python -m unittest discover tests
+"""
+
+import os
+import unittest
+
+# Settings are read at import time; the search is served by a mock transport
+for _var in ("OPENROUTER_API_KEY", "SUPABASE_URL", "SUPABASE_KEY", "SERPAPI_API_KEY", "FIRECRAWL_API_KEY"):
+    os.environ.setdefault(_var, "test")
+
+import httpx
+
+from config.settings import settings
+from services.http_client import HttpClient
+from tools.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, ToolUnavailableError, ToolUpstreamError
+from tools.search_tool import SearchTool
+from tools.tool_cache import ToolResultCache
+from tools.tool_registry import ToolRegistry
+
+
+class SearchCircuitBreakerTest(unittest.TestCase):
+    """The search breaker opens on SerpAPI errors, not on bad arguments."""
+
+    def setUp(self):
+        self.requests = 0
+
+        def unavailable(request: httpx.Request) -> httpx.Response:
+            self.requests += 1
+            return httpx.Response(503, request=request)
+
+        http = HttpClient()
+        http._sync_client = httpx.Client(transport=httpx.MockTransport(unavailable))
+        self.addCleanup(http._sync_client.close)
+
+        cache = ToolResultCache(policies={})
+        self.registry = ToolRegistry(cache=cache)
+        self.registry._tools["search"] = SearchTool(http=http, cache=cache)
+
+    def test_upstream_failures_open_the_breaker(self):
+        for i in range(settings.circuit_breaker_min_calls):
+            with self.assertRaises(ToolUpstreamError):
+                self.registry.execute("search", query=f"library opening hours {i}")
+
+        self.assertEqual(self.registry._breakers["search"].state, OPEN)
+        requests = self.requests
+        with self.assertRaises(ToolUnavailableError):
+            self.registry.execute("search", query="library opening hours")
+        self.assertEqual(self.requests, requests)
+
+    def test_invalid_arguments_do_not_open_the_breaker(self):
+        for _ in range(settings.circuit_breaker_min_calls * 2):
+            with self.assertRaises(ValueError):
+                self.registry.execute("search")
+
+        self.assertEqual(self.registry._breakers["search"].state, CLOSED)
+        self.assertEqual(self.requests, 0)
+
+
+class StaleOutcomeTest(unittest.TestCase):
+    """Calls admitted before the breaker changed state do not move it."""
+
+    def setUp(self):
+        self.breaker = CircuitBreaker("slow", slow_call_seconds=10, window_size=4, min_calls=2, open_seconds=0)
+
+    def _open_with_slow_call_in_flight(self):
+        """Admit a call while closed, then fail enough calls to open and go half-open."""
+        late = self.breaker.acquire()
+        for _ in range(2):
+            self.breaker.record(self.breaker.acquire(), False, 0.1)
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+        probe = self.breaker.acquire()
+        self.assertTrue(probe.probe)
+        return late, probe
+
+    def test_late_success_does_not_close_the_circuit(self):
+        late, probe = self._open_with_slow_call_in_flight()
+
+        self.breaker.record(late, True, 0.1)
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+
+        self.breaker.record(probe, False, 0.1)
+        self.assertEqual(self.breaker.snapshot()["opened"], 2)
+
+    def test_late_failure_does_not_reopen_or_free_the_probe(self):
+        late, probe = self._open_with_slow_call_in_flight()
+
+        self.breaker.record(late, False, 0.1)
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+        self.assertEqual(self.breaker.snapshot()["opened"], 1)
+        # The probe slot is still taken by the real probe
+        with self.assertRaises(ToolUnavailableError):
+            self.breaker.acquire()
+
+        self.breaker.record(probe, True, 0.1)
+        self.assertEqual(self.breaker.state, CLOSED)
+
+
+if __name__ == "__main__":
+    unittest.main()
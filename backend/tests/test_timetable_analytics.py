@@ -0,0 +1,53 @@
+"""
+Timetable analytics tests on a hand-built event index.
+
+Run from the backend directory: python -m unittest discover tests
+"""
+
+import unittest
+from datetime import datetime, timezone
+
+from tools import timetable_analytics
+from tools.timetable_index import EventIndex
+
+
+def _at(day: int, hour: int, minute: int = 0) -> datetime:
+    return datetime(2026, 10, day, hour, minute, tzinfo=timezone.utc)
+
+
+class NextEventTest(unittest.TestCase):
+    """next_event reports timed classes, not all-day markers."""
+
+    def setUp(self):
+        self.index = EventIndex([
+            {"start": _at(19, 0), "end": _at(24, 0), "summary": "Reading week", "all_day": True},
+            {"start": _at(20, 0), "end": _at(21, 0), "summary": "Bank holiday", "all_day": True},
+            {"start": _at(20, 9), "end": _at(20, 11), "summary": "Algorithms lecture"},
+            {"start": _at(20, 14), "end": _at(20, 15), "summary": "Databases lab"}
+        ])
+
+    def test_all_day_event_does_not_hide_next_lecture(self):
+        result = timetable_analytics.next_event(self.index, _at(19, 23))
+
+        self.assertIsNone(result["current"])
+        self.assertEqual(result["next"]["summary"], "Algorithms lecture")
+        self.assertEqual(result["starts_in_minutes"], 10 * 60)
+        self.assertEqual(result["all_day"], ["Reading week"])
+
+    def test_all_day_event_is_not_current(self):
+        result = timetable_analytics.next_event(self.index, _at(20, 10))
+
+        self.assertEqual(result["current"]["summary"], "Algorithms lecture")
+        self.assertEqual(result["next"]["summary"], "Databases lab")
+        self.assertEqual(result["all_day"], ["Reading week", "Bank holiday"])
+
+    def test_only_all_day_events_left(self):
+        result = timetable_analytics.next_event(self.index, _at(20, 16))
+
+        self.assertIsNone(result["current"])
+        self.assertIsNone(result["next"])
+        self.assertIsNone(result["starts_in_minutes"])
+
+
+if __name__ == "__main__":
+    unittest.main()
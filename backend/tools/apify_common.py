@@ -0,0 +1,395 @@
+"""
+Shared helpers for the Apify-based social media tools.
+
+Actors are started rather than called, then polled until they finish, the
+requested number of items is in the dataset, or a deadline passes. Items are
+collected incrementally while polling, so a slow run still returns what it
+has so far, and runs that are no longer needed are aborted instead of being
+left to run (and bill) in the background. Only the item fields a tool parses
+are fetched, one page at a time, and reading stops at the requested limit.
+"""
+
+import asyncio
+import json
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
+
+from services.http_client import HttpClient, http_client
+from tools.progress import report_progress
+from utils.logger import setup_logger
+
+if TYPE_CHECKING:
+    from apify_client import ApifyClient, ApifyClientAsync
+
+logger = setup_logger(__name__)
+
+APIFY_API_URL = "https://api.apify.com/v2"
+
+TERMINAL_STATUSES = {"SUCCEEDED", "FAILED", "ABORTED", "TIMED-OUT", "TIMED_OUT"}
+FAILED_STATUSES = TERMINAL_STATUSES - {"SUCCEEDED"}
+
+
+def run_field(run: Any, key: str) -> Optional[Any]:
+    """
+    Read a field from an Apify run record.
+
+    apify-client < 3 returns runs as dicts with camelCase keys, newer versions
+    return models with snake_case attributes.
+
+    Args:
+        run: Run record returned by the Apify client
+        key: camelCase field name, e.g. "defaultDatasetId"
+
+    Returns:
+        Field value or None
+    """
+    if run is None:
+        return None
+    if isinstance(run, dict):
+        return run.get(key)
+    attr = re.sub(r"(?<!^)(?=[A-Z])", "_", key).lower()
+    return getattr(run, attr, None)
+
+
+class ApifyClients:
+    """
+    Long-lived Apify clients so actor calls reuse the SDK's connection pool.
+
+    The sync client is shared process-wide. Async clients are bound to the
+    event loop that created them, so one is kept per running loop.
+    """
+
+    def __init__(self, api_key: str):
+        """
+        Args:
+            api_key: Apify API token
+        """
+        self.api_key = api_key
+        self._lock = threading.Lock()
+        self._sync_client: Optional["ApifyClient"] = None
+        self._async_clients: Dict[int, Any] = {}
+
+    def sync(self) -> "ApifyClient":
+        """Return the shared sync client (the SDK is imported on first use)."""
+        if self._sync_client is None:
+            with self._lock:
+                if self._sync_client is None:
+                    from apify_client import ApifyClient
+
+                    self._sync_client = ApifyClient(self.api_key)
+        return self._sync_client
+
+    def async_(self) -> "ApifyClientAsync":
+        """Return the async client for the running event loop."""
+        from apify_client import ApifyClientAsync
+
+        loop = asyncio.get_running_loop()
+        entry = self._async_clients.get(id(loop))
+        if entry is None or entry[0] is not loop:
+            with self._lock:
+                # Drop clients whose loop has gone away
+                self._async_clients = {
+                    key: other for key, other in self._async_clients.items()
+                    if not other[0].is_closed()
+                }
+                entry = (loop, ApifyClientAsync(self.api_key))
+                self._async_clients[id(loop)] = entry
+        return entry[1]
+
+
+@dataclass
+class ActorRunResult:
+    """Outcome of a polled actor run."""
+    items: List[Any] = field(default_factory=list)
+    run_id: Optional[str] = None
+    status: Optional[str] = None
+    # True when the deadline passed before the run finished or filled the limit
+    timed_out: bool = False
+    aborted: bool = False
+    # True when the requested number of items was collected
+    filled: bool = False
+    # Dataset read cost: response bytes, pages, JSON decode and item parse time
+    bytes_read: int = 0
+    pages: int = 0
+    decode_ms: float = 0.0
+    parse_ms: float = 0.0
+
+    @property
+    def complete(self) -> bool:
+        """True if the items are a full answer: the limit was filled or the run succeeded."""
+        return self.filled or (self.status == "SUCCEEDED" and not self.timed_out)
+
+
+class DatasetReader:
+    """
+    Read dataset items page by page over the shared HTTP client.
+
+    Uses the REST endpoint directly (rather than the SDK's iterators) so only
+    the requested page and projected fields are transferred, and the bytes
+    and decode time of every page can be measured.
+    """
+
+    def __init__(self, api_key: str, http: Optional[HttpClient] = None):
+        """
+        Args:
+            api_key: Apify API token
+            http: Shared HTTP client (defaults to the global pooled client)
+        """
+        self.api_key = api_key
+        self.http = http or http_client
+
+    def read_page(
+        self,
+        dataset_id: str,
+        offset: int,
+        limit: int,
+        fields: Optional[List[str]],
+        result: ActorRunResult
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch one page of raw items, recording its cost on the run result.
+
+        Args:
+            dataset_id: Dataset to read
+            offset: Index of the first item
+            limit: Maximum items in the page
+            fields: Top-level fields to return (all if None)
+            result: Run result whose counters are updated
+
+        Returns:
+            Raw dataset items
+        """
+        response = self.http.get(**self._request(dataset_id, offset, limit, fields))
+        response.raise_for_status()
+        return self._decode(response.content, result)
+
+    async def aread_page(
+        self,
+        dataset_id: str,
+        offset: int,
+        limit: int,
+        fields: Optional[List[str]],
+        result: ActorRunResult
+    ) -> List[Dict[str, Any]]:
+        """Async counterpart of read_page."""
+        response = await self.http.aget(**self._request(dataset_id, offset, limit, fields))
+        response.raise_for_status()
+        return self._decode(response.content, result)
+
+    def _request(self, dataset_id: str, offset: int, limit: int, fields: Optional[List[str]]) -> Dict[str, Any]:
+        params: Dict[str, Any] = {"offset": offset, "limit": limit, "format": "json"}
+        if fields:
+            params["fields"] = ",".join(fields)
+        return {
+            "url": f"{APIFY_API_URL}/datasets/{dataset_id}/items",
+            "params": params,
+            "headers": {"Authorization": f"Bearer {self.api_key}"}
+        }
+
+    @staticmethod
+    def _decode(content: bytes, result: ActorRunResult) -> List[Dict[str, Any]]:
+        started = time.perf_counter()
+        items = json.loads(content)
+        result.decode_ms += (time.perf_counter() - started) * 1000
+        result.bytes_read += len(content)
+        result.pages += 1
+        return items
+
+
+class ActorRunner:
+    """
+    Start an Apify actor and poll it to completion with a deadline.
+
+    Dataset items are read lazily in pages while the run is in progress, only
+    up to the requested limit and only the projected fields, and passed
+    through a parse function. Progress (items collected, run status) is
+    reported to the active progress sink after every poll.
+    """
+
+    def __init__(
+        self,
+        clients: ApifyClients,
+        tool_name: str,
+        deadline_seconds: float,
+        poll_interval: float,
+        http: Optional[HttpClient] = None,
+        page_size: int = 25
+    ):
+        """
+        Args:
+            clients: Shared Apify clients
+            tool_name: Name used in progress reports and logs
+            deadline_seconds: Wall-clock budget for one run
+            poll_interval: Seconds between status polls
+            http: Shared HTTP client used for dataset reads
+            page_size: Items requested per dataset page
+        """
+        self.clients = clients
+        self.tool_name = tool_name
+        self.deadline_seconds = deadline_seconds
+        self.poll_interval = poll_interval
+        self.page_size = page_size
+        self.reader = DatasetReader(clients.api_key, http)
+        self._lock = threading.Lock()
+        self._totals = {
+            "runs": 0, "items": 0, "bytes_read": 0, "pages": 0,
+            "decode_ms": 0.0, "parse_ms": 0.0, "timed_out": 0, "aborted": 0
+        }
+
+    def run(
+        self,
+        actor_id: str,
+        run_input: Dict[str, Any],
+        limit: int,
+        parse: Callable[[Dict[str, Any]], Any],
+        fields: Optional[List[str]] = None
+    ) -> ActorRunResult:
+        """
+        Run an actor and collect up to limit parsed items.
+
+        Args:
+            actor_id: Apify actor ID
+            run_input: Actor input
+            limit: Stop (and abort the run) once this many items are collected
+            parse: Converts a raw dataset item into the tool's result format
+            fields: Top-level item fields parse reads (all if None)
+
+        Returns:
+            Collected items, how the run ended and what reading them cost
+        """
+        client = self.clients.sync()
+        run = client.actor(actor_id).start(run_input=run_input)
+        result = ActorRunResult(run_id=run_field(run, "id"), status=run_field(run, "status"))
+        dataset_id = run_field(run, "defaultDatasetId")
+        deadline = time.monotonic() + self.deadline_seconds
+
+        try:
+            while True:
+                while len(result.items) < limit:
+                    want = min(self.page_size, limit - len(result.items))
+                    page = self.reader.read_page(dataset_id, len(result.items), want, fields, result)
+                    self._parse_page(page, parse, result)
+                    if len(page) < want:
+                        break
+                if self._done(result, limit, deadline):
+                    break
+                time.sleep(max(0.0, min(self.poll_interval, deadline - time.monotonic())))
+                result.status = run_field(client.run(result.run_id).get(), "status")
+        finally:
+            if result.status not in TERMINAL_STATUSES:
+                self._abort(lambda: client.run(result.run_id).abort(), result)
+            self._record(result)
+
+        return result
+
+    async def arun(
+        self,
+        actor_id: str,
+        run_input: Dict[str, Any],
+        limit: int,
+        parse: Callable[[Dict[str, Any]], Any],
+        fields: Optional[List[str]] = None
+    ) -> ActorRunResult:
+        """
+        Run an actor and collect up to limit parsed items without blocking the event loop.
+
+        Cancelling the awaiting task aborts the actor run.
+
+        Args:
+            actor_id: Apify actor ID
+            run_input: Actor input
+            limit: Stop (and abort the run) once this many items are collected
+            parse: Converts a raw dataset item into the tool's result format
+            fields: Top-level item fields parse reads (all if None)
+
+        Returns:
+            Collected items, how the run ended and what reading them cost
+        """
+        client = self.clients.async_()
+        run = await client.actor(actor_id).start(run_input=run_input)
+        result = ActorRunResult(run_id=run_field(run, "id"), status=run_field(run, "status"))
+        dataset_id = run_field(run, "defaultDatasetId")
+        deadline = time.monotonic() + self.deadline_seconds
+
+        try:
+            while True:
+                while len(result.items) < limit:
+                    want = min(self.page_size, limit - len(result.items))
+                    page = await self.reader.aread_page(dataset_id, len(result.items), want, fields, result)
+                    self._parse_page(page, parse, result)
+                    if len(page) < want:
+                        break
+                if self._done(result, limit, deadline):
+                    break
+                await asyncio.sleep(max(0.0, min(self.poll_interval, deadline - time.monotonic())))
+                result.status = run_field(await client.run(result.run_id).get(), "status")
+        finally:
+            if result.status not in TERMINAL_STATUSES:
+                try:
+                    await client.run(result.run_id).abort()
+                    result.aborted = True
+                    logger.info(f"Aborted {self.tool_name} actor run {result.run_id}")
+                except Exception as e:
+                    logger.warning(f"Could not abort {self.tool_name} actor run {result.run_id}: {str(e)}")
+            self._record(result)
+
+        return result
+
+    def metrics(self) -> Dict[str, Any]:
+        """Cumulative run and dataset read counters."""
+        with self._lock:
+            totals = dict(self._totals)
+        runs = totals["runs"]
+        totals["decode_ms"] = round(totals["decode_ms"], 1)
+        totals["parse_ms"] = round(totals["parse_ms"], 1)
+        totals["avg_bytes_per_run"] = round(totals["bytes_read"] / runs) if runs else 0
+        totals["avg_bytes_per_item"] = round(totals["bytes_read"] / totals["items"]) if totals["items"] else 0
+        return totals
+
+    @staticmethod
+    def _parse_page(page: List[Dict[str, Any]], parse: Callable[[Dict[str, Any]], Any], result: ActorRunResult) -> None:
+        started = time.perf_counter()
+        result.items.extend(parse(item) for item in page)
+        result.parse_ms += (time.perf_counter() - started) * 1000
+
+    def _done(self, result: ActorRunResult, limit: int, deadline: float) -> bool:
+        """Report progress and decide whether polling should stop."""
+        report_progress(self.tool_name, items=len(result.items), limit=limit, status=result.status)
+
+        if len(result.items) >= limit:
+            result.filled = True
+            return True
+        if result.status in TERMINAL_STATUSES:
+            if result.status != "SUCCEEDED":
+                logger.warning(f"{self.tool_name} actor run {result.run_id} ended with status {result.status}")
+            return True
+        if time.monotonic() >= deadline:
+            result.timed_out = True
+            logger.warning(
+                f"{self.tool_name} actor run {result.run_id} passed its {self.deadline_seconds}s deadline; "
+                f"returning {len(result.items)} partial results"
+            )
+            return True
+        return False
+
+    def _abort(self, abort: Callable[[], Any], result: ActorRunResult) -> None:
+        try:
+            abort()
+            result.aborted = True
+            logger.info(f"Aborted {self.tool_name} actor run {result.run_id}")
+        except Exception as e:
+            logger.warning(f"Could not abort {self.tool_name} actor run {result.run_id}: {str(e)}")
+
+    def _record(self, result: ActorRunResult) -> None:
+        with self._lock:
+            self._totals["runs"] += 1
+            self._totals["items"] += len(result.items)
+            self._totals["bytes_read"] += result.bytes_read
+            self._totals["pages"] += result.pages
+            self._totals["decode_ms"] += result.decode_ms
+            self._totals["parse_ms"] += result.parse_ms
+            self._totals["timed_out"] += int(result.timed_out)
+            self._totals["aborted"] += int(result.aborted)
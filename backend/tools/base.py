@@ -2,16 +2,37 @@
 Base tool class for all agent tools.
 """
 
+import asyncio
+import functools
 from abc import ABC, abstractmethod
-from typing import Any, Dict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+from config.settings import settings
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Bounded pool for tools without a native async implementation
+_tool_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_tool_executor() -> ThreadPoolExecutor:
+    """Get the shared thread pool used to adapt sync tools onto the event loop."""
+    global _tool_executor
+    if _tool_executor is None:
+        _tool_executor = ThreadPoolExecutor(
+            max_workers=settings.tool_thread_pool_size,
+            thread_name_prefix="tool"
+        )
+    return _tool_executor
+
 
 class BaseTool(ABC):
     """Abstract base class for all tools."""
 
+    # Tools that cache internally (e.g. per sub-request) bypass the registry's result cache
+    manages_cache = False
+
     def __init__(self, name: str, description: str):
         """
         Initialize base tool.
@@ -36,6 +57,37 @@ class BaseTool(ABC):
         """
         pass
 
+    async def aexecute(self, **kwargs) -> Any:
+        """
+        Execute the tool asynchronously.
+
+        Tools with native async I/O override this. The default runs execute()
+        on the bounded tool thread pool.
+
+        Args:
+            **kwargs: Tool-specific parameters
+
+        Returns:
+            Tool execution result
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            get_tool_executor(),
+            functools.partial(self.execute, **kwargs)
+        )
+
+    async def aprefetch(self, **context: Any) -> None:
+        """
+        Warm the tool before the agent calls it (no-op by default).
+
+        Tools whose spec declares prefetch_with override this; the registry
+        passes those context values.
+
+        Args:
+            **context: Request context such as ical_url
+        """
+        return None
+
     def requires_auth(self) -> bool:
         """
         Check if tool requires authentication.
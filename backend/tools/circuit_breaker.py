@@ -0,0 +1,246 @@
+"""
+Circuit breakers and latency budgets for tool calls.
+
+Each tool has a breaker that watches its recent calls. When too many of them
+fail (exception, budget timeout or a None result) or are too slow, the
+breaker opens and calls fail fast instead of waiting for another slow
+failure. After a cool-down a limited number of probe calls are let through
+(half-open); a good probe closes the breaker, a bad one re-opens it.
+Outcomes of calls admitted before the breaker last changed state (e.g. a
+slow call that returns while a probe is in flight) are counted but do not
+move the breaker.
+
+Tools raise ToolUpstreamError when the API behind them fails, rather than
+returning an empty result, so the failure reaches the breaker. Invalid
+arguments from the model (ValueError, TypeError) are not held against the tool.
+"""
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Tuple
+
+from config.settings import settings
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class ToolUnavailableError(Exception):
+    """Raised instead of calling a tool whose circuit is open."""
+
+
+class ToolUpstreamError(Exception):
+    """The API behind a tool failed (network error, error status, failed run)."""
+
+
+# Raised for bad arguments; say nothing about the tool's health
+CALLER_ERRORS = (ValueError, TypeError)
+
+
+@dataclass(frozen=True)
+class BreakerPermit:
+    """Returned by CircuitBreaker.acquire(); passed back to record() or release()."""
+    # Breaker state generation the call was admitted in
+    generation: int
+    # Whether the call is a half-open probe
+    probe: bool = False
+
+
+@dataclass
+class ToolBudget:
+    """Latency budget for one tool."""
+    timeout_seconds: float
+    # Calls slower than this count towards the slow-call rate
+    slow_call_seconds: float
+
+
+def default_budgets() -> Dict[str, ToolBudget]:
+    """Per-tool budgets from settings. Tools not listed use the default budget."""
+    apify = settings.apify_deadline_seconds
+    return {
+        "kcl_index": ToolBudget(timeout_seconds=5, slow_call_seconds=1),
+        "search": ToolBudget(timeout_seconds=20, slow_call_seconds=8),
+        # Firecrawl renders pages server-side (60 s read timeout)
+        "scraper": ToolBudget(timeout_seconds=75, slow_call_seconds=30),
+        "research": ToolBudget(timeout_seconds=90, slow_call_seconds=45),
+        "timetable": ToolBudget(timeout_seconds=30, slow_call_seconds=10),
+        # Actor runs return partial results at their own deadline
+        "tiktok": ToolBudget(timeout_seconds=apify + 30, slow_call_seconds=apify),
+        "instagram": ToolBudget(timeout_seconds=apify + 30, slow_call_seconds=apify),
+    }
+
+
+def default_budget() -> ToolBudget:
+    """Budget for tools without an entry in default_budgets()."""
+    return ToolBudget(
+        timeout_seconds=settings.tool_timeout_seconds,
+        slow_call_seconds=settings.tool_timeout_seconds / 2
+    )
+
+
+class CircuitBreaker:
+    """Sliding-window circuit breaker for one tool."""
+
+    def __init__(
+        self,
+        name: str,
+        slow_call_seconds: float,
+        window_size: int = 20,
+        min_calls: int = 5,
+        failure_rate_threshold: float = 0.5,
+        slow_call_rate_threshold: float = 0.8,
+        open_seconds: float = 60,
+        half_open_probes: int = 1
+    ):
+        """
+        Initialize the breaker.
+
+        Args:
+            name: Tool name
+            slow_call_seconds: Calls slower than this count as slow
+            window_size: Number of recent calls considered
+            min_calls: Calls needed in the window before the breaker can open
+            failure_rate_threshold: Failure fraction that opens the breaker
+            slow_call_rate_threshold: Slow-call fraction that opens the breaker
+            open_seconds: Time spent open before probing
+            half_open_probes: Concurrent probe calls allowed while half-open
+        """
+        self.name = name
+        self.slow_call_seconds = slow_call_seconds
+        self.min_calls = min_calls
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+        self._window: Deque[Tuple[bool, bool]] = deque(maxlen=window_size)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
+        # Bumped on every state change, so late outcomes can be told apart
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._totals = {"calls": 0, "failures": 0, "slow_calls": 0, "rejected": 0, "opened": 0}
+
+    @property
+    def state(self) -> str:
+        """Current state, moving from open to half-open once the cool-down has passed."""
+        with self._lock:
+            return self._current_state()
+
+    def acquire(self) -> BreakerPermit:
+        """
+        Claim permission for one call.
+
+        Returns:
+            Permit to pass to record() or release() when the call ends
+
+        Raises:
+            ToolUnavailableError: If the circuit is open (or half-open with all probes in flight)
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return BreakerPermit(self._generation)
+            if state == HALF_OPEN and self._probes < self.half_open_probes:
+                self._probes += 1
+                return BreakerPermit(self._generation, probe=True)
+            self._totals["rejected"] += 1
+            retry_in = max(0, round(self._opened_at + self.open_seconds - time.monotonic()))
+
+        raise ToolUnavailableError(
+            f"The {self.name} tool is temporarily unavailable: its recent calls failed or timed out, "
+            f"so it is paused for about {retry_in or self.open_seconds:.0f}s. Do not retry it now; use "
+            f"another tool or answer with the information you already have."
+        )
+
+    def record(self, permit: BreakerPermit, success: bool, duration_seconds: float) -> None:
+        """
+        Record the outcome of a call permitted by acquire().
+
+        Args:
+            permit: Permit returned by acquire() for this call
+            success: False for exceptions, budget timeouts and None results
+            duration_seconds: Wall-clock duration of the call
+        """
+        slow = duration_seconds > self.slow_call_seconds
+        with self._lock:
+            self._totals["calls"] += 1
+            self._totals["failures"] += int(not success)
+            self._totals["slow_calls"] += int(slow)
+
+            if permit.generation != self._generation:
+                # Admitted before the last state change; must not close, re-open or extend it
+                return
+            if permit.probe:
+                self._probes = max(0, self._probes - 1)
+                if success and not slow:
+                    self._close()
+                else:
+                    self._open()
+                return
+
+            self._window.append((success, slow))
+            if len(self._window) < self.min_calls:
+                return
+            failure_rate, slow_rate = self._rates()
+            if failure_rate >= self.failure_rate_threshold or slow_rate >= self.slow_call_rate_threshold:
+                self._open()
+
+    def release(self, permit: BreakerPermit) -> None:
+        """Give back a call permitted by acquire() without recording an outcome (e.g. invalid arguments)."""
+        with self._lock:
+            if permit.probe and permit.generation == self._generation:
+                self._probes = max(0, self._probes - 1)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """State, window rates and lifetime counters."""
+        with self._lock:
+            state = self._current_state()
+            failure_rate, slow_rate = self._rates()
+            snapshot = {
+                "state": state,
+                "window_calls": len(self._window),
+                "failure_rate": round(failure_rate, 3),
+                "slow_call_rate": round(slow_rate, 3),
+                "slow_call_seconds": self.slow_call_seconds,
+                **self._totals
+            }
+            if state != CLOSED:
+                snapshot["retry_in_seconds"] = max(0, round(self._opened_at + self.open_seconds - time.monotonic()))
+            return snapshot
+
+    # Internals (call with self._lock held)
+
+    def _current_state(self) -> str:
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+            self._state = HALF_OPEN
+            self._probes = 0
+            self._generation += 1
+        return self._state
+
+    def _rates(self) -> Tuple[float, float]:
+        if not self._window:
+            return 0.0, 0.0
+        failures = sum(1 for success, _ in self._window if not success)
+        slow = sum(1 for _, is_slow in self._window if is_slow)
+        return failures / len(self._window), slow / len(self._window)
+
+    def _open(self) -> None:
+        self._state = OPEN
+        self._opened_at = time.monotonic()
+        self._probes = 0
+        self._generation += 1
+        self._totals["opened"] += 1
+        logger.warning(f"Circuit for {self.name} opened for {self.open_seconds}s")
+
+    def _close(self) -> None:
+        self._state = CLOSED
+        self._window.clear()
+        self._generation += 1
+        logger.info(f"Circuit for {self.name} closed after a successful probe")
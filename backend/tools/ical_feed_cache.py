@@ -0,0 +1,186 @@
+"""
+Per-URL cache of iCal feeds for the timetable tool.
+
+Feeds cover a whole academic year and rarely change, so each URL keeps its
+parsed VEVENT components (only the properties the timetable uses), HTTP
+validators (ETag / Last-Modified), a content hash and the event index.
+Within the freshness window the index is served directly; after it the feed
+is revalidated with a conditional GET. A 304 skips the download entirely, and
+a body that hashes to the same value keeps the existing index.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from config.settings import settings
+from tools.timetable_index import EventIndex
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+@dataclass
+class CachedFeed:
+    """A fetched and parsed iCal feed."""
+    url: str
+    components: List[Any]
+    content_hash: str
+    size_bytes: int
+    index: EventIndex
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    fetched_at: float = field(default_factory=time.time)
+    validated_at: float = field(default_factory=time.time)
+
+
+def content_hash(content: bytes) -> str:
+    """Hash of the raw feed bytes."""
+    return hashlib.sha256(content).hexdigest()
+
+
+class ICalFeedCache:
+    """In-memory LRU of iCal feeds keyed by URL."""
+
+    def __init__(self, freshness_seconds: int = 900, max_feeds: int = 500):
+        """
+        Initialize the cache.
+
+        Args:
+            freshness_seconds: Serve cached events without revalidating for this long
+            max_feeds: Maximum number of feeds kept (least recently used evicted)
+        """
+        self.freshness_seconds = freshness_seconds
+        self.max_feeds = max_feeds
+        self._feeds: "OrderedDict[str, CachedFeed]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats_counts = {"fresh_hits": 0, "not_modified": 0, "hash_matches": 0, "parses": 0}
+
+    def get(self, url: str) -> Optional[CachedFeed]:
+        """Return the cached feed for a URL, if any."""
+        with self._lock:
+            feed = self._feeds.get(url)
+            if feed is not None:
+                self._feeds.move_to_end(url)
+            return feed
+
+    def is_fresh(self, feed: Optional[CachedFeed], count: bool = True) -> bool:
+        """Check whether a feed can be served without revalidation (count=False: don't record a hit)."""
+        if feed is None or time.time() - feed.validated_at >= self.freshness_seconds:
+            return False
+        if count:
+            self._count("fresh_hits")
+        return True
+
+    def conditional_headers(self, feed: Optional[CachedFeed]) -> Dict[str, str]:
+        """Request headers for revalidating a cached feed."""
+        headers = {}
+        if feed is not None:
+            if feed.etag:
+                headers["If-None-Match"] = feed.etag
+            if feed.last_modified:
+                headers["If-Modified-Since"] = feed.last_modified
+        return headers
+
+    def revalidate(
+        self,
+        feed: Optional[CachedFeed],
+        response: Any,
+        body_hash: Optional[str] = None
+    ) -> Optional[CachedFeed]:
+        """
+        Check whether a response leaves a cached feed unchanged.
+
+        Args:
+            feed: Cached feed (or None)
+            response: HTTP response to the (conditional) request
+            body_hash: Content hash of the response body, if it was read
+
+        Returns:
+            The cached feed, marked as revalidated, if unchanged; otherwise None
+        """
+        if feed is None:
+            return None
+
+        if response.status_code == 304:
+            self._count("not_modified")
+        elif response.status_code == 200 and body_hash == feed.content_hash:
+            self._count("hash_matches")
+        else:
+            return None
+
+        with self._lock:
+            feed.validated_at = time.time()
+            feed.etag = response.headers.get("etag") or feed.etag
+            feed.last_modified = response.headers.get("last-modified") or feed.last_modified
+        return feed
+
+    def store(
+        self,
+        url: str,
+        response: Any,
+        components: List[Any],
+        body_hash: str,
+        size_bytes: int,
+        index: EventIndex
+    ) -> CachedFeed:
+        """
+        Cache a freshly downloaded and parsed feed.
+
+        Args:
+            url: Feed URL
+            response: HTTP 200 response (for its validators)
+            components: Parsed VEVENT components
+            body_hash: Content hash of the response body
+            size_bytes: Size of the response body
+            index: Event index built from the components
+
+        Returns:
+            The cached feed
+        """
+        feed = CachedFeed(
+            url=url,
+            components=components,
+            content_hash=body_hash,
+            size_bytes=size_bytes,
+            index=index,
+            etag=response.headers.get("etag"),
+            last_modified=response.headers.get("last-modified")
+        )
+        with self._lock:
+            self._feeds[url] = feed
+            self._feeds.move_to_end(url)
+            while len(self._feeds) > self.max_feeds:
+                self._feeds.popitem(last=False)
+            self.stats_counts["parses"] += 1
+        return feed
+
+    def invalidate(self, url: str) -> bool:
+        """Drop a cached feed. Returns True if it existed."""
+        with self._lock:
+            return self._feeds.pop(url, None) is not None
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache size and revalidation counters."""
+        with self._lock:
+            return {
+                "feeds": len(self._feeds),
+                "feed_bytes": sum(feed.size_bytes for feed in self._feeds.values()),
+                "events": sum(len(feed.index) for feed in self._feeds.values()),
+                "freshness_seconds": self.freshness_seconds,
+                **self.stats_counts
+            }
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.stats_counts[key] += 1
+
+
+# Global feed cache instance
+ical_feed_cache = ICalFeedCache(
+    freshness_seconds=settings.timetable_feed_freshness_seconds,
+    max_feeds=settings.timetable_feed_cache_max_feeds
+)
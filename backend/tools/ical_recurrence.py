@@ -0,0 +1,191 @@
+"""
+Recurrence expansion for iCal feeds.
+
+Expands RRULE/RDATE/EXDATE once per feed version into concrete occurrences
+inside a materialised window (e.g. the current term), applying RECURRENCE-ID
+overrides and cancellations. All instants are timezone-aware: TZID times keep
+their zone, UTC times stay UTC and floating/date-only times are read in the
+timetable's local timezone, so occurrences stay at the same wall-clock time
+across DST changes.
+"""
+
+from datetime import date, datetime, time, timedelta, timezone, tzinfo
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from dateutil.rrule import rruleset, rrulestr
+from icalendar.prop import vRecur
+
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+def as_aware(value: Any, tz: tzinfo) -> datetime:
+    """
+    Convert an iCal date/datetime to an aware datetime.
+
+    Args:
+        value: date or datetime from an icalendar property
+        tz: Zone used for floating times and all-day dates
+
+    Returns:
+        Timezone-aware datetime
+    """
+    if isinstance(value, datetime):
+        return value if value.tzinfo is not None else value.replace(tzinfo=tz)
+    if isinstance(value, date):
+        return datetime.combine(value, time.min, tzinfo=tz)
+    raise ValueError(f"Unsupported iCal time value: {value!r}")
+
+
+def _property_values(component: Any, name: str) -> List[Any]:
+    """Dates of a (possibly repeated) EXDATE/RDATE property."""
+    prop = component.get(name)
+    if prop is None:
+        return []
+    values = []
+    for item in prop if isinstance(prop, list) else [prop]:
+        for entry in getattr(item, "dts", []):
+            dt = entry.dt
+            # RDATE may be a PERIOD (start, end/duration)
+            values.append(dt[0] if isinstance(dt, tuple) else dt)
+    return values
+
+
+def _rule_text(rule: Any, tz: tzinfo) -> str:
+    """Serialise an RRULE, making UNTIL UTC as dateutil requires for aware starts."""
+    rule = vRecur(rule)
+    until = rule.get("UNTIL")
+    if until:
+        rule["UNTIL"] = [as_aware(until[0], tz).astimezone(timezone.utc)]
+    return "RRULE:" + rule.to_ical().decode("utf-8")
+
+
+def _duration(component: Any, start: datetime, tz: tzinfo) -> timedelta:
+    dtend = component.get("dtend")
+    if dtend is not None:
+        return max(timedelta(0), as_aware(dtend.dt, tz) - start)
+    duration = component.get("duration")
+    if duration is not None:
+        return duration.dt
+    # All-day events without an end last one day
+    return timedelta(days=1) if not isinstance(component.get("dtstart").dt, datetime) else timedelta(0)
+
+
+def _event(component: Any, start: datetime, duration: timedelta) -> Dict[str, Any]:
+    return {
+        "summary": str(component.get("summary", "Untitled")),
+        "start": start,
+        "end": start + duration,
+        "location": str(component.get("location", "")),
+        "description": str(component.get("description", "")),
+        "uid": str(component.get("uid", "")),
+        # DTSTART;VALUE=DATE: a whole-day marker such as "Reading week", not a timed booking
+        "all_day": not isinstance(component.get("dtstart").dt, datetime)
+    }
+
+
+def _is_cancelled(component: Any) -> bool:
+    return str(component.get("status", "")).upper() == "CANCELLED"
+
+
+def expand_component(
+    component: Any,
+    window_start: datetime,
+    window_end: datetime,
+    tz: tzinfo,
+    overridden: Optional[Set[float]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Expand one VEVENT into occurrences within [window_start, window_end].
+
+    Non-recurring events are returned as-is regardless of the window.
+
+    Args:
+        component: VEVENT component
+        window_start: Aware window start
+        window_end: Aware window end
+        tz: Local timezone for floating times
+        overridden: Epochs of occurrences replaced by RECURRENCE-ID overrides
+
+    Returns:
+        Occurrence event dictionaries
+    """
+    start = as_aware(component.get("dtstart").dt, tz)
+    duration = _duration(component, start, tz)
+    rrules = component.get("rrule")
+    rdates = _property_values(component, "rdate")
+
+    if not rrules and not rdates:
+        return [_event(component, start, duration)]
+
+    rules = rruleset()
+    for rule in rrules if isinstance(rrules, list) else ([rrules] if rrules else []):
+        rules.rrule(rrulestr(_rule_text(rule, tz), dtstart=start))
+    rules.rdate(start)
+    for rdate in rdates:
+        rules.rdate(as_aware(rdate, tz))
+    for exdate in _property_values(component, "exdate"):
+        rules.exdate(as_aware(exdate, tz))
+
+    overridden = overridden or set()
+    return [
+        _event(component, occurrence, duration)
+        for occurrence in rules.between(window_start - duration, window_end, inc=True)
+        if occurrence.timestamp() not in overridden
+    ]
+
+
+def expand_events(
+    components: Iterable[Any],
+    window_start: datetime,
+    window_end: datetime,
+    tz: tzinfo
+) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Expand all VEVENTs of a calendar.
+
+    Args:
+        components: VEVENT components
+        window_start: Aware start of the materialised window
+        window_end: Aware end of the materialised window
+        tz: Local timezone for floating times
+
+    Returns:
+        (occurrences, number of events that failed to parse)
+    """
+    masters = []
+    overrides: Dict[str, Set[float]] = {}
+    events: List[Dict[str, Any]] = []
+    errors = 0
+
+    for component in components:
+        if component.get("dtstart") is None:
+            continue
+        recurrence_id = component.get("recurrence-id")
+        if recurrence_id is None:
+            masters.append(component)
+            continue
+        # A modified (or cancelled) instance of a recurring event
+        try:
+            uid = str(component.get("uid", ""))
+            overrides.setdefault(uid, set()).add(as_aware(recurrence_id.dt, tz).timestamp())
+            if not _is_cancelled(component):
+                events.extend(expand_component(component, window_start, window_end, tz))
+        except Exception as event_error:
+            errors += 1
+            logger.warning(f"Error parsing event override: {event_error}")
+
+    for component in masters:
+        if _is_cancelled(component):
+            continue
+        try:
+            events.extend(expand_component(
+                component, window_start, window_end, tz,
+                overrides.get(str(component.get("uid", "")))
+            ))
+        except Exception as event_error:
+            errors += 1
+            logger.warning(f"Error parsing event: {event_error}")
+
+    return events, errors
@@ -0,0 +1,210 @@
+"""
+Streaming VEVENT parser for iCal feeds.
+
+Calendar.from_ical needs the whole feed in memory and builds a full component
+tree before any filtering. This parser is fed the response body chunk by
+chunk, unfolds lines on the fly and emits one minimal icalendar Event per
+VEVENT carrying only the properties the timetable uses. Everything else
+(VTIMEZONE blocks, alarms, attendees, ...) is skipped as it streams past.
+
+Input it cannot handle faithfully, such as a TZID that only a VTIMEZONE block
+defines, raises UnsupportedFeedError so the caller can fall back to the full
+parser.
+"""
+
+import codecs
+import hashlib
+from typing import Any, Dict, List, Optional, Tuple
+
+from icalendar import Event
+from icalendar.prop import vDDDLists, vDDDTypes, vRecur, vText
+from icalendar.timezone import tzp
+
+# Properties kept on emitted events, by value type
+_TEXT_PROPERTIES = {"UID", "SUMMARY", "LOCATION", "DESCRIPTION", "STATUS"}
+_TIME_PROPERTIES = {"DTSTART", "DTEND", "RECURRENCE-ID", "DURATION"}
+_LIST_PROPERTIES = {"EXDATE", "RDATE"}
+_RULE_PROPERTIES = {"RRULE"}
+
+
+class UnsupportedFeedError(Exception):
+    """The feed uses constructs the streaming parser does not handle."""
+
+
+def split_content_line(line: str) -> Tuple[str, Dict[str, str], str]:
+    """
+    Split an unfolded content line into name, parameters and value.
+
+    Args:
+        line: e.g. 'DTSTART;TZID="Europe/London":20261012T100000'
+
+    Returns:
+        (NAME, {PARAM: value}, value)
+    """
+    in_quotes = False
+    for position, char in enumerate(line):
+        if char == '"':
+            in_quotes = not in_quotes
+        elif char == ":" and not in_quotes:
+            head, value = line[:position], line[position + 1:]
+            break
+    else:
+        raise ValueError(f"Malformed content line: {line[:50]}")
+
+    name, *raw_params = head.split(";")
+    params = {}
+    for raw in raw_params:
+        key, _, param_value = raw.partition("=")
+        params[key.upper()] = param_value.strip('"')
+    return name.upper(), params, value
+
+
+class VEventStreamParser:
+    """Push parser: feed() raw chunks, collect the VEVENTs completed so far."""
+
+    def __init__(self, encoding: str = "utf-8"):
+        self._decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+        self._hash = hashlib.sha256()
+        self._buffer = ""
+        self._pending: Optional[str] = None
+        self._depth: List[str] = []
+        self._event: Optional[Event] = None
+        self.bytes_read = 0
+        self.saw_calendar = False
+        self.errors = 0
+
+    @property
+    def content_hash(self) -> str:
+        """SHA-256 of all bytes fed so far (same as hashing the full body)."""
+        return self._hash.hexdigest()
+
+    def feed(self, chunk: bytes) -> List[Event]:
+        """
+        Consume a chunk of the feed.
+
+        Args:
+            chunk: Raw bytes
+
+        Returns:
+            Events completed within this chunk
+        """
+        self.bytes_read += len(chunk)
+        self._hash.update(chunk)
+        self._buffer += self._decoder.decode(chunk)
+
+        *lines, self._buffer = self._buffer.split("\n")
+        return self._consume(lines)
+
+    def close(self) -> List[Event]:
+        """
+        Flush the remaining input.
+
+        Returns:
+            Events completed by the end of the input
+
+        Raises:
+            UnsupportedFeedError: If the input was not a complete VCALENDAR
+        """
+        self._buffer += self._decoder.decode(b"", final=True)
+        events = self._consume([self._buffer, ""])
+        self._buffer = ""
+        if not self.saw_calendar or self._depth:
+            raise UnsupportedFeedError("Feed is not a complete VCALENDAR")
+        return events
+
+    def _consume(self, lines: List[str]) -> List[Event]:
+        events = []
+        for raw in lines:
+            raw = raw.rstrip("\r")
+            if raw[:1] in (" ", "\t"):
+                # Folded continuation of the previous line
+                if self._pending is not None:
+                    self._pending += raw[1:]
+                continue
+            if self._pending:
+                event = self._handle(self._pending)
+                if event is not None:
+                    events.append(event)
+            self._pending = raw
+        return events
+
+    def _handle(self, line: str) -> Optional[Event]:
+        upper = line.upper()
+        if upper.startswith("BEGIN:"):
+            component = upper[6:].strip()
+            if component == "VCALENDAR":
+                self.saw_calendar = True
+            self._depth.append(component)
+            if component == "VEVENT" and len(self._depth) == 2:
+                self._event = Event()
+            return None
+
+        if upper.startswith("END:"):
+            component = upper[4:].strip()
+            if not self._depth or self._depth[-1] != component:
+                raise UnsupportedFeedError(f"Unbalanced END:{component}")
+            self._depth.pop()
+            if component == "VEVENT" and self._event is not None and len(self._depth) == 1:
+                event, self._event = self._event, None
+                return event
+            return None
+
+        # Only properties directly on a VEVENT are kept (not its VALARMs)
+        if self._event is None or self._depth[-1] != "VEVENT":
+            return None
+
+        try:
+            self._add_property(self._event, *split_content_line(line))
+        except UnsupportedFeedError:
+            raise
+        except Exception:
+            self.errors += 1
+        return None
+
+    def _add_property(self, event: Event, name: str, params: Dict[str, str], value: str) -> None:
+        if name in _TEXT_PROPERTIES:
+            event[name] = vText(vText.from_ical(value))
+        elif name in _TIME_PROPERTIES:
+            event[name] = vDDDTypes(vDDDTypes.from_ical(value, timezone=self._timezone(params)))
+        elif name in _LIST_PROPERTIES:
+            if params.get("VALUE", "").upper() == "PERIOD":
+                raise UnsupportedFeedError(f"{name} periods are not supported")
+            values = vDDDLists(vDDDLists.from_ical(value, timezone=self._timezone(params)))
+            existing = event.get(name)
+            if existing is None:
+                event[name] = values
+            else:
+                event[name] = (existing if isinstance(existing, list) else [existing]) + [values]
+        elif name in _RULE_PROPERTIES:
+            rule = vRecur.from_ical(value)
+            existing = event.get(name)
+            event[name] = rule if existing is None else (
+                existing if isinstance(existing, list) else [existing]
+            ) + [rule]
+
+    @staticmethod
+    def _timezone(params: Dict[str, str]) -> Optional[str]:
+        tzid = params.get("TZID")
+        if tzid and tzp.timezone(tzid) is None:
+            # Defined only by a VTIMEZONE block, which needs the full parser
+            raise UnsupportedFeedError(f"Unknown TZID: {tzid}")
+        return tzid
+
+
+def parse_vevents(content: bytes, chunk_size: int = 65536) -> Tuple[List[Event], VEventStreamParser]:
+    """
+    Parse an in-memory feed with the streaming parser.
+
+    Args:
+        content: Raw feed bytes
+        chunk_size: Bytes fed per step
+
+    Returns:
+        (events, parser) - the parser carries the content hash and error count
+    """
+    parser = VEventStreamParser()
+    events = []
+    for start in range(0, len(content), chunk_size):
+        events.extend(parser.feed(content[start:start + chunk_size]))
+    events.extend(parser.close())
+    return events, parser
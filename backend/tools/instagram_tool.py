@@ -3,24 +3,56 @@ Instagram scraping tool using Apify's Instagram Scraper.
 """
 
 from typing import List, Dict, Any, Optional
-from apify_client import ApifyClient
+from tools.apify_common import FAILED_STATUSES, ActorRunResult, ActorRunner, ApifyClients
 from tools.base import BaseTool
+from tools.circuit_breaker import ToolUpstreamError
+from tools.records import InstagramPost
+from tools.social_cache import FetchResult, SocialResultCache, social_cache_key, social_result_cache
 from config.settings import settings
+from services.http_client import HttpClient
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+INSTAGRAM_ACTOR_ID = "apify/instagram-scraper"
+
+# Dataset fields read by _parse_post_data; everything else is left on Apify's side
+INSTAGRAM_FIELDS = [
+    "id", "shortCode", "caption", "ownerUsername", "ownerFullName", "isVerified",
+    "likesCount", "commentsCount", "hashtags", "mentions", "type", "url",
+    "displayUrl", "videoUrl", "timestamp", "locationName"
+]
+
 
 class InstagramTool(BaseTool):
     """Tool for searching and scraping Instagram posts."""
 
-    def __init__(self):
-        """Initialize Instagram tool."""
+    # Lookups are cached per normalised profile/hashtag/query in the social result cache
+    manages_cache = True
+
+    def __init__(self, http: Optional[HttpClient] = None, cache: Optional[SocialResultCache] = None):
+        """
+        Initialize Instagram tool.
+
+        Args:
+            http: Shared HTTP client for dataset reads (defaults to the global pooled client)
+            cache: Social result cache (defaults to the global cache)
+        """
         super().__init__(
             name="instagram",
             description="Search and scrape Instagram posts by profile, hashtag, or search query"
         )
         self.api_key = settings.apify_api_key
+        self.clients = ApifyClients(self.api_key)
+        self.runner = ActorRunner(
+            self.clients,
+            tool_name=self.name,
+            deadline_seconds=settings.apify_deadline_seconds,
+            poll_interval=settings.apify_poll_interval_seconds,
+            http=http,
+            page_size=settings.apify_dataset_page_size
+        )
+        self.cache = cache or social_result_cache
 
     def execute(
         self,
@@ -29,7 +61,7 @@ class InstagramTool(BaseTool):
         search_query: Optional[str] = None,
         search_type: str = "hashtag",
         results_limit: int = 10
-    ) -> List[Dict[str, Any]]:
+    ) -> List[InstagramPost]:
         """
         Execute Instagram scraping.
 
@@ -41,79 +73,140 @@ class InstagramTool(BaseTool):
             results_limit: Number of results to return (max 100)
 
         Returns:
-            List of post data dictionaries
+            List of post records
+
+        Raises:
+            ToolUpstreamError: If the Apify run could not be started or failed without results
         """
         logger.info(f"Instagram search - profiles: {profiles}, hashtags: {hashtags}, query: {search_query}")
 
+        limit = max(1, min(results_limit, 100))
+        run_input = self._build_run_input(profiles, hashtags, search_query, search_type, results_limit)
+        key = social_cache_key(
+            self.name,
+            profiles=profiles,
+            hashtags=hashtags,
+            queries=[search_query] if search_query else None,
+            search_type=search_type if search_query else None
+        )
+        return self.cache.get_or_fetch(key, limit, lambda: self._run(run_input, limit))
+
+    async def aexecute(
+        self,
+        profiles: Optional[List[str]] = None,
+        hashtags: Optional[List[str]] = None,
+        search_query: Optional[str] = None,
+        search_type: str = "hashtag",
+        results_limit: int = 10
+    ) -> List[InstagramPost]:
+        """
+        Execute Instagram scraping without blocking the event loop.
+
+        Args:
+            profiles: List of Instagram usernames to scrape (without @)
+            hashtags: List of hashtags to search (without #)
+            search_query: Search query to find posts, users, or places
+            search_type: Type of search ('hashtag', 'user', 'place')
+            results_limit: Number of results to return (max 100)
+
+        Returns:
+            List of post records
+
+        Raises:
+            ToolUpstreamError: If the Apify run could not be started or failed without results
+        """
+        logger.info(f"Instagram search - profiles: {profiles}, hashtags: {hashtags}, query: {search_query}")
+
+        limit = max(1, min(results_limit, 100))
+        run_input = self._build_run_input(profiles, hashtags, search_query, search_type, results_limit)
+        key = social_cache_key(
+            self.name,
+            profiles=profiles,
+            hashtags=hashtags,
+            queries=[search_query] if search_query else None,
+            search_type=search_type if search_query else None
+        )
+        return await self.cache.aget_or_fetch(key, limit, lambda: self._arun(run_input, limit))
+
+    def _run(self, run_input: Dict[str, Any], limit: int) -> FetchResult:
+        """Start the Apify Instagram Scraper actor and poll it until done or out of time."""
         try:
-            client = ApifyClient(self.api_key)
-
-            # Build direct URLs from profiles and hashtags
-            direct_urls = []
-            if profiles:
-                for profile in profiles:
-                    username = profile.lstrip('@')
-                    direct_urls.append(f"https://www.instagram.com/{username}/")
-            if hashtags:
-                for hashtag in hashtags:
-                    tag = hashtag.lstrip('#')
-                    direct_urls.append(f"https://www.instagram.com/explore/tags/{tag}/")
-
-            run_input = {
-                "resultsLimit": min(results_limit, 100),
-                "resultsType": "posts"
-            }
-
-            if direct_urls:
-                run_input["directUrls"] = direct_urls
-            if search_query:
-                run_input["search"] = search_query
-                run_input["searchType"] = search_type
-                run_input["searchLimit"] = 20
-
-            # Run the Apify Instagram Scraper actor
-            run = client.actor("apify/instagram-scraper").call(run_input=run_input)
-
-            results = []
-            for item in client.dataset(run["defaultDatasetId"]).iterate_items():
-                results.append(self._parse_post_data(item))
-
-            logger.info(f"Instagram scraper returned {len(results)} results")
-            return results
+            run = self.runner.run(
+                INSTAGRAM_ACTOR_ID, run_input, limit=limit, parse=self._parse_post_data, fields=INSTAGRAM_FIELDS
+            )
+        except Exception as e:
+            logger.error(f"Instagram scraping error: {str(e)}")
+            raise ToolUpstreamError(f"Instagram scraping failed: {str(e)}") from e
+        # Partial results (deadline, or a failed or timed-out run) are returned but not cached
+        return self._finish(run), run.complete
 
+    async def _arun(self, run_input: Dict[str, Any], limit: int) -> FetchResult:
+        """Async counterpart of _run."""
+        try:
+            run = await self.runner.arun(
+                INSTAGRAM_ACTOR_ID, run_input, limit=limit, parse=self._parse_post_data, fields=INSTAGRAM_FIELDS
+            )
         except Exception as e:
             logger.error(f"Instagram scraping error: {str(e)}")
-            return []
+            raise ToolUpstreamError(f"Instagram scraping failed: {str(e)}") from e
+        return self._finish(run), run.complete
+
+    def _finish(self, run: ActorRunResult) -> List[InstagramPost]:
+        """Log how the actor run ended and return its items; a failed run with nothing to show raises."""
+        if not run.items and run.status in FAILED_STATUSES:
+            raise ToolUpstreamError(f"Instagram actor run {run.run_id} ended with status {run.status}")
+        if run.timed_out:
+            logger.warning(f"Instagram scraper hit its deadline; returning {len(run.items)} partial results")
+        else:
+            logger.info(f"Instagram scraper returned {len(run.items)} results")
+        logger.info(
+            f"Instagram scraper read {run.bytes_read} bytes in {run.pages} page(s); "
+            f"decode {run.decode_ms:.1f} ms, parse {run.parse_ms:.1f} ms"
+        )
+        return run.items
+
+    def _build_run_input(
+        self,
+        profiles: Optional[List[str]],
+        hashtags: Optional[List[str]],
+        search_query: Optional[str],
+        search_type: str,
+        results_limit: int
+    ) -> Dict[str, Any]:
+        """Build the actor input from the tool arguments."""
+        # Build direct URLs from profiles and hashtags
+        direct_urls = []
+        if profiles:
+            for profile in profiles:
+                username = profile.lstrip('@')
+                direct_urls.append(f"https://www.instagram.com/{username}/")
+        if hashtags:
+            for hashtag in hashtags:
+                tag = hashtag.lstrip('#')
+                direct_urls.append(f"https://www.instagram.com/explore/tags/{tag}/")
+
+        run_input = {
+            "resultsLimit": min(results_limit, 100),
+            "resultsType": "posts"
+        }
+
+        if direct_urls:
+            run_input["directUrls"] = direct_urls
+        if search_query:
+            run_input["search"] = search_query
+            run_input["searchType"] = search_type
+            run_input["searchLimit"] = 20
 
-    def _parse_post_data(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        return run_input
+
+    def _parse_post_data(self, item: Dict[str, Any]) -> InstagramPost:
         """
-        Parse raw post data into standardized format.
+        Parse raw post data into a compact record.
 
         Args:
             item: Raw post data from Apify
 
         Returns:
-            Parsed post data dictionary
+            InstagramPost record
         """
-        return {
-            "id": item.get("id", ""),
-            "shortcode": item.get("shortCode", ""),
-            "caption": item.get("caption", ""),
-            "author": {
-                "username": item.get("ownerUsername", ""),
-                "full_name": item.get("ownerFullName", ""),
-                "verified": item.get("isVerified", False),
-            },
-            "stats": {
-                "likes": item.get("likesCount", 0),
-                "comments": item.get("commentsCount", 0),
-            },
-            "hashtags": item.get("hashtags", []),
-            "mentions": item.get("mentions", []),
-            "media_type": item.get("type", ""),
-            "url": item.get("url", ""),
-            "display_url": item.get("displayUrl", ""),
-            "video_url": item.get("videoUrl", ""),
-            "created_at": item.get("timestamp", ""),
-            "location": item.get("locationName", ""),
-        }
+        return InstagramPost.from_apify(item)
@@ -0,0 +1,245 @@
+"""
+Local full-text index of KCL web pages.
+
+Scraped pages are split into passages and stored in a SQLite FTS5 table, so
+common questions can be answered from ranked local passages in milliseconds
+instead of a SerpAPI search plus a Firecrawl scrape. Pages are keyed by
+normalised URL and re-indexed only when their content hash changes.
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+from config.settings import settings
+from tools.scraper_store import normalise_url
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+_HEADING = re.compile(r"^#{1,6}\s+(.*)$", re.MULTILINE)
+_QUERY_TERM = re.compile(r"\w+", re.UNICODE)
+
+
+def split_passages(content: str, max_chars: int = 1200) -> List[str]:
+    """
+    Split page markdown into passages of roughly max_chars.
+
+    Paragraphs are packed together until the limit; a paragraph longer than
+    the limit becomes a passage on its own, cut at the limit.
+
+    Args:
+        content: Page markdown
+        max_chars: Target passage length
+
+    Returns:
+        Non-empty passages in page order
+    """
+    passages: List[str] = []
+    current = ""
+    for paragraph in re.split(r"\n\s*\n", content):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if current and len(current) + len(paragraph) + 2 > max_chars:
+            passages.append(current)
+            current = ""
+        while len(paragraph) > max_chars:
+            passages.append(paragraph[:max_chars])
+            paragraph = paragraph[max_chars:]
+        current = f"{current}\n\n{paragraph}" if current else paragraph
+    if current:
+        passages.append(current)
+    return passages
+
+
+def page_title(content: str, url: str) -> str:
+    """First markdown heading of a page, or its URL path."""
+    match = _HEADING.search(content)
+    if match:
+        return match.group(1).strip()[:200]
+    return urlsplit(url).path.strip("/") or url
+
+
+def fts_query(query: str) -> Optional[str]:
+    """
+    Turn free text into an FTS5 query matching any of its terms.
+
+    Terms are quoted so punctuation and FTS operators in user text cannot
+    break the query; bm25 ranks passages matching more terms higher.
+    """
+    terms = [term for term in _QUERY_TERM.findall(query.lower()) if len(term) > 1]
+    if not terms:
+        return None
+    return " OR ".join(f'"{term}"' for term in dict.fromkeys(terms))
+
+
+class KCLIndex:
+    """SQLite FTS5 index of page passages with per-page content hashes."""
+
+    def __init__(self, db_path: str, passage_chars: int = 1200, domains: Optional[List[str]] = None):
+        """
+        Open (or create) the index.
+
+        Args:
+            db_path: SQLite file path (":memory:" for a throwaway index)
+            passage_chars: Target passage length
+            domains: Hosts accepted by index_page (subdomains included); None accepts all
+        """
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.db_path = db_path
+        self.passage_chars = passage_chars
+        self.domains = [domain.lower() for domain in domains] if domains else None
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self.queries = 0
+        self.pages_indexed = 0
+        self.pages_unchanged = 0
+        # Re-counted now and then while empty, since the ingestion job may fill the file
+        self._page_count = 0
+        self._counted_at = 0.0
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS pages ("
+                "url TEXT PRIMARY KEY, title TEXT NOT NULL, content_hash TEXT NOT NULL, indexed_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS passages USING fts5("
+                "url UNINDEXED, title, body, tokenize='porter unicode61')"
+            )
+            self._conn.commit()
+            self._count_pages()
+
+    def has_pages(self) -> bool:
+        """Check whether any page is indexed (an empty index is re-checked at most once a minute)."""
+        with self._lock:
+            if self._page_count == 0 and time.time() - self._counted_at >= 60:
+                self._count_pages()
+            return self._page_count > 0
+
+    def accepts(self, url: str) -> bool:
+        """Check whether a URL is on one of the indexed domains."""
+        if self.domains is None:
+            return True
+        host = (urlsplit(url).hostname or "").lower()
+        return any(host == domain or host.endswith(f".{domain}") for domain in self.domains)
+
+    def index_page(self, url: str, content: str) -> bool:
+        """
+        Add or refresh a page.
+
+        Args:
+            url: Page URL (normalised internally)
+            content: Page markdown
+
+        Returns:
+            True if the page was (re)indexed, False if skipped or unchanged
+        """
+        if not content or not self.accepts(url):
+            return False
+
+        key = normalise_url(url)
+        digest = hashlib.sha256(content.encode("utf-8")).hexdigest()
+        title = page_title(content, key)
+        passages = split_passages(content, self.passage_chars)
+
+        with self._lock:
+            row = self._conn.execute("SELECT content_hash FROM pages WHERE url = ?", (key,)).fetchone()
+            if row is not None and row[0] == digest:
+                self.pages_unchanged += 1
+                return False
+            with self._conn:
+                self._conn.execute("DELETE FROM passages WHERE url = ?", (key,))
+                self._conn.executemany(
+                    "INSERT INTO passages (url, title, body) VALUES (?, ?, ?)",
+                    [(key, title, passage) for passage in passages]
+                )
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO pages (url, title, content_hash, indexed_at) VALUES (?, ?, ?, ?)",
+                    (key, title, digest, time.time())
+                )
+            self.pages_indexed += 1
+            if row is None:
+                self._page_count += 1
+
+        logger.info(f"Indexed {len(passages)} passages from {key}")
+        return True
+
+    def search(self, query: str, limit: int = 5) -> List[Dict[str, Any]]:
+        """
+        Rank passages against a free-text query.
+
+        Args:
+            query: Question or keywords
+            limit: Maximum passages returned (at most one per page)
+
+        Returns:
+            List of {"title", "url", "passage", "score"}, best first
+        """
+        match = fts_query(query)
+        if match is None:
+            return []
+
+        with self._lock:
+            self.queries += 1
+            rows = self._conn.execute(
+                "SELECT url, title, body, bm25(passages, 0.0, 2.0, 1.0) AS rank "
+                "FROM passages WHERE passages MATCH ? ORDER BY rank LIMIT ?",
+                (match, limit * 4)
+            ).fetchall()
+
+        results = []
+        seen = set()
+        for url, title, body, rank in rows:
+            if url in seen:
+                continue
+            seen.add(url)
+            results.append({"title": title, "url": url, "passage": body, "score": round(-rank, 3)})
+            if len(results) >= limit:
+                break
+        return results
+
+    def remove_page(self, url: str) -> bool:
+        """Remove a page and its passages. Returns True if it was indexed."""
+        key = normalise_url(url)
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM passages WHERE url = ?", (key,))
+            cursor = self._conn.execute("DELETE FROM pages WHERE url = ?", (key,))
+            self._page_count = max(0, self._page_count - cursor.rowcount)
+            return cursor.rowcount > 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Index size and activity counters."""
+        with self._lock:
+            pages = self._conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+            passages = self._conn.execute("SELECT COUNT(*) FROM passages").fetchone()[0]
+        return {
+            "path": self.db_path,
+            "pages": pages,
+            "passages": passages,
+            "domains": self.domains,
+            "queries": self.queries,
+            "pages_indexed": self.pages_indexed,
+            "pages_unchanged": self.pages_unchanged
+        }
+
+    def _count_pages(self) -> None:
+        # Call with self._lock held
+        self._page_count = self._conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+        self._counted_at = time.time()
+
+
+# Global KCL index instance
+kcl_index = KCLIndex(
+    settings.kcl_index_path,
+    passage_chars=settings.kcl_index_passage_chars,
+    domains=[domain.strip() for domain in settings.kcl_index_domains.split(",") if domain.strip()]
+)
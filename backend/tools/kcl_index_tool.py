@@ -0,0 +1,64 @@
+"""
+Local KCL knowledge index tool.
+"""
+
+from typing import Any, Dict, List, Optional
+from tools.base import BaseTool
+from tools.kcl_index import KCLIndex, kcl_index
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class KCLIndexTool(BaseTool):
+    """Search the local full-text index of KCL pages."""
+
+    def __init__(self, index: Optional[KCLIndex] = None):
+        """
+        Initialize KCL index tool.
+
+        Args:
+            index: Full-text index (defaults to the global index)
+        """
+        super().__init__(
+            name="kcl_index",
+            description="Search locally indexed KCL web pages"
+        )
+        self.index = index or kcl_index
+
+    def execute(self, query: str, num_results: int = 5) -> List[Dict[str, Any]]:
+        """
+        Find the passages that best match a query.
+
+        Args:
+            query: Question or keywords
+            num_results: Number of passages to return
+
+        Returns:
+            List of {"title", "url", "passage", "score"}, best first
+        """
+        try:
+            results = self.index.search(query, limit=num_results)
+            logger.info(f"KCL index returned {len(results)} passages for: {query}")
+            return results
+
+        except Exception as e:
+            logger.error(f"Error querying KCL index: {str(e)}")
+            return []
+
+    async def aexecute(self, query: str, num_results: int = 5) -> List[Dict[str, Any]]:
+        """
+        Query the index inline; a local FTS lookup is cheaper than a thread hop.
+
+        Args:
+            query: Question or keywords
+            num_results: Number of passages to return
+
+        Returns:
+            List of {"title", "url", "passage", "score"}, best first
+        """
+        return self.execute(query=query, num_results=num_results)
+
+    def requires_auth(self) -> bool:
+        """KCL index tool does not require authentication."""
+        return False
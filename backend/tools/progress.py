@@ -0,0 +1,53 @@
+"""
+Progress reporting from long-running tools.
+
+Tools call report_progress() without knowing who is listening. The agent's
+tool execution node installs a sink for the duration of a call (the LangGraph
+stream writer, so updates reach the SSE stream); outside a graph run progress
+is only logged at debug level.
+"""
+
+import contextvars
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+ProgressSink = Callable[[Dict[str, Any]], None]
+
+_sink: contextvars.ContextVar[Optional[ProgressSink]] = contextvars.ContextVar("tool_progress_sink", default=None)
+
+
+@contextmanager
+def progress_sink(sink: Optional[ProgressSink]) -> Iterator[None]:
+    """
+    Route progress reported in this context (and tasks/threads copying it) to a sink.
+
+    Args:
+        sink: Callable receiving one progress dict per update
+    """
+    token = _sink.set(sink)
+    try:
+        yield
+    finally:
+        _sink.reset(token)
+
+
+def report_progress(tool_name: str, **data: Any) -> None:
+    """
+    Report progress of a running tool.
+
+    Args:
+        tool_name: Reporting tool
+        **data: Progress fields, e.g. items=12, status="RUNNING"
+    """
+    sink = _sink.get()
+    if sink is None:
+        logger.debug(f"{tool_name} progress: {data}")
+        return
+    try:
+        sink({"tool_name": tool_name, **data})
+    except Exception as e:
+        logger.warning(f"Progress sink failed: {str(e)}")
@@ -0,0 +1,204 @@
+"""
+Compact result records returned by the social media and timetable tools.
+
+Results used to be nested dictionaries (author/stats/music sub-dicts per
+video). Records are frozen, slotted dataclasses with flat fields: no per-item
+__dict__ or sub-dicts, and repeated strings (usernames, hashtags, rooms) are
+interned. Each record formats itself for agent observations; to_dict() gives
+the nested JSON shape the tools used to return.
+"""
+
+import sys
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, Tuple
+
+
+def _tags(values: Iterable[str]) -> Tuple[str, ...]:
+    return tuple(sys.intern(value) for value in values if value)
+
+
+def _clip(text: str, limit: int) -> str:
+    return text if len(text) <= limit else text[:limit] + "..."
+
+
+@dataclass(frozen=True, slots=True)
+class TikTokVideo:
+    """A TikTok video from the Apify TikTok Scraper."""
+    id: str
+    description: str
+    username: str
+    nickname: str
+    verified: bool
+    views: int
+    likes: int
+    comments: int
+    shares: int
+    hashtags: Tuple[str, ...]
+    music_title: str
+    music_author: str
+    url: str
+    created_at: str
+
+    @classmethod
+    def from_apify(cls, item: Dict[str, Any]) -> "TikTokVideo":
+        """
+        Build a record from a raw dataset item.
+
+        Args:
+            item: Raw video data from Apify
+
+        Returns:
+            Video record
+        """
+        author = item.get("authorMeta") or {}
+        music = item.get("musicMeta") or {}
+        return cls(
+            id=item.get("id", ""),
+            description=item.get("text") or "",
+            username=sys.intern(author.get("name") or ""),
+            nickname=sys.intern(author.get("nickName") or ""),
+            verified=bool(author.get("verified", False)),
+            views=item.get("playCount") or 0,
+            likes=item.get("diggCount") or 0,
+            comments=item.get("commentCount") or 0,
+            shares=item.get("shareCount") or 0,
+            hashtags=_tags(tag.get("name", "") for tag in item.get("hashtags") or []),
+            music_title=sys.intern(music.get("musicName") or ""),
+            music_author=sys.intern(music.get("musicAuthor") or ""),
+            url=item.get("webVideoUrl", ""),
+            created_at=item.get("createTimeISO", "")
+        )
+
+    def to_observation(self) -> str:
+        """Compact lines for an agent observation."""
+        return (
+            f"- {self.description[:100] or 'No description'}\n"
+            f"  By: @{self.username or 'unknown'}\n"
+            f"  Views: {self.views:,} | Likes: {self.likes:,}\n"
+            f"  URL: {self.url or 'N/A'}"
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Nested dictionary in the tool's original JSON shape."""
+        return {
+            "id": self.id,
+            "description": self.description,
+            "author": {"username": self.username, "nickname": self.nickname, "verified": self.verified},
+            "stats": {"views": self.views, "likes": self.likes, "comments": self.comments, "shares": self.shares},
+            "hashtags": list(self.hashtags),
+            "music": {"title": self.music_title, "author": self.music_author},
+            "url": self.url,
+            "created_at": self.created_at,
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class InstagramPost:
+    """An Instagram post from the Apify Instagram Scraper."""
+    id: str
+    shortcode: str
+    caption: str
+    username: str
+    full_name: str
+    verified: bool
+    likes: int
+    comments: int
+    hashtags: Tuple[str, ...]
+    mentions: Tuple[str, ...]
+    media_type: str
+    url: str
+    display_url: str
+    video_url: str
+    created_at: str
+    location: str
+
+    @classmethod
+    def from_apify(cls, item: Dict[str, Any]) -> "InstagramPost":
+        """
+        Build a record from a raw dataset item.
+
+        Args:
+            item: Raw post data from Apify
+
+        Returns:
+            Post record
+        """
+        return cls(
+            id=item.get("id", ""),
+            shortcode=item.get("shortCode", ""),
+            caption=item.get("caption") or "",
+            username=sys.intern(item.get("ownerUsername") or ""),
+            full_name=sys.intern(item.get("ownerFullName") or ""),
+            verified=bool(item.get("isVerified", False)),
+            likes=item.get("likesCount") or 0,
+            comments=item.get("commentsCount") or 0,
+            hashtags=_tags(item.get("hashtags") or []),
+            mentions=_tags(item.get("mentions") or []),
+            media_type=sys.intern(item.get("type") or ""),
+            url=item.get("url", ""),
+            display_url=item.get("displayUrl", ""),
+            video_url=item.get("videoUrl") or "",
+            created_at=item.get("timestamp", ""),
+            location=sys.intern(item.get("locationName") or "")
+        )
+
+    def to_observation(self) -> str:
+        """Compact lines for an agent observation."""
+        lines = [
+            f"- {_clip(self.caption, 100) or 'No caption'}",
+            f"  By: @{self.username or 'unknown'}",
+            f"  Likes: {self.likes:,} | Comments: {self.comments:,}",
+        ]
+        if self.location:
+            lines.append(f"  Location: {self.location}")
+        lines.append(f"  URL: {self.url or 'N/A'}")
+        return "\n".join(lines)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Nested dictionary in the tool's original JSON shape."""
+        return {
+            "id": self.id,
+            "shortcode": self.shortcode,
+            "caption": self.caption,
+            "author": {"username": self.username, "full_name": self.full_name, "verified": self.verified},
+            "stats": {"likes": self.likes, "comments": self.comments},
+            "hashtags": list(self.hashtags),
+            "mentions": list(self.mentions),
+            "media_type": self.media_type,
+            "url": self.url,
+            "display_url": self.display_url,
+            "video_url": self.video_url,
+            "created_at": self.created_at,
+            "location": self.location,
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class TimetableEvent:
+    """One timetable event occurrence, with times in the timetable's zone."""
+    summary: str
+    start: datetime
+    end: datetime
+    location: str = ""
+    description: str = ""
+    all_day: bool = False
+
+    def to_observation(self) -> str:
+        """Compact lines for an agent observation."""
+        when = f"{self.start:%a %d %b} (all day)" if self.all_day else f"{self.start:%a %d %b, %H:%M}"
+        lines = [f"- {self.summary}", f"  When: {when}"]
+        if self.location:
+            lines.append(f"  Where: {self.location}")
+        return "\n".join(lines)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Dictionary with ISO times."""
+        return {
+            "summary": self.summary,
+            "start": self.start.isoformat(),
+            "end": self.end.isoformat(),
+            "location": self.location,
+            "description": self.description,
+            "all_day": self.all_day,
+        }
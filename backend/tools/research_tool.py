@@ -0,0 +1,172 @@
+"""
+Composite search-then-read tool.
+
+Runs a web search, scrapes the top results concurrently (through the scraper
+store) and keeps only the passages of each page most relevant to the query,
+so one agent step replaces a search followed by several scrapes.
+"""
+
+import asyncio
+import math
+import re
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from tools.base import BaseTool
+from tools.kcl_index import split_passages
+from tools.scraper_tool import ScraperTool
+from tools.search_tool import SearchTool
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+_TERM = re.compile(r"\w+", re.UNICODE)
+
+# Words too common to say anything about relevance
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "can", "do", "does", "for", "from", "how",
+    "i", "in", "is", "it", "kcl", "king's", "kings", "my", "of", "on", "or", "the", "to",
+    "what", "when", "where", "which", "who", "why", "with", "you"
+}
+
+
+def _terms(text: str) -> List[str]:
+    return [term for term in _TERM.findall(text.lower()) if term not in STOPWORDS and len(term) > 1]
+
+
+def compress_page(content: str, query: str, max_chars: int = 1500, passage_chars: int = 400) -> str:
+    """
+    Keep the passages of a page that best match a query.
+
+    Passages are scored by query-term frequency weighted by how rare each term
+    is across the page, then the best ones are returned in page order until
+    max_chars is reached.
+
+    Args:
+        content: Page markdown
+        query: Query the page is read for
+        max_chars: Length budget for the excerpt
+        passage_chars: Target passage length
+
+    Returns:
+        Excerpt of the page (its opening if no passage matches)
+    """
+    passages = split_passages(content, passage_chars)
+    if not passages:
+        return ""
+
+    query_terms = set(_terms(query))
+    counts = [Counter(_terms(passage)) for passage in passages]
+    document_frequency = Counter(term for count in counts for term in query_terms if count[term])
+
+    def score(count: Counter) -> float:
+        return sum(
+            (1 + math.log(count[term])) * math.log(1 + len(passages) / document_frequency[term])
+            for term in query_terms if count[term]
+        )
+
+    ranked = sorted(range(len(passages)), key=lambda i: score(counts[i]), reverse=True)
+    chosen: List[int] = []
+    used = 0
+    for i in ranked:
+        if score(counts[i]) <= 0 and chosen:
+            break
+        if used + len(passages[i]) > max_chars and chosen:
+            continue
+        chosen.append(i)
+        used += len(passages[i])
+
+    excerpt = "\n...\n".join(passages[i] for i in sorted(chosen))
+    return excerpt[:max_chars]
+
+
+class ResearchTool(BaseTool):
+    """Search, read the top results and return query-focused excerpts."""
+
+    def __init__(self, search: Optional[SearchTool] = None, scraper: Optional[ScraperTool] = None):
+        """
+        Initialize research tool.
+
+        Args:
+            search: Search tool used to find pages
+            scraper: Scraper tool used to read them (its store avoids re-scraping)
+        """
+        super().__init__(
+            name="research",
+            description="Search the web and read the top results in one step"
+        )
+        self.search = search or SearchTool()
+        self.scraper = scraper or ScraperTool()
+
+    def execute(self, query: str, top_k: int = 3, max_chars_per_page: int = 1500) -> Dict[str, Any]:
+        """
+        Research a question.
+
+        Args:
+            query: Question or search query
+            top_k: Number of top results to read
+            max_chars_per_page: Excerpt length budget per page
+
+        Returns:
+            {"query", "sources": [{"title", "url", "snippet", "excerpt"}], "unread": [urls]}
+        """
+        results = self._top_results(self.search.execute(query=query, num_results=max(top_k, 5)), top_k)
+        if not results:
+            return {"query": query, "sources": [], "unread": []}
+
+        with ThreadPoolExecutor(max_workers=len(results), thread_name_prefix="research") as executor:
+            pages = list(executor.map(lambda item: self.scraper.execute(url=item["link"]), results))
+        return self._combine(query, results, pages, max_chars_per_page)
+
+    async def aexecute(self, query: str, top_k: int = 3, max_chars_per_page: int = 1500) -> Dict[str, Any]:
+        """
+        Research a question without blocking the event loop.
+
+        Args:
+            query: Question or search query
+            top_k: Number of top results to read
+            max_chars_per_page: Excerpt length budget per page
+
+        Returns:
+            {"query", "sources": [{"title", "url", "snippet", "excerpt"}], "unread": [urls]}
+        """
+        results = self._top_results(await self.search.aexecute(query=query, num_results=max(top_k, 5)), top_k)
+        if not results:
+            return {"query": query, "sources": [], "unread": []}
+
+        pages = await asyncio.gather(*(self.scraper.aexecute(url=item["link"]) for item in results))
+        return self._combine(query, results, list(pages), max_chars_per_page)
+
+    @staticmethod
+    def _top_results(results: List[Dict[str, Any]], top_k: int) -> List[Dict[str, Any]]:
+        """First top_k results that have a link."""
+        return [item for item in results if item.get("link")][:max(1, top_k)]
+
+    def _combine(
+        self,
+        query: str,
+        results: List[Dict[str, Any]],
+        pages: List[Optional[str]],
+        max_chars_per_page: int
+    ) -> Dict[str, Any]:
+        """Compress each page against the query; unread pages keep their snippet only."""
+        sources = []
+        unread = []
+        for item, content in zip(results, pages):
+            excerpt = compress_page(content, query, max_chars=max_chars_per_page) if content else ""
+            if not excerpt:
+                unread.append(item["link"])
+            sources.append({
+                "title": item.get("title", ""),
+                "url": item["link"],
+                "snippet": item.get("snippet", ""),
+                "excerpt": excerpt
+            })
+
+        logger.info(f"Research read {len(sources) - len(unread)}/{len(sources)} pages for: {query}")
+        return {"query": query, "sources": sources, "unread": unread}
+
+    def requires_auth(self) -> bool:
+        """Research tool does not require authentication."""
+        return False
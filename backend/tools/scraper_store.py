@@ -0,0 +1,215 @@
+"""
+Cross-session store of scraped page content.
+
+Pages are keyed by normalised URL, so links that differ only in tracking
+parameters, fragments, parameter order or trailing slashes share one entry.
+Bodies are stored once per content hash, so identical pages reached through
+different URLs cost memory once. Entries expire after a freshness window and
+the least recently used URLs are evicted when the stored bytes exceed the cap.
+Listeners (such as the KCL index) are notified of new pages on a background
+thread, so their work never runs inside a scrape.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from config.settings import settings
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Query parameters that never change page content
+TRACKING_PARAMS = {
+    "gclid", "fbclid", "msclkid", "dclid", "yclid", "mc_cid", "mc_eid",
+    "_ga", "_gl", "igshid", "ref", "ref_src", "spm"
+}
+TRACKING_PREFIXES = ("utm_", "hsa_", "pk_")
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalise_url(url: str) -> str:
+    """
+    Normalise a URL for use as a store key.
+
+    Lowercases scheme and host, drops default ports, fragments, tracking
+    parameters and trailing slashes, collapses repeated slashes and sorts the
+    remaining query parameters.
+
+    Args:
+        url: URL as given by the model or a search result
+
+    Returns:
+        Normalised URL
+    """
+    parts = urlsplit(url.strip())
+    scheme = (parts.scheme or "https").lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+
+    path = "/".join(segment for segment in parts.path.split("/") if segment)
+    path = f"/{path}" if path else "/"
+
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    )
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
+
+
+@dataclass
+class _Body:
+    content: str
+    size: int
+    refs: int = 0
+
+
+@dataclass
+class _UrlEntry:
+    content_hash: str
+    fetched_at: float = field(default_factory=time.time)
+    hits: int = 0
+
+
+class ScraperStore:
+    """Size-bounded, deduplicating store of scraped pages."""
+
+    def __init__(self, max_age_seconds: int = 86400, max_bytes: int = 100 * 1024 * 1024):
+        """
+        Initialize the store.
+
+        Args:
+            max_age_seconds: Serve stored content without re-scraping for this long
+            max_bytes: Upper bound on stored content (UTF-8 bytes, counted once per unique body)
+        """
+        self.max_age_seconds = max_age_seconds
+        self.max_bytes = max_bytes
+        self._urls: "OrderedDict[str, _UrlEntry]" = OrderedDict()
+        self._bodies: Dict[str, _Body] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[str, str], None]] = []
+        # One worker: listeners see pages in put() order and never run concurrently
+        self._listener_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="scraper-store")
+        self.hits = 0
+        self.misses = 0
+        self.dedup_hits = 0
+
+    def get(self, url: str, allow_stale: bool = False) -> Optional[str]:
+        """
+        Look up stored content for a URL.
+
+        Args:
+            url: Page URL (normalised internally)
+            allow_stale: Return content past its freshness window
+
+        Returns:
+            Page content or None
+        """
+        key = normalise_url(url)
+        with self._lock:
+            entry = self._urls.get(key)
+            if entry is None or (not allow_stale and time.time() - entry.fetched_at > self.max_age_seconds):
+                if not allow_stale:
+                    self.misses += 1
+                return None
+            self._urls.move_to_end(key)
+            entry.hits += 1
+            if not allow_stale:
+                self.hits += 1
+            return self._bodies[entry.content_hash].content
+
+    def put(self, url: str, content: str) -> None:
+        """
+        Store freshly scraped content for a URL.
+
+        Args:
+            url: Page URL (normalised internally)
+            content: Scraped content
+        """
+        key = normalise_url(url)
+        encoded = content.encode("utf-8")
+        digest = hashlib.sha256(encoded).hexdigest()
+
+        with self._lock:
+            if key in self._urls:
+                self._drop_url(key)
+
+            body = self._bodies.get(digest)
+            if body is None:
+                body = _Body(content=content, size=len(encoded))
+                self._bodies[digest] = body
+                self._bytes += body.size
+            else:
+                self.dedup_hits += 1
+            body.refs += 1
+            self._urls[key] = _UrlEntry(content_hash=digest)
+
+            while self._bytes > self.max_bytes and len(self._urls) > 1:
+                self._drop_url(next(iter(self._urls)))
+            listeners = list(self._listeners)
+
+        if listeners:
+            self._listener_executor.submit(self._notify, listeners, key, content)
+
+    def add_listener(self, listener: Callable[[str, str], None]) -> None:
+        """Register a callback invoked in the background with (normalised_url, content) after each put."""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def purge(self) -> int:
+        """Remove all entries. Returns the number of URLs removed."""
+        with self._lock:
+            count = len(self._urls)
+            self._urls.clear()
+            self._bodies.clear()
+            self._bytes = 0
+        logger.info(f"Purged {count} stored pages")
+        return count
+
+    def stats(self) -> Dict[str, Any]:
+        """Store size, dedup and hit/miss counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "urls": len(self._urls),
+                "unique_pages": len(self._bodies),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "max_age_seconds": self.max_age_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "dedup_hits": self.dedup_hits,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0
+            }
+
+    @staticmethod
+    def _notify(listeners: List[Callable[[str, str], None]], key: str, content: str) -> None:
+        for listener in listeners:
+            try:
+                listener(key, content)
+            except Exception as e:
+                logger.warning(f"Scraper store listener failed: {str(e)}")
+
+    def _drop_url(self, key: str) -> None:
+        # Call with self._lock held
+        entry = self._urls.pop(key)
+        body = self._bodies[entry.content_hash]
+        body.refs -= 1
+        if body.refs <= 0:
+            del self._bodies[entry.content_hash]
+            self._bytes -= body.size
+
+
+# Global scraper store instance
+scraper_store = ScraperStore(
+    max_age_seconds=settings.scraper_store_max_age_seconds,
+    max_bytes=settings.scraper_store_max_mb * 1024 * 1024
+)
@@ -1,27 +1,43 @@
 """
 Web scraping tool using Firecrawl.
+
+Pages are served from the shared scraper store when a fresh copy exists, so
+the same KCL page is only scraped once across sessions.
 """
 
-from typing import Optional
+from typing import Optional, Dict, Any
 from tools.base import BaseTool
 from config.settings import settings
+from services.http_client import HttpClient, http_client
+from tools.scraper_store import ScraperStore, scraper_store
 from utils.logger import setup_logger
-import requests
+import httpx
 
 logger = setup_logger(__name__)
 
+# Firecrawl renders pages server-side, so allow a longer read timeout
+SCRAPE_TIMEOUT = httpx.Timeout(60.0, connect=settings.http_connect_timeout)
+
 
 class ScraperTool(BaseTool):
     """Scrape web pages using Firecrawl."""
 
-    def __init__(self):
-        """Initialize scraper tool."""
+    def __init__(self, http: Optional[HttpClient] = None, store: Optional[ScraperStore] = None):
+        """
+        Initialize scraper tool.
+
+        Args:
+            http: Shared HTTP client (defaults to the global pooled client)
+            store: Scraped content store (defaults to the global store)
+        """
         super().__init__(
             name="scraper",
             description="Scrape and extract content from web pages"
         )
         self.api_key = settings.firecrawl_api_key
         self.base_url = "https://api.firecrawl.dev/v0"
+        self.http = http or http_client
+        self.store = store or scraper_store
 
     def execute(self, url: str) -> Optional[str]:
         """
@@ -33,36 +49,96 @@ class ScraperTool(BaseTool):
         Returns:
             Scraped content in markdown format or None if error
         """
+        stored = self.store.get(url)
+        if stored is not None:
+            logger.info(f"Serving stored page: {url}")
+            return stored
+
         try:
             logger.info(f"Scraping URL: {url}")
 
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
+            response = self.http.post(
+                f"{self.base_url}/scrape",
+                headers=self._headers(),
+                json=self._payload(url),
+                timeout=SCRAPE_TIMEOUT
+            )
+
+            return self._store_result(url, self._extract_content(response))
 
-            payload = {
-                "url": url,
-                "formats": ["markdown"]
-            }
+        except Exception as e:
+            logger.error(f"Error scraping URL: {str(e)}")
+            return self._stale(url)
 
-            response = requests.post(
+    async def aexecute(self, url: str) -> Optional[str]:
+        """
+        Scrape content from a URL without blocking the event loop.
+
+        Args:
+            url: URL to scrape
+
+        Returns:
+            Scraped content in markdown format or None if error
+        """
+        stored = self.store.get(url)
+        if stored is not None:
+            logger.info(f"Serving stored page: {url}")
+            return stored
+
+        try:
+            logger.info(f"Scraping URL: {url}")
+
+            response = await self.http.apost(
                 f"{self.base_url}/scrape",
-                headers=headers,
-                json=payload
+                headers=self._headers(),
+                json=self._payload(url),
+                timeout=SCRAPE_TIMEOUT
             )
 
-            if response.status_code == 200:
-                data = response.json()
-                content = data.get("data", {}).get("markdown", "")
-                logger.info(f"Successfully scraped {len(content)} characters")
-                return content
-            else:
-                logger.error(f"Scraping failed with status: {response.status_code}")
-                return None
+            return self._store_result(url, self._extract_content(response))
 
         except Exception as e:
             logger.error(f"Error scraping URL: {str(e)}")
+            return self._stale(url)
+
+    def _store_result(self, url: str, content: Optional[str]) -> Optional[str]:
+        """Keep a successful scrape in the store, or fall back to a stale copy."""
+        if content is None:
+            return self._stale(url)
+        if content:
+            self.store.put(url, content)
+        return content
+
+    def _stale(self, url: str) -> Optional[str]:
+        """An expired stored copy, better than nothing when Firecrawl fails."""
+        content = self.store.get(url, allow_stale=True)
+        if content is not None:
+            logger.warning(f"Serving stale stored page after scrape failure: {url}")
+        return content
+
+    def _headers(self) -> Dict[str, str]:
+        """Firecrawl request headers."""
+        return {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+
+    def _payload(self, url: str) -> Dict[str, Any]:
+        """Firecrawl scrape request body."""
+        return {
+            "url": url,
+            "formats": ["markdown"]
+        }
+
+    def _extract_content(self, response: Any) -> Optional[str]:
+        """Extract markdown from a Firecrawl response."""
+        if response.status_code == 200:
+            data = response.json()
+            content = data.get("data", {}).get("markdown", "")
+            logger.info(f"Successfully scraped {len(content)} characters")
+            return content
+        else:
+            logger.error(f"Scraping failed with status: {response.status_code}")
             return None
 
     def requires_auth(self) -> bool:
@@ -1,67 +1,235 @@
 """
 Web search tool using SerpAPI.
+
+Several queries can be run in one call: they are searched concurrently, each
+through the tool result cache, and merged into one ranked list with duplicate
+URLs removed. SerpAPI failures raise ToolUpstreamError (a multi-query call
+only fails if every query failed), so the registry's circuit breaker sees them.
 """
 
-from serpapi import GoogleSearch
-from typing import List, Dict, Any
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple
 from tools.base import BaseTool
+from tools.circuit_breaker import ToolUpstreamError
+from tools.scraper_store import normalise_url
+from tools.tool_cache import ToolResultCache, tool_result_cache
 from config.settings import settings
+from services.http_client import HttpClient, http_client
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+SERPAPI_SEARCH_URL = "https://serpapi.com/search.json"
+
+# Upper bound on queries in one call, to keep SerpAPI spend predictable
+MAX_QUERIES = 5
+
+# Reciprocal rank fusion constant: higher values flatten the rank weighting
+RRF_K = 60
+
 
 class SearchTool(BaseTool):
     """Search the web using SerpAPI."""
 
-    def __init__(self):
-        """Initialize search tool."""
+    # Results are cached per query here, so the registry does not cache whole calls
+    manages_cache = True
+
+    def __init__(self, http: Optional[HttpClient] = None, cache: Optional[ToolResultCache] = None):
+        """
+        Initialize search tool.
+
+        Args:
+            http: Shared HTTP client (defaults to the global pooled client)
+            cache: Per-query result cache (defaults to the global tool result cache)
+        """
         super().__init__(
             name="search",
             description="Search the web for information about King's College London"
         )
         self.api_key = settings.serpapi_api_key
+        self.http = http or http_client
+        self.cache = cache or tool_result_cache
 
-    def execute(self, query: str, num_results: int = 5) -> List[Dict[str, Any]]:
+    def execute(
+        self,
+        query: Optional[str] = None,
+        num_results: int = 5,
+        queries: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
         """
         Execute web search.
 
         Args:
             query: Search query
-            num_results: Number of results to return
+            num_results: Number of results to return per query
+            queries: Several queries searched concurrently and merged (used instead of query)
 
         Returns:
-            List of search result dictionaries
+            List of search result dictionaries; merged results also carry the
+            queries that found them
+
+        Raises:
+            ValueError: If no query was given
+            ToolUpstreamError: If SerpAPI failed for every query
         """
+        batch = self._query_list(query, queries)
+        if len(batch) == 1:
+            return self._search(batch[0], num_results)
+
+        with ThreadPoolExecutor(max_workers=len(batch), thread_name_prefix="search") as executor:
+            futures = [executor.submit(self._search, q, num_results) for q in batch]
+        return self._merge_outcomes(batch, [future.exception() or future.result() for future in futures])
+
+    async def aexecute(
+        self,
+        query: Optional[str] = None,
+        num_results: int = 5,
+        queries: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Execute web search without blocking the event loop.
+
+        Args:
+            query: Search query
+            num_results: Number of results to return per query
+            queries: Several queries searched concurrently and merged (used instead of query)
+
+        Returns:
+            List of search result dictionaries; merged results also carry the
+            queries that found them
+
+        Raises:
+            ValueError: If no query was given
+            ToolUpstreamError: If SerpAPI failed for every query
+        """
+        batch = self._query_list(query, queries)
+        if len(batch) == 1:
+            return await self._asearch(batch[0], num_results)
+
+        outcomes = await asyncio.gather(*(self._asearch(q, num_results) for q in batch), return_exceptions=True)
+        return self._merge_outcomes(batch, list(outcomes))
+
+    def _search(self, query: str, num_results: int) -> List[Dict[str, Any]]:
+        """Run one query, serving it from the cache when possible."""
+        hit, cached = self._cache_get(query, num_results)
+        if hit:
+            return cached
+
         try:
-            # Enhance query with KCL context
-            enhanced_query = f"{query} King's College London"
+            params = self._build_params(query, num_results)
+            logger.info(f"Searching for: {params['q']}")
 
-            logger.info(f"Searching for: {enhanced_query}")
+            response = self.http.get(SERPAPI_SEARCH_URL, params=params)
+            response.raise_for_status()
+            return self._cache_put(query, num_results, self._format_results(response.json(), num_results))
 
-            search = GoogleSearch({
-                "q": enhanced_query,
-                "api_key": self.api_key,
-                "num": num_results
-            })
+        except Exception as e:
+            logger.error(f"Error executing search: {str(e)}")
+            raise ToolUpstreamError(f"Search failed: {str(e)}") from e
 
-            results = search.get_dict()
-            organic_results = results.get("organic_results", [])
+    async def _asearch(self, query: str, num_results: int) -> List[Dict[str, Any]]:
+        """Run one query asynchronously, serving it from the cache when possible."""
+        hit, cached = self._cache_get(query, num_results)
+        if hit:
+            return cached
 
-            formatted_results = []
-            for result in organic_results[:num_results]:
-                formatted_results.append({
-                    "title": result.get("title", ""),
-                    "link": result.get("link", ""),
-                    "snippet": result.get("snippet", "")
-                })
+        try:
+            params = self._build_params(query, num_results)
+            logger.info(f"Searching for: {params['q']}")
 
-            logger.info(f"Found {len(formatted_results)} search results")
-            return formatted_results
+            response = await self.http.aget(SERPAPI_SEARCH_URL, params=params)
+            response.raise_for_status()
+            return self._cache_put(query, num_results, self._format_results(response.json(), num_results))
 
         except Exception as e:
             logger.error(f"Error executing search: {str(e)}")
-            return []
+            raise ToolUpstreamError(f"Search failed: {str(e)}") from e
+
+    @staticmethod
+    def _query_list(query: Optional[str], queries: Optional[List[str]]) -> List[str]:
+        """Collect the distinct non-empty queries of a call."""
+        batch = [q.strip() for q in (queries or []) if q and q.strip()]
+        if not batch and query and query.strip():
+            batch = [query.strip()]
+        if not batch:
+            raise ValueError("search needs a query or a list of queries")
+        batch = list(dict.fromkeys(batch))
+        if len(batch) > MAX_QUERIES:
+            logger.warning(f"Search limited to the first {MAX_QUERIES} of {len(batch)} queries")
+        return batch[:MAX_QUERIES]
+
+    def _cache_get(self, query: str, num_results: int) -> Tuple[bool, Any]:
+        if not settings.enable_tool_cache:
+            return False, None
+        hit, result = self.cache.get(self.name, {"query": query, "num_results": num_results})
+        if hit:
+            logger.info(f"Search cache hit: {query}")
+        return hit, result
+
+    def _cache_put(self, query: str, num_results: int, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if settings.enable_tool_cache:
+            self.cache.put(self.name, {"query": query, "num_results": num_results}, results)
+        return results
+
+    def _merge_outcomes(self, batch: List[str], outcomes: List[Any]) -> List[Dict[str, Any]]:
+        """Merge the queries that succeeded; raise only if all of them failed."""
+        for outcome in outcomes:
+            if isinstance(outcome, BaseException) and not isinstance(outcome, Exception):
+                raise outcome
+        succeeded = [(q, outcome) for q, outcome in zip(batch, outcomes) if not isinstance(outcome, Exception)]
+        if not succeeded:
+            raise outcomes[0]
+        if len(succeeded) < len(batch):
+            logger.warning(f"{len(batch) - len(succeeded)} of {len(batch)} search queries failed")
+        return self._merge([q for q, _ in succeeded], [results for _, results in succeeded])
+
+    @staticmethod
+    def _merge(batch: List[str], per_query: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """
+        Merge per-query results with reciprocal rank fusion.
+
+        A URL found by several queries is listed once, ranked above URLs found
+        by a single query at a similar position.
+        """
+        merged: Dict[str, Dict[str, Any]] = {}
+        scores: Dict[str, float] = {}
+        for query, results in zip(batch, per_query):
+            for rank, item in enumerate(results, 1):
+                key = normalise_url(item["link"]) if item.get("link") else f"{query}#{rank}"
+                if key not in merged:
+                    merged[key] = {**item, "queries": []}
+                    scores[key] = 0.0
+                merged[key]["queries"].append(query)
+                scores[key] += 1.0 / (RRF_K + rank)
+
+        ranked = sorted(merged, key=lambda key: scores[key], reverse=True)
+        logger.info(f"Merged {sum(len(r) for r in per_query)} results from {len(batch)} queries into {len(ranked)}")
+        return [merged[key] for key in ranked]
+
+    def _build_params(self, query: str, num_results: int) -> Dict[str, Any]:
+        """Build SerpAPI parameters, enhancing the query with KCL context."""
+        return {
+            "engine": "google",
+            "q": f"{query} King's College London",
+            "api_key": self.api_key,
+            "num": num_results
+        }
+
+    def _format_results(self, results: Dict[str, Any], num_results: int) -> List[Dict[str, Any]]:
+        """Extract title/link/snippet from SerpAPI organic results."""
+        organic_results = results.get("organic_results", [])
+
+        formatted_results = []
+        for result in organic_results[:num_results]:
+            formatted_results.append({
+                "title": result.get("title", ""),
+                "link": result.get("link", ""),
+                "snippet": result.get("snippet", "")
+            })
+
+        logger.info(f"Found {len(formatted_results)} search results")
+        return formatted_results
 
     def requires_auth(self) -> bool:
         """Search tool does not require authentication."""
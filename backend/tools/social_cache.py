@@ -0,0 +1,312 @@
+"""
+Stale-while-revalidate cache for social media lookups.
+
+TikTok and Instagram lookups each start a paid Apify actor run, yet students
+keep asking for the same hashtags and accounts. Results are keyed by the
+normalised lookup (profiles, hashtags, query) so "#KCL" and "kcl" share an
+entry. Within the TTL an entry is served as is. After the TTL and within the
+stale window it is still served immediately, while a single background
+refresh per key fetches a new copy. Concurrent misses for the same key wait
+on one fetch instead of each starting an actor run.
+"""
+
+import asyncio
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from config.settings import settings
+from tools.base import get_tool_executor
+from tools.progress import progress_sink
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# (items, cacheable): partial or failed fetches are returned but not stored
+FetchResult = Tuple[List[Any], bool]
+
+
+def _normalise_names(values: Optional[Iterable[str]], prefix: str) -> List[str]:
+    return sorted({value.strip().lstrip(prefix).strip().lower() for value in values or [] if value and value.strip()})
+
+
+def social_cache_key(
+    tool_name: str,
+    profiles: Optional[Iterable[str]] = None,
+    hashtags: Optional[Iterable[str]] = None,
+    queries: Optional[Iterable[str]] = None,
+    **options: Any
+) -> str:
+    """
+    Build the cache key of a social lookup.
+
+    Profiles and hashtags are lowercased and stripped of @/#, queries are
+    lowercased with whitespace collapsed, and all lists are de-duplicated and
+    sorted. The result count is deliberately not part of the key.
+
+    Args:
+        tool_name: Tool name
+        profiles: Account usernames
+        hashtags: Hashtags
+        queries: Free-text search queries
+        **options: Other arguments that change the results (e.g. search_type)
+
+    Returns:
+        Cache key
+    """
+    normalised = {
+        "profiles": _normalise_names(profiles, "@"),
+        "hashtags": _normalise_names(hashtags, "#"),
+        "queries": sorted({" ".join(q.lower().split()) for q in queries or [] if q and q.strip()}),
+        **{name: value for name, value in sorted(options.items()) if value is not None}
+    }
+    return f"{tool_name}:{json.dumps(normalised, sort_keys=True, separators=(',', ':'))}"
+
+
+@dataclass
+class _Entry:
+    items: List[Any]
+    limit: int
+    stored_at: float
+
+
+@dataclass
+class _Flight:
+    """A fetch for a missed key that later misses wait on."""
+    limit: int
+    future: Future = field(default_factory=Future)
+    followers: int = 0
+
+
+class SocialResultCache:
+    """In-memory stale-while-revalidate cache with one refresh in flight per key."""
+
+    def __init__(self, ttl_seconds: int = 900, stale_seconds: int = 3600, max_entries: int = 500):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl_seconds: Entries younger than this are fresh
+            stale_seconds: Entries are served (and refreshed) for this long after the TTL
+            max_entries: LRU bound on cached lookups
+        """
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._refreshing: Set[str] = set()
+        self._flights: Dict[str, _Flight] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self._lock = threading.Lock()
+        self._stats = {
+            "fresh_hits": 0, "stale_hits": 0, "misses": 0, "joined_misses": 0, "refreshes": 0, "refresh_errors": 0
+        }
+
+    def get_or_fetch(self, key: str, limit: int, fetch: Callable[[], FetchResult]) -> List[Any]:
+        """
+        Serve a lookup, fetching or refreshing in the background as needed.
+
+        Args:
+            key: Key from social_cache_key()
+            limit: Number of results requested
+            fetch: Runs the lookup; returns (items, cacheable)
+
+        Returns:
+            Up to limit items
+        """
+        state, items = self._lookup(key, limit)
+        if state == "stale" and self._begin_refresh(key):
+            get_tool_executor().submit(self._refresh, key, limit, fetch)
+        if state != "miss":
+            return items[:limit]
+
+        flight, leader = self._join_flight(key, limit)
+        if leader:
+            try:
+                result = fetch()
+            except BaseException as e:
+                self._end_flight(key, flight, error=e)
+                raise
+            self._end_flight(key, flight, result=result)
+        return flight.future.result()[0][:limit]
+
+    async def aget_or_fetch(self, key: str, limit: int, fetch: Callable[[], Awaitable[FetchResult]]) -> List[Any]:
+        """
+        Async counterpart of get_or_fetch; background refreshes run as tasks on the running loop.
+
+        Args:
+            key: Key from social_cache_key()
+            limit: Number of results requested
+            fetch: Coroutine function running the lookup; returns (items, cacheable)
+
+        Returns:
+            Up to limit items
+        """
+        state, items = self._lookup(key, limit)
+        if state == "stale" and self._begin_refresh(key):
+            task = asyncio.get_running_loop().create_task(self._arefresh(key, limit, fetch))
+            # Keep a reference so the task is not garbage collected mid-run
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        if state != "miss":
+            return items[:limit]
+
+        flight, leader = self._join_flight(key, limit)
+        if leader:
+            # A task, so a cancelled leader does not cancel the run its followers wait on
+            task = asyncio.get_running_loop().create_task(fetch())
+            task.add_done_callback(lambda done: self._end_flight_task(key, flight, done))
+        waiter = asyncio.wrap_future(flight.future)
+        try:
+            items, _ = await asyncio.shield(waiter)
+        except asyncio.CancelledError:
+            # Nobody awaits the outcome any more; retrieve it so a failure is not reported as unhandled
+            waiter.add_done_callback(lambda done: done.cancelled() or done.exception())
+            with self._lock:
+                # Nobody else needs the run: cancelling it aborts the actor
+                if leader and flight.followers == 0:
+                    task.cancel()
+            raise
+        return items[:limit]
+
+    def purge(self) -> int:
+        """Remove all entries. Returns the number removed."""
+        with self._lock:
+            count = len(self._entries)
+            self._entries.clear()
+        logger.info(f"Purged {count} cached social lookups")
+        return count
+
+    def stats(self) -> Dict[str, Any]:
+        """Entry count, refreshes in flight and hit counters."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+            stats["refreshing"] = len(self._refreshing)
+            stats["fetching"] = len(self._flights)
+        lookups = stats["fresh_hits"] + stats["stale_hits"] + stats["misses"]
+        stats["hit_rate"] = round((stats["fresh_hits"] + stats["stale_hits"]) / lookups, 3) if lookups else 0.0
+        stats["ttl_seconds"] = self.ttl_seconds
+        stats["stale_seconds"] = self.stale_seconds
+        return stats
+
+    def _lookup(self, key: str, limit: int) -> Tuple[str, List[Any]]:
+        """Classify an entry as fresh, stale or miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            age = time.time() - entry.stored_at if entry else None
+            if entry is not None and age > self.ttl_seconds + self.stale_seconds:
+                del self._entries[key]
+                entry = None
+            # A smaller earlier fetch cannot answer a bigger request, unless it was exhaustive
+            if entry is None or (limit > entry.limit and len(entry.items) >= entry.limit):
+                self._stats["misses"] += 1
+                return "miss", []
+            self._entries.move_to_end(key)
+            state = "fresh" if age <= self.ttl_seconds else "stale"
+            self._stats[f"{state}_hits"] += 1
+            return state, entry.items
+
+    def _store(self, key: str, limit: int, items: List[Any]) -> None:
+        if not items:
+            return
+        with self._lock:
+            self._entries[key] = _Entry(items=items, limit=limit, stored_at=time.time())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _join_flight(self, key: str, limit: int) -> Tuple[_Flight, bool]:
+        """
+        Wait on the running fetch of a missed key, or start a new one.
+
+        A fetch for fewer items than requested is not joined.
+
+        Returns:
+            Tuple of (flight, True if the caller must run the fetch)
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None and flight.limit >= limit:
+                flight.followers += 1
+                self._stats["joined_misses"] += 1
+                return flight, False
+            flight = _Flight(limit=limit)
+            self._flights[key] = flight
+            return flight, True
+
+    def _end_flight(
+        self,
+        key: str,
+        flight: _Flight,
+        result: Optional[FetchResult] = None,
+        error: Optional[BaseException] = None
+    ) -> None:
+        if result is not None and result[1]:
+            self._store(key, flight.limit, result[0])
+        with self._lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+        if error is not None:
+            flight.future.set_exception(error)
+        else:
+            flight.future.set_result(result)
+
+    def _end_flight_task(self, key: str, flight: _Flight, task: asyncio.Task) -> None:
+        if task.cancelled():
+            self._end_flight(key, flight, error=RuntimeError(f"Social lookup {key} was cancelled"))
+        elif task.exception() is not None:
+            self._end_flight(key, flight, error=task.exception())
+        else:
+            self._end_flight(key, flight, result=task.result())
+
+    def _begin_refresh(self, key: str) -> bool:
+        """Claim the refresh of a key; False if one is already running."""
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            self._stats["refreshes"] += 1
+            return True
+
+    def _end_refresh(self, key: str, result: Optional[FetchResult], limit: int) -> None:
+        if result is not None and result[1]:
+            self._store(key, limit, result[0])
+        with self._lock:
+            self._refreshing.discard(key)
+            if result is None:
+                self._stats["refresh_errors"] += 1
+
+    def _refresh(self, key: str, limit: int, fetch: Callable[[], FetchResult]) -> None:
+        result = None
+        try:
+            result = fetch()
+            logger.info(f"Refreshed stale social lookup {key}")
+        except Exception as e:
+            logger.warning(f"Background refresh of {key} failed: {str(e)}")
+        finally:
+            self._end_refresh(key, result, limit)
+
+    async def _arefresh(self, key: str, limit: int, fetch: Callable[[], Awaitable[FetchResult]]) -> None:
+        result = None
+        try:
+            # The request that triggered the refresh has moved on; do not stream its progress
+            with progress_sink(None):
+                result = await fetch()
+            logger.info(f"Refreshed stale social lookup {key}")
+        except Exception as e:
+            logger.warning(f"Background refresh of {key} failed: {str(e)}")
+        finally:
+            self._end_refresh(key, result, limit)
+
+
+# Global social results cache instance
+social_result_cache = SocialResultCache(
+    ttl_seconds=settings.social_cache_ttl_seconds,
+    stale_seconds=settings.social_cache_stale_seconds,
+    max_entries=settings.social_cache_max_entries
+)
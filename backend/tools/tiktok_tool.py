@@ -3,24 +3,55 @@ TikTok scraping tool using Apify's TikTok Scraper.
 """
 
 from typing import List, Dict, Any, Optional
-from apify_client import ApifyClient
+from tools.apify_common import FAILED_STATUSES, ActorRunResult, ActorRunner, ApifyClients
 from tools.base import BaseTool
+from tools.circuit_breaker import ToolUpstreamError
+from tools.records import TikTokVideo
+from tools.social_cache import FetchResult, SocialResultCache, social_cache_key, social_result_cache
 from config.settings import settings
+from services.http_client import HttpClient
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+TIKTOK_ACTOR_ID = "clockworks/tiktok-scraper"
+
+# Dataset fields read by _parse_video_data; everything else is left on Apify's side
+TIKTOK_FIELDS = [
+    "id", "text", "authorMeta", "playCount", "diggCount", "commentCount",
+    "shareCount", "hashtags", "musicMeta", "webVideoUrl", "createTimeISO"
+]
+
 
 class TikTokTool(BaseTool):
     """Tool for searching and scraping TikTok videos."""
 
-    def __init__(self):
-        """Initialize TikTok tool."""
+    # Lookups are cached per normalised profile/hashtag/query in the social result cache
+    manages_cache = True
+
+    def __init__(self, http: Optional[HttpClient] = None, cache: Optional[SocialResultCache] = None):
+        """
+        Initialize TikTok tool.
+
+        Args:
+            http: Shared HTTP client for dataset reads (defaults to the global pooled client)
+            cache: Social result cache (defaults to the global cache)
+        """
         super().__init__(
             name="tiktok",
             description="Search and scrape TikTok videos by hashtag, profile, or search query"
         )
         self.api_key = settings.apify_api_key
+        self.clients = ApifyClients(self.api_key)
+        self.runner = ActorRunner(
+            self.clients,
+            tool_name=self.name,
+            deadline_seconds=settings.apify_deadline_seconds,
+            poll_interval=settings.apify_poll_interval_seconds,
+            http=http,
+            page_size=settings.apify_dataset_page_size
+        )
+        self.cache = cache or social_result_cache
 
     def execute(
         self,
@@ -28,7 +59,7 @@ class TikTokTool(BaseTool):
         profiles: Optional[List[str]] = None,
         search_queries: Optional[List[str]] = None,
         results_per_page: int = 10
-    ) -> List[Dict[str, Any]]:
+    ) -> List[TikTokVideo]:
         """
         Execute TikTok scraping.
 
@@ -39,64 +70,111 @@ class TikTokTool(BaseTool):
             results_per_page: Number of results to return (max 50)
 
         Returns:
-            List of video data dictionaries
+            List of video records
+
+        Raises:
+            ToolUpstreamError: If the Apify run could not be started or failed without results
         """
         logger.info(f"TikTok search - hashtags: {hashtags}, profiles: {profiles}, queries: {search_queries}")
 
-        try:
-            client = ApifyClient(self.api_key)
-            run_input = {"resultsPerPage": min(results_per_page, 50)}
+        limit = max(1, min(results_per_page, 50))
+        run_input = self._build_run_input(hashtags, profiles, search_queries, results_per_page)
+        key = social_cache_key(self.name, profiles=profiles, hashtags=hashtags, queries=search_queries)
+        return self.cache.get_or_fetch(key, limit, lambda: self._run(run_input, limit))
+
+    async def aexecute(
+        self,
+        hashtags: Optional[List[str]] = None,
+        profiles: Optional[List[str]] = None,
+        search_queries: Optional[List[str]] = None,
+        results_per_page: int = 10
+    ) -> List[TikTokVideo]:
+        """
+        Execute TikTok scraping without blocking the event loop.
+
+        Args:
+            hashtags: List of hashtags to search (without #)
+            profiles: List of profile usernames to search (without @)
+            search_queries: List of search query strings
+            results_per_page: Number of results to return (max 50)
 
-            if hashtags:
-                run_input["hashtags"] = [h.lstrip('#') for h in hashtags]
-            if profiles:
-                run_input["profiles"] = [p.lstrip('@') for p in profiles]
-            if search_queries:
-                run_input["searchQueries"] = search_queries
+        Returns:
+            List of video records
 
-            # Run the Apify TikTok Scraper actor
-            run = client.actor("clockworks/tiktok-scraper").call(run_input=run_input)
+        Raises:
+            ToolUpstreamError: If the Apify run could not be started or failed without results
+        """
+        logger.info(f"TikTok search - hashtags: {hashtags}, profiles: {profiles}, queries: {search_queries}")
 
-            results = []
-            for item in client.dataset(run["defaultDatasetId"]).iterate_items():
-                results.append(self._parse_video_data(item))
+        limit = max(1, min(results_per_page, 50))
+        run_input = self._build_run_input(hashtags, profiles, search_queries, results_per_page)
+        key = social_cache_key(self.name, profiles=profiles, hashtags=hashtags, queries=search_queries)
+        return await self.cache.aget_or_fetch(key, limit, lambda: self._arun(run_input, limit))
 
-            logger.info(f"TikTok scraper returned {len(results)} results")
-            return results
+    def _run(self, run_input: Dict[str, Any], limit: int) -> FetchResult:
+        """Start the Apify TikTok Scraper actor and poll it until done or out of time."""
+        try:
+            run = self.runner.run(
+                TIKTOK_ACTOR_ID, run_input, limit=limit, parse=self._parse_video_data, fields=TIKTOK_FIELDS
+            )
+        except Exception as e:
+            logger.error(f"TikTok scraping error: {str(e)}")
+            raise ToolUpstreamError(f"TikTok scraping failed: {str(e)}") from e
+        # Partial results (deadline, or a failed or timed-out run) are returned but not cached
+        return self._finish(run), run.complete
 
+    async def _arun(self, run_input: Dict[str, Any], limit: int) -> FetchResult:
+        """Async counterpart of _run."""
+        try:
+            run = await self.runner.arun(
+                TIKTOK_ACTOR_ID, run_input, limit=limit, parse=self._parse_video_data, fields=TIKTOK_FIELDS
+            )
         except Exception as e:
             logger.error(f"TikTok scraping error: {str(e)}")
-            return []
+            raise ToolUpstreamError(f"TikTok scraping failed: {str(e)}") from e
+        return self._finish(run), run.complete
+
+    def _finish(self, run: ActorRunResult) -> List[TikTokVideo]:
+        """Log how the actor run ended and return its items; a failed run with nothing to show raises."""
+        if not run.items and run.status in FAILED_STATUSES:
+            raise ToolUpstreamError(f"TikTok actor run {run.run_id} ended with status {run.status}")
+        if run.timed_out:
+            logger.warning(f"TikTok scraper hit its deadline; returning {len(run.items)} partial results")
+        else:
+            logger.info(f"TikTok scraper returned {len(run.items)} results")
+        logger.info(
+            f"TikTok scraper read {run.bytes_read} bytes in {run.pages} page(s); "
+            f"decode {run.decode_ms:.1f} ms, parse {run.parse_ms:.1f} ms"
+        )
+        return run.items
 
-    def _parse_video_data(self, item: Dict[str, Any]) -> Dict[str, Any]:
+    def _build_run_input(
+        self,
+        hashtags: Optional[List[str]],
+        profiles: Optional[List[str]],
+        search_queries: Optional[List[str]],
+        results_per_page: int
+    ) -> Dict[str, Any]:
+        """Build the actor input from the tool arguments."""
+        run_input = {"resultsPerPage": min(results_per_page, 50)}
+
+        if hashtags:
+            run_input["hashtags"] = [h.lstrip('#') for h in hashtags]
+        if profiles:
+            run_input["profiles"] = [p.lstrip('@') for p in profiles]
+        if search_queries:
+            run_input["searchQueries"] = search_queries
+
+        return run_input
+
+    def _parse_video_data(self, item: Dict[str, Any]) -> TikTokVideo:
         """
-        Parse raw video data into standardized format.
+        Parse raw video data into a compact record.
 
         Args:
             item: Raw video data from Apify
 
         Returns:
-            Parsed video data dictionary
+            TikTokVideo record
         """
-        return {
-            "id": item.get("id", ""),
-            "description": item.get("text", ""),
-            "author": {
-                "username": item.get("authorMeta", {}).get("name", ""),
-                "nickname": item.get("authorMeta", {}).get("nickName", ""),
-                "verified": item.get("authorMeta", {}).get("verified", False),
-            },
-            "stats": {
-                "views": item.get("playCount", 0),
-                "likes": item.get("diggCount", 0),
-                "comments": item.get("commentCount", 0),
-                "shares": item.get("shareCount", 0),
-            },
-            "hashtags": [tag.get("name", "") for tag in item.get("hashtags", [])],
-            "music": {
-                "title": item.get("musicMeta", {}).get("musicName", ""),
-                "author": item.get("musicMeta", {}).get("musicAuthor", ""),
-            },
-            "url": item.get("webVideoUrl", ""),
-            "created_at": item.get("createTimeISO", ""),
-        }
+        return TikTokVideo.from_apify(item)
@@ -0,0 +1,240 @@
+"""
+Precomputed timetable queries on top of the event index.
+
+Answers the calendar arithmetic students ask about ("what's next?", "when am
+I free on Thursday?", "how busy is my week?") directly from the sorted index,
+returning compact JSON-ready results instead of a long event list for the LLM
+to reason over.
+"""
+
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from tools.timetable_index import EventIndex
+
+WEEKDAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+
+
+def resolve_date(value: Optional[str], today: date) -> date:
+    """
+    Resolve a day reference to a date.
+
+    Args:
+        value: ISO date, "today", "tomorrow" or a weekday name (next occurrence,
+            today included); None means today
+        today: Current date in the timetable's timezone
+
+    Returns:
+        Resolved date
+
+    Raises:
+        ValueError: If the value is not recognised
+    """
+    if not value:
+        return today
+    text = value.strip().lower()
+    if text == "today":
+        return today
+    if text == "tomorrow":
+        return today + timedelta(days=1)
+    if text in WEEKDAYS:
+        return today + timedelta(days=(WEEKDAYS.index(text) - today.weekday()) % 7)
+    return date.fromisoformat(text)
+
+
+def parse_clock(value: Optional[str], default: time) -> time:
+    """Parse an HH:MM time of day, falling back to a default."""
+    return time.fromisoformat(value) if value else default
+
+
+def _compact(index: EventIndex, position: int) -> Dict[str, Any]:
+    start = datetime.fromtimestamp(index.starts[position], tz=index.tz)
+    end = datetime.fromtimestamp(index.ends[position], tz=index.tz)
+    return {
+        "summary": index.summaries[position],
+        "start": start.isoformat(timespec="minutes"),
+        "end": end.isoformat(timespec="minutes"),
+        "location": index.locations[position]
+    }
+
+
+def _overlapping(index: EventIndex, start: float, end: float) -> List[int]:
+    """Positions of events overlapping the epoch interval [start, end)."""
+    # No event lasts longer than the index's longest one, so earlier starts cannot overlap
+    lo = bisect_left(index.starts, start - index.max_duration)
+    hi = bisect_left(index.starts, end)
+    return [position for position in range(lo, hi) if index.ends[position] > start or index.starts[position] >= start]
+
+
+def _busy_intervals(
+    index: EventIndex,
+    start: float,
+    end: float
+) -> Tuple[List[Tuple[float, float]], List[int], List[int]]:
+    """
+    Merged busy intervals of timed events, clipped to [start, end).
+
+    All-day events (reading days, term markers) do not block time.
+
+    Returns:
+        (busy intervals, positions of timed events, positions of all-day events)
+    """
+    busy: List[Tuple[float, float]] = []
+    timed, all_day = [], []
+    for position in _overlapping(index, start, end):
+        if index.all_day[position]:
+            all_day.append(position)
+            continue
+        timed.append(position)
+        clipped_start = max(index.starts[position], start)
+        clipped_end = min(index.ends[position], end)
+        if busy and clipped_start <= busy[-1][1]:
+            busy[-1] = (busy[-1][0], max(busy[-1][1], clipped_end))
+        else:
+            busy.append((clipped_start, clipped_end))
+    return busy, timed, all_day
+
+
+def next_event(index: EventIndex, now: datetime) -> Dict[str, Any]:
+    """
+    The timed event in progress (if any) and the next timed event to start.
+
+    All-day events (reading weeks, bank holidays) start at midnight and would
+    hide the day's classes; those spanning now are listed under "all_day".
+
+    Args:
+        index: Event index
+        now: Reference time
+
+    Returns:
+        {"now": ..., "current": event or None, "next": event or None, "starts_in_minutes": int or None,
+         "all_day": [...]}
+    """
+    epoch = now.timestamp()
+    current, all_day = [], []
+    for position in _overlapping(index, epoch, epoch + 1):
+        if not index.starts[position] <= epoch < index.ends[position]:
+            continue
+        (all_day if index.all_day[position] else current).append(position)
+
+    upcoming = bisect_right(index.starts, epoch)
+    while upcoming < len(index) and index.all_day[upcoming]:
+        upcoming += 1
+    if upcoming == len(index):
+        upcoming = None
+
+    return {
+        "now": now.isoformat(timespec="minutes"),
+        "current": _compact(index, current[0]) if current else None,
+        "next": _compact(index, upcoming) if upcoming is not None else None,
+        "starts_in_minutes": int((index.starts[upcoming] - epoch) // 60) if upcoming is not None else None,
+        "all_day": [index.summaries[position] for position in all_day]
+    }
+
+
+def free_slots(
+    index: EventIndex,
+    day: date,
+    day_start: time = time(9, 0),
+    day_end: time = time(18, 0),
+    min_minutes: int = 30
+) -> Dict[str, Any]:
+    """
+    Free and busy periods within a day window.
+
+    All-day events do not block the window; they are listed under "all_day".
+
+    Args:
+        index: Event index
+        day: Day to inspect
+        day_start: Start of the window (local time)
+        day_end: End of the window (local time)
+        min_minutes: Shortest gap reported as free
+
+    Returns:
+        {"date", "window", "busy": [...], "free": [...], "free_minutes": int, "all_day": [...]}
+
+    Raises:
+        ValueError: If the window ends before it starts
+    """
+    if day_end <= day_start:
+        raise ValueError(
+            f"free_slots window must end after it starts (got {day_start.strftime('%H:%M')}-{day_end.strftime('%H:%M')})"
+        )
+    window_start = datetime.combine(day, day_start, tzinfo=index.tz).timestamp()
+    window_end = datetime.combine(day, day_end, tzinfo=index.tz).timestamp()
+
+    busy, _, all_day = _busy_intervals(index, window_start, window_end)
+
+    free = []
+    cursor = window_start
+    for start, end in busy + [(window_end, window_end)]:
+        if start - cursor >= min_minutes * 60:
+            free.append((cursor, start))
+        cursor = max(cursor, end)
+
+    def clock(epoch: float) -> str:
+        return datetime.fromtimestamp(epoch, tz=index.tz).strftime("%H:%M")
+
+    return {
+        "date": day.isoformat(),
+        "window": f"{day_start.strftime('%H:%M')}-{day_end.strftime('%H:%M')}",
+        "busy": [{"start": clock(start), "end": clock(end)} for start, end in busy],
+        "free": [
+            {"start": clock(start), "end": clock(end), "minutes": int((end - start) // 60)}
+            for start, end in free
+        ],
+        "free_minutes": int(sum(end - start for start, end in free) // 60),
+        "all_day": [index.summaries[position] for position in all_day]
+    }
+
+
+def daily_load(index: EventIndex, first_day: date, days: int = 7) -> Dict[str, Any]:
+    """
+    Number of timed events and scheduled hours per day.
+
+    A day's events are the timed events overlapping it, and its hours are
+    their union clipped to the day, so overlapping events are not counted
+    twice. All-day events are listed separately and add no hours.
+
+    Args:
+        index: Event index
+        first_day: First day to report
+        days: Number of days
+
+    Returns:
+        {"days": [{"date", "weekday", "events", "hours", "first_start", "last_end", "all_day"}],
+         "total_events", "total_hours"}
+    """
+    report = []
+    seen = set()
+    for offset in range(days):
+        day = first_day + timedelta(days=offset)
+        day_start = datetime.combine(day, time.min, tzinfo=index.tz).timestamp()
+        day_end = datetime.combine(day + timedelta(days=1), time.min, tzinfo=index.tz).timestamp()
+
+        busy, timed, all_day = _busy_intervals(index, day_start, day_end)
+        seen.update(timed)
+        seconds = sum(end - start for start, end in busy)
+
+        def clock(epoch: float) -> str:
+            # An event running past midnight ends the day at 24:00, not 00:00
+            return "24:00" if epoch >= day_end else datetime.fromtimestamp(epoch, tz=index.tz).strftime("%H:%M")
+
+        report.append({
+            "date": day.isoformat(),
+            "weekday": WEEKDAYS[day.weekday()].capitalize(),
+            "events": len(timed),
+            "hours": round(seconds / 3600, 2),
+            "first_start": clock(busy[0][0]) if busy else None,
+            "last_end": clock(busy[-1][1]) if busy else None,
+            "all_day": [index.summaries[position] for position in all_day]
+        })
+
+    return {
+        "days": report,
+        # Events spanning several days are counted once
+        "total_events": len(seen),
+        "total_hours": round(sum(day["hours"] for day in report), 2)
+    }
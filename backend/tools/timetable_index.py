@@ -0,0 +1,141 @@
+"""
+Sorted event index for timetable range queries.
+
+A feed is parsed once into parallel arrays ordered by start time: epoch
+start/end plus interned summary/location strings (module names and rooms
+repeat across hundreds of events). Range queries bisect the start array, so
+"next class", "today" and "this week" cost O(log n + k) instead of a walk
+over the whole calendar. Times are stored as absolute instants and returned
+in the timetable's timezone.
+"""
+
+import sys
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timezone, tzinfo
+from typing import Any, Dict, Iterable, List, Optional
+
+from tools.records import TimetableEvent
+
+
+def to_epoch(dt: datetime, tz: tzinfo = timezone.utc) -> float:
+    """
+    Convert a datetime to epoch seconds.
+
+    Args:
+        dt: Aware datetime, or naive wall-clock time in tz
+        tz: Zone for naive datetimes
+
+    Returns:
+        Epoch seconds
+    """
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=tz)
+    return dt.timestamp()
+
+
+class EventIndex:
+    """Immutable, start-ordered event index."""
+
+    __slots__ = (
+        "tz", "window_start", "window_end", "parse_errors",
+        "starts", "ends", "summaries", "locations", "descriptions", "all_day", "max_duration"
+    )
+
+    def __init__(
+        self,
+        events: Iterable[Dict[str, Any]] = (),
+        tz: tzinfo = timezone.utc,
+        window_start: Optional[datetime] = None,
+        window_end: Optional[datetime] = None,
+        parse_errors: int = 0
+    ):
+        """
+        Build the index.
+
+        Args:
+            events: Event dictionaries with "start" (datetime) and optionally
+                "end", "summary", "location", "description" and "all_day"
+            tz: Zone used for naive datetimes and for returned event times
+            window_start: Start of the window recurring events were expanded over
+            window_end: End of that window (None if nothing was expanded)
+            parse_errors: Number of feed events that could not be parsed
+        """
+        self.tz = tz
+        self.window_start = to_epoch(window_start, tz) if window_start else None
+        self.window_end = to_epoch(window_end, tz) if window_end else None
+        self.parse_errors = parse_errors
+
+        rows = []
+        for event in events:
+            start = to_epoch(event["start"], tz)
+            end = to_epoch(event["end"], tz) if event.get("end") else start
+            rows.append((
+                start,
+                max(start, end),
+                sys.intern(event.get("summary") or "Untitled"),
+                sys.intern(event.get("location") or ""),
+                event.get("description") or "",
+                bool(event.get("all_day"))
+            ))
+        rows.sort(key=lambda row: row[0])
+
+        self.starts: List[float] = [row[0] for row in rows]
+        self.ends: List[float] = [row[1] for row in rows]
+        self.summaries: List[str] = [row[2] for row in rows]
+        self.locations: List[str] = [row[3] for row in rows]
+        self.descriptions: List[str] = [row[4] for row in rows]
+        self.all_day: List[bool] = [row[5] for row in rows]
+        # Longest event, so range queries know how far back an overlapping event can start
+        self.max_duration: float = max((row[1] - row[0] for row in rows), default=0.0)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def covers(self, start: datetime, end: datetime) -> bool:
+        """Check whether recurring events were expanded over all of [start, end]."""
+        if self.window_end is None:
+            return True
+        return self.window_start <= to_epoch(start, self.tz) and to_epoch(end, self.tz) <= self.window_end
+
+    def event(self, position: int) -> TimetableEvent:
+        """Materialise the event at a position as a record (times in the index zone)."""
+        return TimetableEvent(
+            summary=self.summaries[position],
+            start=datetime.fromtimestamp(self.starts[position], tz=self.tz),
+            end=datetime.fromtimestamp(self.ends[position], tz=self.tz),
+            location=self.locations[position],
+            description=self.descriptions[position],
+            all_day=self.all_day[position]
+        )
+
+    def between(self, start: datetime, end: datetime) -> List[TimetableEvent]:
+        """
+        Events starting within [start, end].
+
+        Args:
+            start: Window start
+            end: Window end (inclusive)
+
+        Returns:
+            Event records sorted by start time
+        """
+        lo = bisect_left(self.starts, to_epoch(start, self.tz))
+        hi = bisect_right(self.starts, to_epoch(end, self.tz))
+        return [self.event(position) for position in range(lo, hi)]
+
+    def count_between(self, start: datetime, end: datetime) -> int:
+        """Number of events starting within [start, end]."""
+        return bisect_right(self.starts, to_epoch(end, self.tz)) - bisect_left(self.starts, to_epoch(start, self.tz))
+
+    def next_event(self, after: datetime) -> Optional[TimetableEvent]:
+        """
+        First event starting at or after a time.
+
+        Args:
+            after: Reference time
+
+        Returns:
+            Event record or None
+        """
+        position = bisect_left(self.starts, to_epoch(after, self.tz))
+        return self.event(position) if position < len(self.starts) else None
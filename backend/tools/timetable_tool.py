@@ -2,108 +2,607 @@
 Timetable tool using iCal subscription.
 """
 
-from typing import List, Dict, Any, Optional
-from datetime import datetime, timedelta
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Dict, List, Any, Optional, Tuple
+from datetime import datetime, time, timedelta
+from zoneinfo import ZoneInfo
 from icalendar import Calendar
-import requests
-from tools.base import BaseTool
+import asyncio
+import threading
+import httpx
+from tools.base import BaseTool, get_tool_executor
+from config.settings import settings
+from services.http_client import HttpClient, http_client
+from tools.ical_feed_cache import CachedFeed, ICalFeedCache, content_hash, ical_feed_cache
+from tools.ical_recurrence import expand_events
+from tools.ical_stream import UnsupportedFeedError, VEventStreamParser, parse_vevents
+from tools import timetable_analytics
+from tools.records import TimetableEvent
+from tools.timetable_index import EventIndex
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+ICAL_FETCH_TIMEOUT = httpx.Timeout(10.0, connect=settings.http_connect_timeout)
+ICAL_STREAM_CHUNK_SIZE = 64 * 1024
+
+TIMETABLE_ACTIONS = ("events", "next_event", "free_slots", "daily_load")
+
+
+class TimetableFetchError(Exception):
+    """The iCal feed responded with an error status."""
+
+    def __init__(self, status_code: int):
+        super().__init__(f"Failed to fetch iCal: HTTP {status_code}")
+        self.status_code = status_code
+
+
+@dataclass(frozen=True)
+class FeedLoad:
+    """An event index and how its feed was obtained."""
+    index: EventIndex
+    # downloaded | not_modified (304) | unchanged (200, same content) | cached (fresh, no request)
+    # | stale (feed unreachable, cached copy served)
+    source: str
+    # Status of the request made for this load; None if no request was answered
+    http_status: Optional[int] = None
+
+
+# (feed, source, http_status) resolved by a shared fetch
+_Fetched = Tuple[CachedFeed, str, Optional[int]]
+
+
+@dataclass
+class _FeedDownload:
+    """Outcome of fetching a feed: the response plus parsed VEVENTs on HTTP 200."""
+    response: httpx.Response
+    components: Optional[List[Any]] = None
+    body_hash: Optional[str] = None
+    size_bytes: int = 0
+    parse_errors: int = 0
+
 
 class TimetableTool(BaseTool):
     """Access KCL timetable via iCal subscription."""
 
-    def __init__(self):
-        """Initialize timetable tool."""
+    def __init__(self, http: Optional[HttpClient] = None, feed_cache: Optional[ICalFeedCache] = None):
+        """
+        Initialize timetable tool.
+
+        Args:
+            http: Shared HTTP client (defaults to the global pooled client)
+            feed_cache: Per-URL iCal feed cache (defaults to the global cache)
+        """
         super().__init__(
             name="timetable",
             description="Access and parse KCL student timetable from iCal subscription"
         )
+        self.http = http or http_client
+        self.feed_cache = feed_cache or ical_feed_cache
+        self.tz = ZoneInfo(settings.timetable_timezone)
+        # Fetches in progress per URL; concurrent misses wait on the same one
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
 
     def execute(
         self,
         ical_url: str,
-        days_ahead: int = 7
-    ) -> List[Dict[str, Any]]:
+        days_ahead: int = 7,
+        action: str = "events",
+        date: Optional[str] = None,
+        day_start: Optional[str] = None,
+        day_end: Optional[str] = None,
+        min_minutes: int = 30
+    ) -> Any:
         """
-        Fetch and parse timetable events.
+        Fetch timetable events or answer a precomputed timetable query.
 
         Args:
             ical_url: iCal subscription URL
-            days_ahead: Number of days ahead to fetch events
+            days_ahead: Number of days ahead to fetch events (events, daily_load)
+            action: One of TIMETABLE_ACTIONS
+            date: Day for free_slots / first day for daily_load (ISO date,
+                "today", "tomorrow" or a weekday name)
+            day_start: Start of the free_slots window (HH:MM)
+            day_end: End of the free_slots window (HH:MM)
+            min_minutes: Shortest gap reported by free_slots
 
         Returns:
-            List of event dictionaries
+            List of event records for "events", otherwise a compact result dictionary
+
+        Raises:
+            ValueError: If the action or its arguments are invalid
         """
+        self._check_action(action)
         try:
-            logger.info(f"Fetching timetable from iCal URL (length: {len(ical_url)})")
+            index = self.load_index(ical_url, days_ahead)
 
-            # Fetch iCal data with timeout
-            response = requests.get(ical_url, timeout=10)
-            if response.status_code != 200:
-                logger.error(f"Failed to fetch iCal: HTTP {response.status_code}")
-                return []
-
-            logger.info(f"Successfully fetched iCal data ({len(response.content)} bytes)")
-
-            # Parse calendar
-            cal = Calendar.from_ical(response.content)
-
-            # Filter events
-            now = datetime.now()
-            end_date = now + timedelta(days=days_ahead)
-            events = []
-            total_events = 0
-
-            for component in cal.walk():
-                if component.name == "VEVENT":
-                    total_events += 1
-                    try:
-                        dtstart = component.get("dtstart")
-                        if not dtstart:
-                            continue
-
-                        dt = dtstart.dt
-
-                        # Convert to datetime if date only
-                        if isinstance(dt, datetime):
-                            event_date = dt
-                            # Make timezone-naive for comparison
-                            if event_date.tzinfo is not None:
-                                event_date = event_date.replace(tzinfo=None)
-                        else:
-                            event_date = datetime.combine(dt, datetime.min.time())
-
-                        # Filter by date range
-                        if now <= event_date <= end_date:
-                            events.append({
-                                "summary": str(component.get("summary", "Untitled")),
-                                "start": event_date,
-                                "location": str(component.get("location", "")),
-                                "description": str(component.get("description", ""))
-                            })
-                    except Exception as event_error:
-                        logger.warning(f"Error parsing event: {event_error}")
-                        continue
-
-            # Sort by start time
-            events.sort(key=lambda x: x["start"])
-
-            logger.info(f"Found {len(events)} upcoming events out of {total_events} total events")
-            return events
-
-        except requests.exceptions.Timeout:
+        except TimetableFetchError as fetch_error:
+            logger.error(str(fetch_error))
+            return []
+        except httpx.TimeoutException:
+            logger.error("Timeout fetching iCal URL")
+            return []
+        except httpx.HTTPError as req_error:
+            logger.error(f"Network error fetching timetable: {str(req_error)}")
+            return []
+        except Exception as e:
+            logger.error(f"Error fetching timetable: {str(e)}", exc_info=True)
+            return []
+
+        return self.run_action(index, action, days_ahead, date, day_start, day_end, min_minutes)
+
+    async def aexecute(
+        self,
+        ical_url: str,
+        days_ahead: int = 7,
+        action: str = "events",
+        date: Optional[str] = None,
+        day_start: Optional[str] = None,
+        day_end: Optional[str] = None,
+        min_minutes: int = 30
+    ) -> Any:
+        """
+        Async counterpart of execute; fetching and parsing do not block the event loop.
+
+        Args:
+            ical_url: iCal subscription URL
+            days_ahead: Number of days ahead to fetch events (events, daily_load)
+            action: One of TIMETABLE_ACTIONS
+            date: Day for free_slots / first day for daily_load
+            day_start: Start of the free_slots window (HH:MM)
+            day_end: End of the free_slots window (HH:MM)
+            min_minutes: Shortest gap reported by free_slots
+
+        Returns:
+            List of event records for "events", otherwise a compact result dictionary
+
+        Raises:
+            ValueError: If the action or its arguments are invalid
+        """
+        self._check_action(action)
+        try:
+            index = await self.aload_index(ical_url, days_ahead)
+
+        except TimetableFetchError as fetch_error:
+            logger.error(str(fetch_error))
+            return []
+        except httpx.TimeoutException:
             logger.error("Timeout fetching iCal URL")
             return []
-        except requests.exceptions.RequestException as req_error:
+        except httpx.HTTPError as req_error:
             logger.error(f"Network error fetching timetable: {str(req_error)}")
             return []
         except Exception as e:
             logger.error(f"Error fetching timetable: {str(e)}", exc_info=True)
             return []
 
+        return self.run_action(index, action, days_ahead, date, day_start, day_end, min_minutes)
+
+    def run_action(
+        self,
+        index: EventIndex,
+        action: str = "events",
+        days_ahead: int = 7,
+        date: Optional[str] = None,
+        day_start: Optional[str] = None,
+        day_end: Optional[str] = None,
+        min_minutes: int = 30
+    ) -> Any:
+        """
+        Answer a timetable query from an event index.
+
+        Args:
+            index: Event index
+            action: One of TIMETABLE_ACTIONS
+            days_ahead: Days covered by events / daily_load
+            date: Day reference for free_slots / daily_load
+            day_start: Start of the free_slots window (HH:MM)
+            day_end: End of the free_slots window (HH:MM)
+            min_minutes: Shortest gap reported by free_slots
+
+        Returns:
+            Event list or analytics dictionary
+
+        Raises:
+            ValueError: If the action or its arguments are invalid
+        """
+        self._check_action(action)
+        if action == "events":
+            return self._filter_events(index, days_ahead)
+
+        now = datetime.now(self.tz)
+        if action == "next_event":
+            return timetable_analytics.next_event(index, now)
+        if action == "free_slots":
+            return timetable_analytics.free_slots(
+                index,
+                timetable_analytics.resolve_date(date, now.date()),
+                timetable_analytics.parse_clock(day_start, time(9, 0)),
+                timetable_analytics.parse_clock(day_end, time(18, 0)),
+                min_minutes
+            )
+        return timetable_analytics.daily_load(
+            index, timetable_analytics.resolve_date(date, now.date()), max(1, days_ahead)
+        )
+
+    @staticmethod
+    def _check_action(action: str) -> None:
+        if action not in TIMETABLE_ACTIONS:
+            raise ValueError(f"Unknown timetable action '{action}'. Use one of: {', '.join(TIMETABLE_ACTIONS)}")
+
+    def load_index(self, ical_url: str, days_ahead: int = 7) -> EventIndex:
+        """
+        Get the event index for a feed, fetching or revalidating it as needed.
+
+        Concurrent misses for the same URL share one fetch.
+
+        Args:
+            ical_url: iCal subscription URL
+            days_ahead: Number of days ahead the index must cover
+
+        Returns:
+            Event index
+
+        Raises:
+            TimetableFetchError: If the feed returned an error status
+            httpx.HTTPError: If the feed could not be reached and nothing is cached
+        """
+        return self.load_feed(ical_url, days_ahead).index
+
+    def load_feed(self, ical_url: str, days_ahead: int = 7) -> FeedLoad:
+        """
+        Like load_index, but also report whether a request was made and what it returned.
+
+        Raises:
+            TimetableFetchError: If the feed returned an error status
+            httpx.HTTPError: If the feed could not be reached and nothing is cached
+        """
+        logger.info(f"Fetching timetable from iCal URL (length: {len(ical_url)})")
+
+        feed = self.feed_cache.get(ical_url)
+        if self.feed_cache.is_fresh(feed):
+            return FeedLoad(self._current_index(feed, days_ahead), "cached")
+
+        pending, leader = self._join_fetch(ical_url)
+        if leader:
+            try:
+                result = self._fetch_feed(ical_url, feed, days_ahead)
+            except BaseException as e:
+                self._finish_fetch(ical_url, pending, error=e)
+                raise
+            self._finish_fetch(ical_url, pending, result=result)
+        feed, source, http_status = pending.result()
+        return FeedLoad(self._current_index(feed, days_ahead), source, http_status)
+
+    async def aload_index(self, ical_url: str, days_ahead: int = 7) -> EventIndex:
+        """
+        Async counterpart of load_index; parsing runs off the event loop.
+
+        Args:
+            ical_url: iCal subscription URL
+            days_ahead: Number of days ahead the index must cover
+
+        Returns:
+            Event index
+
+        Raises:
+            TimetableFetchError: If the feed returned an error status
+            httpx.HTTPError: If the feed could not be reached and nothing is cached
+        """
+        return (await self.aload_feed(ical_url, days_ahead)).index
+
+    async def aload_feed(self, ical_url: str, days_ahead: int = 7) -> FeedLoad:
+        """
+        Async counterpart of load_feed.
+
+        Raises:
+            TimetableFetchError: If the feed returned an error status
+            httpx.HTTPError: If the feed could not be reached and nothing is cached
+        """
+        logger.info(f"Fetching timetable from iCal URL (length: {len(ical_url)})")
+
+        feed = self.feed_cache.get(ical_url)
+        if self.feed_cache.is_fresh(feed):
+            return FeedLoad(await self._acurrent_index(feed, days_ahead), "cached")
+
+        pending, leader = self._join_fetch(ical_url)
+        if leader:
+            # Run as a task so a cancelled caller does not abort the fetch others are waiting on
+            task = asyncio.get_running_loop().create_task(self._afetch_feed(ical_url, feed, days_ahead))
+            task.add_done_callback(lambda done: self._finish_task(ical_url, pending, done))
+        waiter = asyncio.wrap_future(pending)
+        try:
+            feed, source, http_status = await asyncio.shield(waiter)
+        except asyncio.CancelledError:
+            # Nobody awaits the outcome any more; retrieve it so a failure is not reported as unhandled
+            waiter.add_done_callback(lambda done: done.cancelled() or done.exception())
+            raise
+        return FeedLoad(await self._acurrent_index(feed, days_ahead), source, http_status)
+
+    def in_flight(self, ical_url: str) -> bool:
+        """Check whether a fetch of this feed is already running."""
+        with self._inflight_lock:
+            return ical_url in self._inflight
+
+    def _join_fetch(self, ical_url: str) -> Tuple[Future, bool]:
+        """
+        Join the running fetch of a feed, or register a new one.
+
+        Returns:
+            Tuple of (future resolving to (feed, source, http_status), True if the caller must run the fetch)
+        """
+        with self._inflight_lock:
+            pending = self._inflight.get(ical_url)
+            if pending is not None:
+                return pending, False
+            pending = Future()
+            self._inflight[ical_url] = pending
+            return pending, True
+
+    def _finish_fetch(
+        self,
+        ical_url: str,
+        pending: Future,
+        result: Optional[_Fetched] = None,
+        error: Optional[BaseException] = None
+    ) -> None:
+        with self._inflight_lock:
+            self._inflight.pop(ical_url, None)
+        if error is not None:
+            pending.set_exception(error)
+        else:
+            pending.set_result(result)
+
+    def _finish_task(self, ical_url: str, pending: Future, task: asyncio.Task) -> None:
+        if task.cancelled():
+            self._finish_fetch(ical_url, pending, error=asyncio.CancelledError())
+        elif task.exception() is not None:
+            self._finish_fetch(ical_url, pending, error=task.exception())
+        else:
+            self._finish_fetch(ical_url, pending, result=task.result())
+
+    def _fetch_feed(self, ical_url: str, feed: Optional[CachedFeed], days_ahead: int) -> _Fetched:
+        """
+        Download (or revalidate) a feed and cache it.
+
+        Returns:
+            (cached feed, source, http_status): the feed is unchanged, newly indexed,
+            or stale if the feed is unreachable (see FeedLoad)
+        """
+        try:
+            download = self._download(ical_url, feed)
+        except httpx.HTTPError:
+            if feed is None:
+                raise
+            logger.warning("iCal fetch failed, serving cached timetable")
+            return feed, "stale", None
+
+        status_code = download.response.status_code
+        unchanged = self.feed_cache.revalidate(feed, download.response, download.body_hash)
+        if unchanged is not None:
+            return unchanged, "not_modified" if status_code == 304 else "unchanged", status_code
+
+        if status_code != 200:
+            raise TimetableFetchError(status_code)
+
+        index = self._build_index(download.components, days_ahead, download.parse_errors)
+        return self._store(ical_url, download, index), "downloaded", status_code
+
+    async def _afetch_feed(self, ical_url: str, feed: Optional[CachedFeed], days_ahead: int) -> _Fetched:
+        """Async counterpart of _fetch_feed."""
+        try:
+            download = await self._adownload(ical_url, feed)
+        except httpx.HTTPError:
+            if feed is None:
+                raise
+            logger.warning("iCal fetch failed, serving cached timetable")
+            return feed, "stale", None
+
+        status_code = download.response.status_code
+        unchanged = self.feed_cache.revalidate(feed, download.response, download.body_hash)
+        if unchanged is not None:
+            return unchanged, "not_modified" if status_code == 304 else "unchanged", status_code
+
+        if status_code != 200:
+            raise TimetableFetchError(status_code)
+
+        # Expansion is CPU-bound, keep it off the event loop
+        loop = asyncio.get_running_loop()
+        index = await loop.run_in_executor(
+            get_tool_executor(), self._build_index, download.components, days_ahead, download.parse_errors
+        )
+        return self._store(ical_url, download, index), "downloaded", status_code
+
+    def _download(self, ical_url: str, feed: Optional[CachedFeed]) -> _FeedDownload:
+        """
+        Fetch a feed, parsing VEVENTs while the body streams in.
+
+        When a cached copy is being revalidated, the body is hashed before it
+        is parsed, so an unchanged feed is never parsed again. Falls back to a
+        full download and icalendar parse for feeds the streaming parser does
+        not support.
+        """
+        with self.http.stream(
+            "GET",
+            ical_url,
+            headers=self.feed_cache.conditional_headers(feed),
+            timeout=ICAL_FETCH_TIMEOUT
+        ) as response:
+            if response.status_code != 200:
+                return _FeedDownload(response)
+
+            if feed is not None:
+                content = response.read()
+                body_hash = content_hash(content)
+                if body_hash == feed.content_hash:
+                    return _FeedDownload(response, body_hash=body_hash, size_bytes=len(content))
+                return self._parse_body(response, content)
+
+            parser = VEventStreamParser()
+            components = []
+            try:
+                for chunk in response.iter_bytes(ICAL_STREAM_CHUNK_SIZE):
+                    components.extend(parser.feed(chunk))
+                components.extend(parser.close())
+                return _FeedDownload(response, components, parser.content_hash, parser.bytes_read, parser.errors)
+            except UnsupportedFeedError as unsupported:
+                logger.info(f"Falling back to full iCal parser: {unsupported}")
+
+        response = self.http.get(ical_url, timeout=ICAL_FETCH_TIMEOUT)
+        if response.status_code != 200:
+            return _FeedDownload(response)
+        return self._parse_full(response)
+
+    async def _adownload(self, ical_url: str, feed: Optional[CachedFeed]) -> _FeedDownload:
+        """Async counterpart of _download; parsing runs off the event loop."""
+        loop = asyncio.get_running_loop()
+        executor = get_tool_executor()
+
+        async with self.http.astream(
+            "GET",
+            ical_url,
+            headers=self.feed_cache.conditional_headers(feed),
+            timeout=ICAL_FETCH_TIMEOUT
+        ) as response:
+            if response.status_code != 200:
+                return _FeedDownload(response)
+
+            if feed is not None:
+                content = await response.aread()
+                body_hash = content_hash(content)
+                if body_hash == feed.content_hash:
+                    return _FeedDownload(response, body_hash=body_hash, size_bytes=len(content))
+                return await loop.run_in_executor(executor, self._parse_body, response, content)
+
+            parser = VEventStreamParser()
+            components = []
+            try:
+                async for chunk in response.aiter_bytes(ICAL_STREAM_CHUNK_SIZE):
+                    components.extend(await loop.run_in_executor(executor, parser.feed, chunk))
+                components.extend(parser.close())
+                return _FeedDownload(response, components, parser.content_hash, parser.bytes_read, parser.errors)
+            except UnsupportedFeedError as unsupported:
+                logger.info(f"Falling back to full iCal parser: {unsupported}")
+
+        response = await self.http.aget(ical_url, timeout=ICAL_FETCH_TIMEOUT)
+        if response.status_code != 200:
+            return _FeedDownload(response)
+        return await loop.run_in_executor(executor, self._parse_full, response)
+
+    def _parse_body(self, response: httpx.Response, content: bytes) -> _FeedDownload:
+        """Parse a feed body that was read in full."""
+        try:
+            components, parser = parse_vevents(content, ICAL_STREAM_CHUNK_SIZE)
+            return _FeedDownload(response, components, parser.content_hash, parser.bytes_read, parser.errors)
+        except UnsupportedFeedError as unsupported:
+            logger.info(f"Falling back to full iCal parser: {unsupported}")
+            return self._parse_full(response)
+
+    def _parse_full(self, response: httpx.Response) -> _FeedDownload:
+        """Parse a fully downloaded feed with icalendar."""
+        cal = Calendar.from_ical(response.content)
+        return _FeedDownload(
+            response,
+            cal.walk("VEVENT"),
+            content_hash(response.content),
+            len(response.content)
+        )
+
+    def _store(self, ical_url: str, download: _FeedDownload, index: EventIndex) -> CachedFeed:
+        """Cache a downloaded feed and its index."""
+        logger.info(f"Successfully fetched iCal data ({download.size_bytes} bytes)")
+        return self.feed_cache.store(
+            ical_url,
+            download.response,
+            download.components,
+            download.body_hash,
+            download.size_bytes,
+            index
+        )
+
+    def _current_index(self, feed: CachedFeed, days_ahead: int) -> EventIndex:
+        """Return the feed's index, re-expanding the cached components if its window has rolled past."""
+        now = datetime.now(self.tz)
+        if not feed.index.covers(now, now + timedelta(days=days_ahead)):
+            logger.info("Recurrence window expired, re-expanding cached feed")
+            feed.index = self._build_index(feed.components, days_ahead)
+        return feed.index
+
+    async def _acurrent_index(self, feed: CachedFeed, days_ahead: int) -> EventIndex:
+        """Async counterpart of _current_index; re-expansion runs off the event loop."""
+        now = datetime.now(self.tz)
+        if not feed.index.covers(now, now + timedelta(days=days_ahead)):
+            logger.info("Recurrence window expired, re-expanding cached feed")
+            loop = asyncio.get_running_loop()
+            feed.index = await loop.run_in_executor(
+                get_tool_executor(), self._build_index, feed.components, days_ahead
+            )
+        return feed.index
+
+    def _build_index(self, components: List[Any], days_ahead: int = 0, parse_errors: int = 0) -> EventIndex:
+        """
+        Expand parsed VEVENTs into a sorted index of occurrences.
+
+        Recurring events are expanded over the configured window around now
+        (widened to cover days_ahead); one-off events are all kept.
+
+        Args:
+            components: VEVENT components
+            days_ahead: Minimum number of days ahead the window must cover
+            parse_errors: Properties that already failed to parse
+
+        Returns:
+            Event index ordered by start time
+        """
+        now = datetime.now(self.tz)
+        window_start = now - timedelta(days=settings.timetable_window_past_days)
+        window_end = now + timedelta(days=max(settings.timetable_window_future_days, days_ahead + 1))
+
+        events, errors = expand_events(components, window_start, window_end, self.tz)
+        errors += parse_errors
+        index = EventIndex(
+            events, tz=self.tz, window_start=window_start, window_end=window_end, parse_errors=errors
+        )
+
+        logger.info(f"Indexed {len(index)} occurrences ({errors} events failed to parse)")
+        return index
+
+    def _filter_events(self, index: EventIndex, days_ahead: int) -> List[TimetableEvent]:
+        """
+        Select events starting within the next days_ahead days.
+
+        Args:
+            index: Parsed event index
+            days_ahead: Number of days ahead to include
+
+        Returns:
+            List of event records sorted by start time
+        """
+        now = datetime.now(self.tz)
+        upcoming = index.between(now, now + timedelta(days=days_ahead))
+
+        logger.info(f"Found {len(upcoming)} upcoming events out of {len(index)} total events")
+        return upcoming
+
+    async def aprefetch(self, ical_url: Optional[str] = None, **context: Any) -> None:
+        """
+        Load (or revalidate) a session's feed index ahead of the agent's first timetable call.
+
+        Skipped when the feed is still fresh or already being fetched (by the
+        session warmer or the agent's own call); a later call joins that fetch.
+
+        Args:
+            ical_url: iCal subscription URL
+        """
+        if not ical_url:
+            return
+        if self.in_flight(ical_url) or self.feed_cache.is_fresh(self.feed_cache.get(ical_url), count=False):
+            logger.debug("Timetable prefetch skipped: feed is fresh or already being fetched")
+            return
+        await self.aload_index(ical_url)
+
     def requires_auth(self) -> bool:
         """Timetable tool does not require authentication - only needs iCal URL."""
         return False
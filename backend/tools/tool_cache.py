@@ -0,0 +1,332 @@
+"""
+Result cache for tool executions.
+
+Results are keyed on the tool name plus canonicalised arguments and kept in a
+byte-bounded LRU memory tier, with an optional SQLite disk tier that survives
+restarts. Each tool has its own TTL policy; per-user tools are not cached.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from config.settings import settings
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+@dataclass
+class CachePolicy:
+    """Caching policy for one tool."""
+    ttl_seconds: int
+    enabled: bool = True
+
+
+def default_policies() -> Dict[str, CachePolicy]:
+    """Per-tool policies from settings. Tools not listed are not cached."""
+    return {
+        # Applied per query by the search tool itself
+        "search": CachePolicy(ttl_seconds=settings.tool_cache_ttl_search),
+        # Search plus several scrapes and excerpting; cached whole by the registry
+        "research": CachePolicy(ttl_seconds=settings.tool_cache_ttl_research),
+        # Social lookups use the stale-while-revalidate social result cache
+        "tiktok": CachePolicy(ttl_seconds=0, enabled=False),
+        "instagram": CachePolicy(ttl_seconds=0, enabled=False),
+        # Pages are kept in the scraper store, keyed by normalised URL
+        "scraper": CachePolicy(ttl_seconds=0, enabled=False),
+        # Results depend on the user's own iCal feed
+        "timetable": CachePolicy(ttl_seconds=0, enabled=False),
+    }
+
+
+def _canonicalise(value: Any) -> Any:
+    """Normalise argument values so equivalent calls share a key."""
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, dict):
+        return {str(k): _canonicalise(v) for k, v in sorted(value.items()) if v is not None}
+    if isinstance(value, (list, tuple)):
+        return [_canonicalise(v) for v in value]
+    return value
+
+
+def cache_key(tool_name: str, kwargs: Dict[str, Any]) -> str:
+    """
+    Compute the cache key for a tool call.
+
+    Args:
+        tool_name: Tool name
+        kwargs: Tool arguments
+
+    Returns:
+        Key of the form "<tool>:<hash of canonical arguments>"
+    """
+    canonical = json.dumps(_canonicalise(kwargs), sort_keys=True, default=str, separators=(",", ":"))
+    digest = hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:32]
+    return f"{tool_name}:{digest}"
+
+
+def is_cacheable_result(result: Any) -> bool:
+    """
+    Tools report failures as None or empty results, which must not be cached.
+
+    Neither are research results that found nothing or left pages unread,
+    so a page that failed to scrape is tried again on the next call.
+    """
+    if isinstance(result, dict) and "sources" in result:
+        return bool(result["sources"]) and not result.get("unread")
+    return result is not None and result != [] and result != ""
+
+
+class _DiskTier:
+    """SQLite-backed second tier storing pickled results."""
+
+    def __init__(self, db_path: str):
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS tool_cache ("
+                "key TEXT PRIMARY KEY, tool TEXT NOT NULL, expires_at REAL NOT NULL, value BLOB NOT NULL)"
+            )
+            self._conn.commit()
+
+    def get(self, key: str) -> Optional[Tuple[bytes, float]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM tool_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] <= time.time():
+                self._conn.execute("DELETE FROM tool_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            return row[0], row[1]
+
+    def put(self, key: str, tool_name: str, blob: bytes, expires_at: float) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO tool_cache (key, tool, expires_at, value) VALUES (?, ?, ?, ?)",
+                (key, tool_name, expires_at, blob)
+            )
+            self._conn.commit()
+
+    def purge(self, tool_name: Optional[str] = None) -> int:
+        with self._lock:
+            if tool_name:
+                cursor = self._conn.execute("DELETE FROM tool_cache WHERE tool = ?", (tool_name,))
+            else:
+                cursor = self._conn.execute("DELETE FROM tool_cache")
+            self._conn.commit()
+            return cursor.rowcount
+
+    def delete_expired(self) -> int:
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM tool_cache WHERE expires_at <= ?", (time.time(),))
+            self._conn.commit()
+            return cursor.rowcount
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM tool_cache").fetchone()[0]
+
+
+@dataclass
+class _MemoryEntry:
+    tool_name: str
+    blob: bytes
+    expires_at: float
+
+
+class ToolResultCache:
+    """Two-tier (memory LRU + optional disk) cache of tool results."""
+
+    def __init__(
+        self,
+        policies: Dict[str, CachePolicy],
+        max_memory_bytes: int = 50 * 1024 * 1024,
+        disk_path: Optional[str] = None
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            policies: Per-tool cache policies; tools without a policy are not cached
+            max_memory_bytes: Upper bound on the pickled size of memory-tier entries
+            disk_path: SQLite file for the disk tier (None disables it)
+        """
+        self.policies = policies
+        self.max_memory_bytes = max_memory_bytes
+        self._memory: "OrderedDict[str, _MemoryEntry]" = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._disk = _DiskTier(disk_path) if disk_path else None
+
+    def is_cacheable(self, tool_name: str) -> bool:
+        """Check whether results of this tool are cached."""
+        policy = self.policies.get(tool_name)
+        return bool(policy and policy.enabled and policy.ttl_seconds > 0)
+
+    def get(self, tool_name: str, kwargs: Dict[str, Any]) -> Tuple[bool, Any]:
+        """
+        Look up a cached result.
+
+        Args:
+            tool_name: Tool name
+            kwargs: Tool arguments
+
+        Returns:
+            (hit, result) tuple
+        """
+        key = cache_key(tool_name, kwargs)
+        now = time.time()
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and entry.expires_at <= now:
+                self._evict(key)
+                entry = None
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self._count(tool_name, "memory_hits")
+                blob = entry.blob
+
+        if entry is not None:
+            return True, pickle.loads(blob)
+
+        if self._disk is not None:
+            stored = self._disk.get(key)
+            if stored is not None:
+                blob, expires_at = stored
+                with self._lock:
+                    self._store_memory(key, tool_name, blob, expires_at)
+                    self._count(tool_name, "disk_hits")
+                return True, pickle.loads(blob)
+
+        with self._lock:
+            self._count(tool_name, "misses")
+        return False, None
+
+    def put(self, tool_name: str, kwargs: Dict[str, Any], result: Any) -> bool:
+        """
+        Store a result according to the tool's policy.
+
+        Returns:
+            True if the result was cached
+        """
+        if not self.is_cacheable(tool_name) or not is_cacheable_result(result):
+            return False
+
+        try:
+            blob = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            logger.warning(f"Tool result for {tool_name} is not cacheable: {str(e)}")
+            return False
+
+        key = cache_key(tool_name, kwargs)
+        expires_at = time.time() + self.policies[tool_name].ttl_seconds
+
+        with self._lock:
+            self._store_memory(key, tool_name, blob, expires_at)
+            self._count(tool_name, "stores")
+
+        if self._disk is not None:
+            try:
+                self._disk.put(key, tool_name, blob, expires_at)
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to write tool cache entry to disk: {str(e)}")
+
+        return True
+
+    def purge(self, tool_name: Optional[str] = None) -> int:
+        """
+        Remove cached results, for one tool or all tools.
+
+        Returns:
+            Number of memory-tier entries removed
+        """
+        with self._lock:
+            keys = [
+                key for key, entry in self._memory.items()
+                if tool_name is None or entry.tool_name == tool_name
+            ]
+            for key in keys:
+                self._evict(key)
+        if self._disk is not None:
+            self._disk.purge(tool_name)
+        logger.info(f"Purged {len(keys)} cached tool results ({tool_name or 'all tools'})")
+        return len(keys)
+
+    def stats(self) -> Dict[str, Any]:
+        """Tier sizes and hit rates per tool."""
+        with self._lock:
+            per_tool = {name: dict(counts) for name, counts in self._stats.items()}
+            memory_entries = len(self._memory)
+            memory_bytes = self._memory_bytes
+
+        for counts in per_tool.values():
+            hits = counts["memory_hits"] + counts["disk_hits"]
+            lookups = hits + counts["misses"]
+            counts["hit_rate"] = round(hits / lookups, 3) if lookups else 0.0
+
+        return {
+            "enabled": settings.enable_tool_cache,
+            "memory_entries": memory_entries,
+            "memory_bytes": memory_bytes,
+            "max_memory_bytes": self.max_memory_bytes,
+            "disk_enabled": self._disk is not None,
+            "disk_entries": self._disk.count() if self._disk is not None else 0,
+            "policies": {
+                name: {"ttl_seconds": policy.ttl_seconds, "enabled": policy.enabled}
+                for name, policy in self.policies.items()
+            },
+            "tools": per_tool
+        }
+
+    # Internals (call with self._lock held)
+
+    def _store_memory(self, key: str, tool_name: str, blob: bytes, expires_at: float) -> None:
+        if len(blob) > self.max_memory_bytes:
+            return
+        if key in self._memory:
+            self._evict(key)
+        self._memory[key] = _MemoryEntry(tool_name, blob, expires_at)
+        self._memory_bytes += len(blob)
+        while self._memory_bytes > self.max_memory_bytes:
+            oldest = next(iter(self._memory))
+            self._evict(oldest)
+
+    def _evict(self, key: str) -> None:
+        entry = self._memory.pop(key)
+        self._memory_bytes -= len(entry.blob)
+
+    def _count(self, tool_name: str, key: str) -> None:
+        counts = self._stats.setdefault(tool_name, {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "stores": 0
+        })
+        counts[key] += 1
+
+
+# Global tool result cache instance
+tool_result_cache = ToolResultCache(
+    policies=default_policies(),
+    max_memory_bytes=settings.tool_cache_max_memory_mb * 1024 * 1024,
+    disk_path=settings.tool_cache_disk_path or None
+)
@@ -3,13 +3,32 @@ Tool definitions with JSON schemas for ReAct agent.
 These schemas are used by the LLM to understand available tools and their parameters.
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterable, List, Optional
 
 
 TOOL_DEFINITIONS: List[Dict[str, Any]] = [
+    {
+        "name": "kcl_index",
+        "description": "Search the local index of KCL web pages (policies, services, study and student life pages). Returns ranked passages with source URLs in milliseconds. Try this first for general KCL questions; fall back to search if the passages don't answer the question.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "Keywords or the question to look up."
+                },
+                "num_results": {
+                    "type": "integer",
+                    "description": "Number of passages to return (1-10).",
+                    "default": 5
+                }
+            },
+            "required": ["query"]
+        }
+    },
     {
         "name": "search",
-        "description": "Search the web for information about King's College London. Use this when you need to find current information, news, policies, or general facts about KCL.",
+        "description": "Search the web for information about King's College London. Use this when you need to find current information, news, policies, or general facts about KCL. Give either a single query or a list of queries to search several things at once.",
         "parameters": {
             "type": "object",
             "properties": {
@@ -17,12 +36,36 @@ TOOL_DEFINITIONS: List[Dict[str, Any]] = [
                     "type": "string",
                     "description": "The search query. Will automatically be enhanced with 'King's College London' context."
                 },
+                "queries": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Up to 5 queries run concurrently in one step, e.g. ['MSc Computer Science fees', 'MRes Computer Science fees']. Use instead of query when comparing things or covering several aspects of a question. Results are merged and de-duplicated."
+                },
                 "num_results": {
                     "type": "integer",
-                    "description": "Number of search results to return (1-10).",
+                    "description": "Number of search results to return per query (1-10).",
                     "default": 5
                 }
             },
+            "required": []
+        }
+    },
+    {
+        "name": "research",
+        "description": "Search the web and read the top results in one step. Returns the most relevant excerpts of each page with its URL. Use this instead of search followed by scraper when you need the actual content of pages, not just links.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "The question or search query. Will automatically be enhanced with 'King's College London' context."
+                },
+                "top_k": {
+                    "type": "integer",
+                    "description": "Number of top results to read (1-5).",
+                    "default": 3
+                }
+            },
             "required": ["query"]
         }
     },
@@ -42,14 +85,40 @@ TOOL_DEFINITIONS: List[Dict[str, Any]] = [
     },
     {
         "name": "timetable",
-        "description": "Access the student's KCL timetable from their iCal subscription. Use this when the user asks about their schedule, classes, lectures, or upcoming events. Requires the user to have set up their iCal URL.",
+        "description": "Access the student's KCL timetable from their iCal subscription. Use this when the user asks about their schedule, classes, lectures, or upcoming events. Prefer the computed actions for 'what's next', 'when am I free' and 'how busy am I' questions instead of listing events. Requires the user to have set up their iCal URL.",
         "parameters": {
             "type": "object",
             "properties": {
+                "action": {
+                    "type": "string",
+                    "enum": ["events", "next_event", "free_slots", "daily_load"],
+                    "description": "'events': list upcoming events. 'next_event': the class in progress and the next one. 'free_slots': free/busy periods on one day. 'daily_load': events and hours per day.",
+                    "default": "events"
+                },
                 "days_ahead": {
                     "type": "integer",
-                    "description": "Number of days ahead to fetch events (1-30).",
+                    "description": "Number of days ahead to fetch events, or days reported by daily_load (1-30).",
                     "default": 7
+                },
+                "date": {
+                    "type": "string",
+                    "description": "Day for free_slots, or first day for daily_load: YYYY-MM-DD, 'today', 'tomorrow' or a weekday name like 'thursday'.",
+                    "default": "today"
+                },
+                "day_start": {
+                    "type": "string",
+                    "description": "Start of the free_slots window (HH:MM).",
+                    "default": "09:00"
+                },
+                "day_end": {
+                    "type": "string",
+                    "description": "End of the free_slots window (HH:MM).",
+                    "default": "18:00"
+                },
+                "min_minutes": {
+                    "type": "integer",
+                    "description": "Shortest gap reported as free by free_slots.",
+                    "default": 30
                 }
             },
             "required": []
@@ -128,15 +197,28 @@ def get_tool_definitions() -> List[Dict[str, Any]]:
     return TOOL_DEFINITIONS
 
 
-def get_tool_definitions_text() -> str:
+def get_tool_definitions_text(
+    cost_hints: Optional[Dict[str, str]] = None,
+    tool_names: Optional[Iterable[str]] = None
+) -> str:
     """
     Get tool definitions formatted as text for inclusion in prompts.
+
+    Args:
+        cost_hints: Optional coarse latency/cost per tool name (see ToolRegistry.cost_hints)
+        tool_names: Only include these tools (default: all)
     """
     lines = ["Available Tools:", ""]
+    cost_hints = cost_hints or {}
+    included = set(tool_names) if tool_names is not None else None
 
     for tool in TOOL_DEFINITIONS:
+        if included is not None and tool["name"] not in included:
+            continue
         lines.append(f"**{tool['name']}**")
         lines.append(f"Description: {tool['description']}")
+        if tool["name"] in cost_hints:
+            lines.append(f"Cost: {cost_hints[tool['name']]}")
         lines.append("Parameters:")
 
         props = tool["parameters"].get("properties", {})
@@ -1,44 +1,165 @@
 """
 Central tool registry and factory.
+
+Tools are registered as specs (name, description, factory). A tool's module,
+its SDK and its clients are only imported and built the first time the tool
+is used, so cold start does not pay for tools a worker never calls.
 """
 
-from typing import List, Dict
+import asyncio
+import contextvars
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+from typing import Any, Callable, List, Dict, Optional, Tuple
 from tools.base import BaseTool
-from tools.search_tool import SearchTool
-from tools.scraper_tool import ScraperTool
-from tools.timetable_tool import TimetableTool
-from tools.tiktok_tool import TikTokTool
-from tools.instagram_tool import InstagramTool
+from tools.circuit_breaker import (
+    CALLER_ERRORS, OPEN, BreakerPermit, CircuitBreaker, ToolBudget, ToolUnavailableError,
+    default_budget, default_budgets
+)
+from tools.tool_cache import ToolResultCache, tool_result_cache
+from tools.tool_stats import ToolStatsTracker, latency_tier
+from services.http_client import http_client
+from config.settings import settings
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
 
+@dataclass(frozen=True)
+class ToolSpec:
+    """Metadata of a registered tool, known before the tool is built."""
+    name: str
+    description: str
+    factory: Callable[[], BaseTool]
+    requires_auth: bool = False
+    # Typical latency until calls have been observed
+    latency_ms: float = 1000
+    # Upstream API cost of one call in USD (0 for local or free APIs)
+    cost_usd: float = 0.0
+    # Cheaper tools that can answer the same kind of request, best first
+    equivalents: Tuple[str, ...] = ()
+    # Context keys (e.g. "ical_url") that let the tool be warmed before the model asks for it
+    prefetch_with: Tuple[str, ...] = ()
+    # Offered to the model only while this returns True (None: always offered)
+    advertised: Optional[Callable[[], bool]] = None
+
+
 class ToolRegistry:
     """Registry for all available tools."""
 
-    def __init__(self):
-        """Initialize tool registry."""
+    def __init__(self, cache: ToolResultCache = tool_result_cache):
+        """
+        Initialize tool registry.
+
+        Args:
+            cache: Result cache used by execute()/aexecute()
+        """
+        self._specs: Dict[str, ToolSpec] = {}
         self._tools: Dict[str, BaseTool] = {}
+        # Reentrant: building the research tool builds search and scraper
+        self._build_lock = threading.RLock()
+        self.cache = cache
+        self._budgets = default_budgets()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        # Sync calls run here so they can be abandoned at their budget. Kept apart from
+        # the shared tool pool, which sync tools use themselves.
+        self._budget_executor: Optional[ThreadPoolExecutor] = None
+        self.stats = ToolStatsTracker(alpha=settings.tool_stats_alpha, min_samples=settings.tool_stats_min_samples)
+        # One prefetch per tool and context; a repeat joins the one already running
+        self._prefetch_tasks: Dict[Tuple[str, Tuple[Tuple[str, Any], ...]], asyncio.Task] = {}
         self._register_tools()
 
     def _register_tools(self) -> None:
-        """Register all available tools."""
-        tools = [
-            SearchTool(),
-            ScraperTool(),
-            TimetableTool(),
-            TikTokTool(),
-            InstagramTool()
+        """Register all available tools (nothing is imported or built yet)."""
+        # Declared costs are list prices: SerpAPI ~$0.015/search, Firecrawl ~$0.001/page,
+        # Apify scrapers ~$0.02 per lookup at the default result counts
+        specs = [
+            ToolSpec(
+                "search", "Search the web for information about King's College London", self._build_search,
+                latency_ms=1500, cost_usd=0.015, equivalents=("kcl_index",)
+            ),
+            ToolSpec(
+                "scraper", "Scrape and extract content from web pages", self._build_scraper,
+                latency_ms=8000, cost_usd=0.001
+            ),
+            ToolSpec(
+                "research", "Search the web and read the top results in one step", self._build_research,
+                latency_ms=15000, cost_usd=0.018, equivalents=("kcl_index", "search")
+            ),
+            ToolSpec(
+                "timetable", "Access and parse KCL student timetable from iCal subscription", self._build_timetable,
+                latency_ms=300, prefetch_with=("ical_url",)
+            ),
+            ToolSpec(
+                "tiktok", "Search and scrape TikTok videos by hashtag, profile, or search query", self._build_tiktok,
+                latency_ms=60000, cost_usd=0.02
+            ),
+            ToolSpec(
+                "instagram", "Search and scrape Instagram posts by profile, hashtag, or search query",
+                self._build_instagram, latency_ms=60000, cost_usd=0.02
+            ),
+            ToolSpec(
+                "kcl_index", "Search locally indexed KCL web pages", self._build_kcl_index,
+                latency_ms=20, advertised=self._kcl_index_has_pages
+            ),
         ]
 
-        for tool in tools:
-            self._tools[tool.get_name()] = tool
-            logger.info(f"Registered tool: {tool.get_name()}")
+        for spec in specs:
+            self._specs[spec.name] = spec
+            self._breakers[spec.name] = self._new_breaker(spec.name)
+            logger.info(f"Registered tool: {spec.name}")
+
+    # Factories: each imports its tool module on first use
+
+    def _build_search(self) -> BaseTool:
+        from tools.search_tool import SearchTool
+        return SearchTool(http=http_client, cache=self.cache)
+
+    def _build_scraper(self) -> BaseTool:
+        from tools.scraper_store import scraper_store
+        from tools.scraper_tool import ScraperTool
+        if settings.kcl_index_refresh_from_scraper:
+            from tools.kcl_index import kcl_index
+            # Pages scraped in production keep the local index fresh
+            scraper_store.add_listener(kcl_index.index_page)
+        return ScraperTool(http=http_client, store=scraper_store)
+
+    def _build_research(self) -> BaseTool:
+        from tools.research_tool import ResearchTool
+        # Shares the search and scraper instances (and their caches)
+        return ResearchTool(search=self.get_tool("search"), scraper=self.get_tool("scraper"))
+
+    def _build_timetable(self) -> BaseTool:
+        from tools.timetable_tool import TimetableTool
+        return TimetableTool(http=http_client)
+
+    def _build_tiktok(self) -> BaseTool:
+        from tools.tiktok_tool import TikTokTool
+        return TikTokTool(http=http_client)
+
+    def _build_instagram(self) -> BaseTool:
+        from tools.instagram_tool import InstagramTool
+        return InstagramTool(http=http_client)
+
+    def _build_kcl_index(self) -> BaseTool:
+        from tools.kcl_index import kcl_index
+        from tools.kcl_index_tool import KCLIndexTool
+        return KCLIndexTool(index=kcl_index)
+
+    @staticmethod
+    def _kcl_index_has_pages() -> bool:
+        # A fresh deployment has no index file; don't create one just to find it empty
+        if not os.path.exists(settings.kcl_index_path):
+            return False
+        from tools.kcl_index import kcl_index
+        return kcl_index.has_pages()
 
     def get_tool(self, name: str) -> BaseTool:
         """
-        Get a tool by name.
+        Get a tool by name, building it on first use.
 
         Args:
             name: Tool name
@@ -49,18 +170,385 @@ class ToolRegistry:
         Raises:
             KeyError: If tool not found
         """
-        if name not in self._tools:
+        tool = self._tools.get(name)
+        if tool is not None:
+            return tool
+        if name not in self._specs:
             raise KeyError(f"Tool '{name}' not found in registry")
-        return self._tools[name]
+
+        with self._build_lock:
+            if name not in self._tools:
+                started = time.perf_counter()
+                self._tools[name] = self._specs[name].factory()
+                logger.info(f"Loaded tool {name} in {(time.perf_counter() - started) * 1000:.0f} ms")
+            return self._tools[name]
+
+    def get_spec(self, name: str) -> ToolSpec:
+        """
+        Get a tool's metadata without building it.
+
+        Args:
+            name: Tool name
+
+        Returns:
+            Tool spec
+
+        Raises:
+            KeyError: If tool not found
+        """
+        if name not in self._specs:
+            raise KeyError(f"Tool '{name}' not found in registry")
+        return self._specs[name]
+
+    def get_tool_names(self) -> List[str]:
+        """
+        Get the names of all registered tools without building them.
+
+        Returns:
+            Tool names in registration order
+        """
+        return list(self._specs)
+
+    def is_loaded(self, name: str) -> bool:
+        """Check whether a tool has been built yet."""
+        return name in self._tools
+
+    def is_advertised(self, name: str) -> bool:
+        """Check whether a tool should currently be offered to the model."""
+        spec = self._specs.get(name)
+        if spec is None:
+            return False
+        if spec.advertised is None:
+            return True
+        try:
+            return spec.advertised()
+        except Exception as e:
+            logger.warning(f"Could not check whether {name} is available: {str(e)}")
+            return False
+
+    def get_advertised_tool_names(self) -> List[str]:
+        """
+        Get the names of the tools to offer to the model.
+
+        Returns:
+            Tool names in registration order, without tools that have nothing to offer yet
+        """
+        return [name for name in self._specs if self.is_advertised(name)]
+
+    def execute(self, name: str, **kwargs) -> Any:
+        """
+        Execute a tool within its time budget, behind its circuit breaker.
+
+        Repeated calls are served from the result cache. Every call is
+        recorded in the tool's latency and success statistics.
+
+        Args:
+            name: Tool name
+            **kwargs: Tool arguments
+
+        Returns:
+            Tool execution result
+
+        Raises:
+            KeyError: If tool not found
+            ToolUnavailableError: If the tool's circuit is open
+            TimeoutError: If the call overran its budget
+        """
+        self.get_tool(name)
+        breaker, permit = self._acquire(name)
+        started = time.monotonic()
+        success, caller_error = False, False
+        try:
+            result = self._call_within_budget(name, kwargs) if breaker else self._call(name, kwargs)
+            success = result is not None
+            return result
+        except CALLER_ERRORS:
+            caller_error = True
+            raise
+        finally:
+            self._record(name, breaker, permit, success, time.monotonic() - started, caller_error)
+
+    async def aexecute(self, name: str, **kwargs) -> Any:
+        """
+        Execute a tool asynchronously within its time budget, behind its circuit breaker.
+
+        Repeated calls are served from the result cache. A call that overruns its
+        budget is cancelled, which also aborts any Apify actor run it started.
+        Every call is recorded in the tool's latency and success statistics.
+
+        Args:
+            name: Tool name
+            **kwargs: Tool arguments
+
+        Returns:
+            Tool execution result
+
+        Raises:
+            KeyError: If tool not found
+            ToolUnavailableError: If the tool's circuit is open
+            TimeoutError: If the call overran its budget
+        """
+        self.get_tool(name)
+        breaker, permit = self._acquire(name)
+        started = time.monotonic()
+        success, caller_error = False, False
+        try:
+            if breaker:
+                budget = self.get_budget(name)
+                try:
+                    result = await asyncio.wait_for(self._acall(name, kwargs), timeout=budget.timeout_seconds)
+                except asyncio.TimeoutError:
+                    raise TimeoutError(f"Tool '{name}' did not finish within its {budget.timeout_seconds:.0f}s budget")
+            else:
+                result = await self._acall(name, kwargs)
+            success = result is not None
+            return result
+        except CALLER_ERRORS:
+            caller_error = True
+            raise
+        finally:
+            self._record(name, breaker, permit, success, time.monotonic() - started, caller_error)
+
+    def _acquire(self, name: str) -> Tuple[Optional[CircuitBreaker], Optional[BreakerPermit]]:
+        """
+        Pass a tool's circuit breaker.
+
+        Returns:
+            Tuple of (breaker, permit for this call); both None when breakers are disabled
+
+        Raises:
+            ToolUnavailableError: If the circuit is open; names a cheaper equivalent if one is available
+        """
+        if not settings.circuit_breaker_enabled:
+            return None, None
+        breaker = self._breakers[name]
+        try:
+            permit = breaker.acquire()
+        except ToolUnavailableError as e:
+            alternative = self.cheapest_equivalent(name)
+            if alternative:
+                raise ToolUnavailableError(f"{e} The {alternative} tool can answer similar requests.") from None
+            raise
+        return breaker, permit
+
+    def _call_within_budget(self, name: str, kwargs: Dict[str, Any]) -> Any:
+        """Run a sync call on the budget pool, giving up at the tool's timeout."""
+        budget = self.get_budget(name)
+        if self._budget_executor is None:
+            self._budget_executor = ThreadPoolExecutor(
+                max_workers=settings.tool_thread_pool_size,
+                thread_name_prefix="tool-budget"
+            )
+        # Copy the context so progress reporting reaches the caller's sink
+        future = self._budget_executor.submit(contextvars.copy_context().run, self._call, name, kwargs)
+        try:
+            return future.result(timeout=budget.timeout_seconds)
+        except FutureTimeoutError:
+            # The worker cannot be interrupted; its result is discarded when it finishes
+            future.cancel()
+            raise TimeoutError(f"Tool '{name}' did not finish within its {budget.timeout_seconds:.0f}s budget")
+
+    def _record(
+        self,
+        name: str,
+        breaker: Optional[CircuitBreaker],
+        permit: Optional[BreakerPermit],
+        success: bool,
+        duration_seconds: float,
+        caller_error: bool = False
+    ) -> None:
+        """Feed a call's outcome to the circuit breaker and the moving averages."""
+        if caller_error:
+            # Invalid arguments say nothing about the tool's health
+            if breaker:
+                breaker.release(permit)
+            return
+        if breaker:
+            breaker.record(permit, success, duration_seconds)
+        self.stats.record(name, duration_seconds * 1000, success)
+
+    def _call(self, name: str, kwargs: Dict[str, Any]) -> Any:
+        """Run a tool through the result cache."""
+        tool = self.get_tool(name)
+        if not self._use_cache(name):
+            return tool.execute(**kwargs)
+
+        hit, result = self.cache.get(name, kwargs)
+        if hit:
+            logger.info(f"Tool cache hit: {name}")
+            return result
+
+        result = tool.execute(**kwargs)
+        self.cache.put(name, kwargs, result)
+        return result
+
+    async def _acall(self, name: str, kwargs: Dict[str, Any]) -> Any:
+        """Async counterpart of _call."""
+        tool = self.get_tool(name)
+        if not self._use_cache(name):
+            return await tool.aexecute(**kwargs)
+
+        hit, result = self.cache.get(name, kwargs)
+        if hit:
+            logger.info(f"Tool cache hit: {name}")
+            return result
+
+        result = await tool.aexecute(**kwargs)
+        self.cache.put(name, kwargs, result)
+        return result
+
+    def get_budget(self, name: str) -> ToolBudget:
+        """
+        Get the time budget of a tool.
+
+        Args:
+            name: Tool name
+
+        Returns:
+            The tool's budget, or the default budget
+        """
+        return self._budgets.get(name) or default_budget()
+
+    def breaker_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Circuit breaker state of every tool.
+
+        Returns:
+            Breaker snapshot plus timeout budget, keyed by tool name
+        """
+        return {
+            name: {**breaker.snapshot(), "timeout_seconds": self.get_budget(name).timeout_seconds}
+            for name, breaker in self._breakers.items()
+        }
+
+    def get_profile(self, name: str) -> Dict[str, Any]:
+        """
+        Declared and observed cost/latency of a tool.
+
+        Args:
+            name: Tool name
+
+        Returns:
+            Expected latency (observed moving average once there are enough
+            calls, else declared), cost per call, availability and call stats
+        """
+        spec = self.get_spec(name)
+        return {
+            "latency_ms": round(self.stats.expected_latency_ms(name, spec.latency_ms), 1),
+            "declared_latency_ms": spec.latency_ms,
+            "cost_usd": spec.cost_usd,
+            "available": self._breakers[name].state != OPEN,
+            "observed": self.stats.get(name),
+        }
+
+    def tool_profiles(self) -> Dict[str, Dict[str, Any]]:
+        """Profiles of all registered tools, keyed by name."""
+        return {name: self.get_profile(name) for name in self._specs}
+
+    def cost_hints(self) -> Dict[str, str]:
+        """
+        Coarse latency and cost of each tool for the model's tool definitions.
+
+        Returns:
+            Hints such as "usually under 1 s, free", keyed by tool name
+        """
+        hints = {}
+        for name, spec in self._specs.items():
+            latency = latency_tier(self.stats.expected_latency_ms(name, spec.latency_ms))
+            hints[name] = f"usually {latency}, {'paid per call' if spec.cost_usd else 'free'}"
+        return hints
+
+    def cheapest_equivalent(self, name: str) -> Optional[str]:
+        """
+        Cheapest available tool that can stand in for another.
+
+        Args:
+            name: Tool name
+
+        Returns:
+            Equivalent tool with a closed (or probing) circuit, ordered by cost
+            then expected latency; None if there is none
+        """
+        spec = self._specs.get(name)
+        candidates = [
+            other for other in (spec.equivalents if spec else ())
+            if other in self._specs and self._breakers[other].state != OPEN and self.is_advertised(other)
+        ]
+        if not candidates:
+            return None
+        return min(
+            candidates,
+            key=lambda other: (
+                self._specs[other].cost_usd,
+                self.stats.expected_latency_ms(other, self._specs[other].latency_ms)
+            )
+        )
+
+    def start_prefetch(self, **context: Any) -> List[str]:
+        """
+        Warm free tools whose context is known before the model asks for them.
+
+        Runs on the current event loop while the agent is still reasoning, so a
+        later call is served warm (e.g. the timetable feed is already revalidated).
+
+        Args:
+            **context: Request context such as ical_url
+
+        Returns:
+            Names of the tools being prefetched
+        """
+        if not settings.tool_prefetch_enabled:
+            return []
+        loop = asyncio.get_running_loop()
+        started = []
+        for name, spec in self._specs.items():
+            if not spec.prefetch_with or spec.cost_usd or self._breakers[name].state == OPEN:
+                continue
+            if not all(context.get(key) for key in spec.prefetch_with):
+                continue
+            kwargs = {key: context[key] for key in spec.prefetch_with}
+            key = (name, tuple(sorted(kwargs.items())))
+            if key not in self._prefetch_tasks:
+                task = loop.create_task(self._aprefetch(name, kwargs))
+                # Keep a reference so the task is not garbage collected mid-run
+                self._prefetch_tasks[key] = task
+                task.add_done_callback(lambda _, key=key: self._prefetch_tasks.pop(key, None))
+            started.append(name)
+        return started
+
+    async def _aprefetch(self, name: str, kwargs: Dict[str, Any]) -> None:
+        try:
+            await self.get_tool(name).aprefetch(**kwargs)
+        except Exception as e:
+            logger.info(f"Prefetch of {name} failed: {str(e)}")
+
+    def _new_breaker(self, name: str) -> CircuitBreaker:
+        """Create a tool's circuit breaker from settings."""
+        return CircuitBreaker(
+            name,
+            slow_call_seconds=self.get_budget(name).slow_call_seconds,
+            window_size=settings.circuit_breaker_window,
+            min_calls=settings.circuit_breaker_min_calls,
+            failure_rate_threshold=settings.circuit_breaker_failure_rate,
+            slow_call_rate_threshold=settings.circuit_breaker_slow_call_rate,
+            open_seconds=settings.circuit_breaker_open_seconds,
+            half_open_probes=settings.circuit_breaker_half_open_probes
+        )
+
+    def _use_cache(self, name: str) -> bool:
+        """Check whether calls to this tool go through the result cache (research, in production)."""
+        if self.get_tool(name).manages_cache:
+            return False
+        return settings.enable_tool_cache and self.cache.is_cacheable(name)
 
     def get_all_tools(self) -> List[BaseTool]:
         """
-        Get all registered tools.
+        Get all registered tools, building any not loaded yet.
 
         Returns:
             List of all tools
         """
-        return list(self._tools.values())
+        return [self.get_tool(name) for name in self._specs]
 
     def get_public_tools(self) -> List[BaseTool]:
         """
@@ -69,7 +557,7 @@ class ToolRegistry:
         Returns:
             List of public tools
         """
-        return [tool for tool in self._tools.values() if not tool.requires_auth()]
+        return [self.get_tool(spec.name) for spec in self._specs.values() if not spec.requires_auth]
 
     def get_authenticated_tools(self) -> List[BaseTool]:
         """
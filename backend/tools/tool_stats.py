@@ -0,0 +1,118 @@
+"""
+Observed latency and reliability of tool calls.
+
+The registry records every call. Each tool keeps exponentially weighted
+moving averages of its latency and success rate, so recent behaviour (a slow
+Firecrawl afternoon, a warm cache) outweighs old samples without keeping a
+history. Until a tool has a few samples its declared latency is used instead.
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Upper bounds (ms) and labels for the coarse latency shown to the model
+LATENCY_TIERS = [
+    (1000, "under 1 s"),
+    (5000, "1-5 s"),
+    (20000, "5-20 s"),
+    (60000, "20-60 s"),
+]
+
+
+def latency_tier(latency_ms: float) -> str:
+    """
+    Coarse latency label.
+
+    Labels change far less often than the averages behind them, which keeps
+    prompts that include them stable.
+
+    Args:
+        latency_ms: Latency in milliseconds
+
+    Returns:
+        Label such as "1-5 s"
+    """
+    for bound, label in LATENCY_TIERS:
+        if latency_ms < bound:
+            return label
+    return "over 1 min"
+
+
+@dataclass
+class _Averages:
+    latency_ms: float = 0.0
+    success_rate: float = 1.0
+    calls: int = 0
+    failures: int = 0
+
+
+class ToolStatsTracker:
+    """Per-tool moving averages of latency and success."""
+
+    def __init__(self, alpha: float = 0.2, min_samples: int = 3):
+        """
+        Initialize the tracker.
+
+        Args:
+            alpha: Weight of the newest sample in the moving averages
+            min_samples: Calls needed before observed latency replaces the declared one
+        """
+        self.alpha = alpha
+        self.min_samples = min_samples
+        self._stats: Dict[str, _Averages] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, duration_ms: float, success: bool) -> None:
+        """
+        Record one call.
+
+        Args:
+            name: Tool name
+            duration_ms: Wall-clock duration of the call
+            success: False for exceptions, timeouts and None results
+        """
+        with self._lock:
+            stats = self._stats.setdefault(name, _Averages())
+            if stats.calls == 0:
+                stats.latency_ms = duration_ms
+                stats.success_rate = float(success)
+            else:
+                stats.latency_ms += self.alpha * (duration_ms - stats.latency_ms)
+                stats.success_rate += self.alpha * (float(success) - stats.success_rate)
+            stats.calls += 1
+            stats.failures += int(not success)
+
+    def expected_latency_ms(self, name: str, declared_ms: float) -> float:
+        """
+        Latency to plan with.
+
+        Args:
+            name: Tool name
+            declared_ms: Declared latency, used until enough calls were observed
+
+        Returns:
+            Observed moving average, or the declared latency
+        """
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None or stats.calls < self.min_samples:
+                return declared_ms
+            return stats.latency_ms
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        """Moving averages and counters of one tool (None before its first call)."""
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                return None
+            return {
+                "latency_ms": round(stats.latency_ms, 1),
+                "success_rate": round(stats.success_rate, 3),
+                "calls": stats.calls,
+                "failures": stats.failures,
+            }
@@ -3,7 +3,7 @@ Response formatting utilities.
 """
 
 from typing import List, Dict, Any
-from datetime import datetime
+from tools.records import TikTokVideo, TimetableEvent
 
 
 def format_search_results(results: List[Dict[str, Any]]) -> str:
@@ -31,12 +31,12 @@ def format_search_results(results: List[Dict[str, Any]]) -> str:
     return formatted
 
 
-def format_timetable_events(events: List[Dict[str, Any]]) -> str:
+def format_timetable_events(events: List[TimetableEvent]) -> str:
     """
     Format timetable events into readable markdown.
 
     Args:
-        events: List of calendar event dictionaries
+        events: List of timetable event records
 
     Returns:
         Formatted markdown string
@@ -46,33 +46,22 @@ def format_timetable_events(events: List[Dict[str, Any]]) -> str:
 
     formatted = "### Your Timetable\n\n"
     for event in events:
-        summary = event.get("summary", "Untitled Event")
-        start = event.get("start")
-        location = event.get("location", "Location TBD")
-        description = event.get("description", "")
-
-        # Format datetime
-        if isinstance(start, datetime):
-            start_str = start.strftime("%A, %B %d at %I:%M %p")
-        else:
-            start_str = str(start)
-
-        formatted += f"**{summary}**\n"
-        formatted += f"📅 {start_str}\n"
-        formatted += f"📍 {location}\n"
-        if description:
-            formatted += f"ℹ️ {description}\n"
+        formatted += f"**{event.summary or 'Untitled Event'}**\n"
+        formatted += f"📅 {event.start.strftime('%A, %B %d at %I:%M %p')}\n"
+        formatted += f"📍 {event.location or 'Location TBD'}\n"
+        if event.description:
+            formatted += f"ℹ️ {event.description}\n"
         formatted += "\n"
 
     return formatted
 
 
-def format_tiktok_results(results: List[Dict[str, Any]]) -> str:
+def format_tiktok_results(results: List[TikTokVideo]) -> str:
     """
     Format TikTok video results into readable markdown.
 
     Args:
-        results: List of TikTok video dictionaries
+        results: List of TikTok video records
 
     Returns:
         Formatted markdown string
@@ -82,40 +71,30 @@ def format_tiktok_results(results: List[Dict[str, Any]]) -> str:
 
     formatted = "### TikTok Videos\n\n"
     for idx, video in enumerate(results, 1):
-        author = video.get("author", {})
-        username = author.get("username", "unknown")
-        verified = " ✓" if author.get("verified", False) else ""
+        verified = " ✓" if video.verified else ""
 
-        description = video.get("description", "No description")
+        description = video.description or "No description"
         # Truncate description to 200 chars
         if len(description) > 200:
             description = description[:197] + "..."
 
-        stats = video.get("stats", {})
-        views = _format_number(stats.get("views", 0))
-        likes = _format_number(stats.get("likes", 0))
-        comments = _format_number(stats.get("comments", 0))
-        shares = _format_number(stats.get("shares", 0))
+        views = _format_number(video.views)
+        likes = _format_number(video.likes)
+        comments = _format_number(video.comments)
+        shares = _format_number(video.shares)
 
-        hashtags = video.get("hashtags", [])
-        hashtags_str = " ".join([f"#{tag}" for tag in hashtags[:5]]) if hashtags else ""
+        hashtags_str = " ".join(f"#{tag}" for tag in video.hashtags[:5])
+        music_str = f"🎵 {video.music_title} - {video.music_author}" if video.music_title else ""
 
-        music = video.get("music", {})
-        music_title = music.get("title", "")
-        music_author = music.get("author", "")
-        music_str = f"🎵 {music_title} - {music_author}" if music_title else ""
-
-        url = video.get("url", "")
-
-        formatted += f"**{idx}. @{username}{verified}**\n"
+        formatted += f"**{idx}. @{video.username or 'unknown'}{verified}**\n"
         formatted += f"{description}\n"
         formatted += f"👁 {views} | ❤️ {likes} | 💬 {comments} | 🔄 {shares}\n"
         if hashtags_str:
             formatted += f"{hashtags_str}\n"
         if music_str:
             formatted += f"{music_str}\n"
-        if url:
-            formatted += f"[Watch Video]({url})\n"
+        if video.url:
+            formatted += f"[Watch Video]({video.url})\n"
         formatted += "\n"
 
     return formatted